@@ -0,0 +1,80 @@
+##
+# File: ConcurrentQueryExecutorTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Test cases for the concurrent lookup executor"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import time
+import unittest
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+from wwpdb.apps.workmanager.db_access.ConcurrentQueryExecutor import ConcurrentQueryExecutor, runConcurrently
+
+
+def slowLookup(value, delay=0.1):
+    time.sleep(delay)
+    return value
+
+
+def failingLookup(message, delay=0.0):
+    time.sleep(delay)
+    raise ValueError(message)
+
+
+class ConcurrentQueryExecutorTests(unittest.TestCase):
+    def testResultsAndTimings(self):
+        executor = ConcurrentQueryExecutor(maxWorkers=4, log=StringIO())
+        for name in ("group_id", "release_date", "pi_info", "anno_selection"):
+            executor.submit(name, slowLookup, name, delay=0.1)
+        #
+        startTime = time.time()
+        resultMap = executor.run()
+        elapsed = time.time() - startTime
+        self.assertEqual(resultMap, {"group_id": "group_id", "release_date": "release_date", "pi_info": "pi_info", "anno_selection": "anno_selection"})
+        # run side by side instead of one after another
+        self.assertTrue(elapsed < 0.3)
+        self.assertEqual(sorted(executor.getTimings().keys()), ["anno_selection", "group_id", "pi_info", "release_date"])
+        self.assertEqual(executor.run(), {})
+
+    def testErrorInSubmissionOrder(self):
+        log = StringIO()
+        executor = ConcurrentQueryExecutor(maxWorkers=4, log=log)
+        executor.submit("first", failingLookup, "first failure", delay=0.1)
+        executor.submit("ok", slowLookup, 1, delay=0.0)
+        executor.submit("second", failingLookup, "second failure", delay=0.0)
+        # the second failure happens first, the first submitted one is raised
+        with self.assertRaises(ValueError) as cm:
+            executor.run()
+        #
+        self.assertEqual(str(cm.exception), "first failure")
+        self.assertIn("lookup second failed", log.getvalue())
+        self.assertIn("second", executor.getTimings())
+
+    def testNestedFanOut(self):
+        # lookups fanning out again run in their own thread, even with all shared threads busy
+        def lookup(value):
+            return sum(runConcurrently(lambda i: slowLookup(i, delay=0.01), list(range(value)), 4))
+
+        executor = ConcurrentQueryExecutor(maxWorkers=16, log=StringIO())
+        for value in range(16):
+            executor.submit("lookup_%d" % value, lookup, value)
+        #
+        resultMap = executor.run()
+        self.assertEqual(resultMap, dict([("lookup_%d" % value, sum(range(value))) for value in range(16)]))
+        self.assertEqual(runConcurrently(lambda i: i * i, list(range(10)), 3), [i * i for i in range(10)])
+
+
+if __name__ == '__main__':
+    unittest.main()
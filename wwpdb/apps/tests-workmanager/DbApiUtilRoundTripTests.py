@@ -0,0 +1,257 @@
+##
+# File: DbApiUtilRoundTripTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Round trips per statement of DbApiUtil, with a benchmark of a Level 1 refresh read pattern"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import sys
+import time
+import unittest
+
+import MySQLdb
+
+try:
+    from unittest.mock import MagicMock, patch
+except ImportError:
+    from mock import MagicMock, patch
+
+from wwpdb.apps.workmanager.db_access.DbApiUtil import DbApiUtil
+from wwpdb.apps.workmanager.db_access.DbConnectionPool import DbConnectionPool
+from wwpdb.apps.workmanager.db_access.RetryPolicy import CircuitBreaker, getCircuitBreaker
+
+# server round trips per SELECT / single-statement update of the former protocol:
+#   commit + select
+#   set autocommit=0 + update + commit + set autocommit=1
+LEGACY_SELECT_ROUND_TRIPS = 2
+LEGACY_UPDATE_ROUND_TRIPS = 4
+
+
+class RoundTripCounter(object):
+    """ Fake connection counting the calls that reach the server
+    """
+    def __init__(self):
+        self.count = 0
+        self.statements = []
+
+    def connect(self):
+        con = MagicMock()
+        con.commit.side_effect = lambda: self.__hit("commit")
+        con.rollback.side_effect = lambda: self.__hit("rollback")
+        con.autocommit.side_effect = lambda on: self.__hit("autocommit")
+        curs = MagicMock()
+        curs.execute.side_effect = lambda sql, args=None: self.__hit(sql)
+        curs.fetchall.return_value = ()
+        curs.fetchmany.side_effect = lambda size: [{"dep_set_id": "D_1"}] * size
+        con.cursor.return_value = curs
+        return con
+
+    def close(self, con):
+        pass
+
+    def __hit(self, statement):
+        self.count += 1
+        self.statements.append(statement)
+        if statement.startswith("bad"):
+            # answered by the server with an SQL error
+            raise MySQLdb.ProgrammingError(1064, "You have an error in your SQL syntax")
+        #
+        if statement.startswith("abort"):
+            # fails in the client before reaching the server
+            raise ValueError("abort")
+        #
+        return 0
+
+
+class DbApiUtilRoundTripTests(unittest.TestCase):
+    def setUp(self):
+        self.__counter = RoundTripCounter()
+        patcher = patch("wwpdb.apps.workmanager.db_access.DbConnectionPool.DbConnection", return_value=self.__counter)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # a database name of its own gives each test a fresh pool
+        self.__dbApi = DbApiUtil(dbName="roundtrip_%s" % self.id(), dbHost="localhost")
+        # open the pooled connection (autocommit + isolation level) outside of the measurements
+        self.__dbApi.runSelectSQL("select 1")
+        self.__counter.count = 0
+        self.__counter.statements = []
+
+    def testSelect(self):
+        self.__dbApi.runSelectSQL("select * from deposition where dep_set_id = %s", ("D_1",))
+        self.assertEqual(self.__counter.count, 1)
+
+    def testUpdate(self):
+        self.assertEqual(self.__dbApi.runUpdateSQL("update deposition set status_code = %s where dep_set_id = %s", ("PROC", "D_1")), "OK")
+        self.assertEqual(self.__counter.count, 1)
+
+    def testStrictSelect(self):
+        # an SQL error is an empty result, or None if strict
+        self.assertEqual(self.__dbApi.runSelectSQL("bad select"), ())
+        self.assertIsNone(self.__dbApi.runSelectSQL("bad select", strict=True))
+        self.assertEqual(self.__dbApi.runSelectSQL("select 1", strict=True), ())
+
+    def testStreamErrors(self):
+        # a failed stream raises instead of ending as if all rows were read
+        self.assertRaises(MySQLdb.ProgrammingError, list, self.__dbApi.iterSelectSQL("bad select"))
+        with patch.object(DbConnectionPool, "acquire", return_value=None), patch.object(DbConnectionPool, "getLastError", return_value="timeout"):
+            self.assertRaises(MySQLdb.OperationalError, list, self.__dbApi.iterSelectSQL("select dep_set_id from deposition"))
+        #
+
+    def testStreamConnections(self):
+        pool = DbConnectionPool(dbName="streams", dbHost="localhost", maxSize=3, maxStreams=2)
+        streamList = [pool.acquire(timeout=0.05, stream=True) for _i in range(2)]
+        self.assertEqual(pool.getStats()["streams"], 2)
+        # streams wait for one another, the last connection is left to other statements
+        self.assertIsNone(pool.acquire(timeout=0.05, stream=True))
+        self.assertEqual(pool.getLastError(), "timeout")
+        con = pool.acquire(timeout=0.05)
+        self.assertIsNotNone(con)
+        pool.release(con)
+        pool.release(streamList.pop())
+        self.assertIsNotNone(pool.acquire(timeout=0.05, stream=True))
+        self.assertEqual(pool.getStats()["max_streams"], 2)
+
+    def testTransaction(self):
+        with self.__dbApi.transaction() as curs:
+            curs.execute("update deposition set status_code = 'PROC' where dep_set_id = 'D_1'")
+            curs.execute("update dep_last_instance set status_code = 'PROC' where dep_set_id = 'D_1'")
+        #
+        self.assertEqual(self.__counter.statements[0], "start transaction")
+        self.assertEqual(self.__counter.statements[-1], "commit")
+        self.assertEqual(self.__counter.count, 4)
+
+    def testTransactionRollback(self):
+        def failingBlock():
+            with self.__dbApi.transaction() as curs:
+                curs.execute("update deposition set status_code = 'PROC' where dep_set_id = 'D_1'")
+                raise ValueError("abort")
+            #
+
+        self.assertRaises(ValueError, failingBlock)
+        self.assertEqual(self.__counter.statements[-1], "rollback")
+
+    def testAcquireFailure(self):
+        # an exhausted pool is not retried
+        with patch.object(DbConnectionPool, "acquire", return_value=None) as acquire, \
+                patch.object(DbConnectionPool, "getLastError", return_value="timeout"):
+            self.assertIsNone(self.__dbApi.runSelectSQL("select 1"))
+            self.assertEqual(acquire.call_count, 1)
+        #
+        # a failed connect is retried, each retry waits at most retryAcquireTimeout for a connection
+        dbApi = DbApiUtil(dbName="retry_%s" % self.id(), dbHost="localhost", retryAcquireTimeout=0.5)
+        with patch.object(DbConnectionPool, "acquire", return_value=None) as acquire, \
+                patch.object(DbConnectionPool, "getLastError", return_value="connect"), patch("time.sleep"):
+            self.assertIsNone(dbApi.runSelectSQL("select 1"))
+            self.assertEqual(acquire.call_count, 4)
+            self.assertTrue(acquire.call_args_list[0][1]["timeout"] > 5.0)
+            for call in acquire.call_args_list[1:]:
+                self.assertTrue(call[1]["timeout"] <= 0.5)
+            #
+        #
+
+    def __getProbingDbApi(self):
+        """ Returns ( DbApiUtil, breaker ) of a new database whose breaker is half-open, its probe not yet taken
+        """
+        dbName = "breaker_%s" % self.id()
+        breaker = getCircuitBreaker("%s@localhost" % dbName, failureThreshold=1, resetTimeout=0.2)
+        dbApi = DbApiUtil(dbName=dbName, dbHost="localhost")
+        breaker.recordFailure()
+        self.assertFalse(breaker.allowRequest())
+        time.sleep(0.25)
+        return dbApi, breaker
+
+    def testBreakerProbeAnswered(self):
+        # SQL errors are answers of the server: the probe closes the breaker
+        dbApi, breaker = self.__getProbingDbApi()
+        self.assertEqual(dbApi.runSelectSQL("bad select"), ())
+        self.assertEqual(breaker.getState(), CircuitBreaker.CLOSED)
+        #
+        dbApi, breaker = self.__getProbingDbApi()
+        self.assertIsNone(dbApi.runUpdateSQL("bad insert"))
+        self.assertEqual(breaker.getState(), CircuitBreaker.CLOSED)
+        # a stream closed after its first row
+        dbApi, breaker = self.__getProbingDbApi()
+        rowIter = dbApi.iterSelectSQL("select dep_set_id from deposition")
+        self.assertEqual(next(rowIter), {"dep_set_id": "D_1"})
+        rowIter.close()
+        self.assertEqual(breaker.getState(), CircuitBreaker.CLOSED)
+        # a transaction aborted by the caller
+        dbApi, breaker = self.__getProbingDbApi()
+
+        def failingBlock():
+            with dbApi.transaction() as curs:
+                curs.execute("update deposition set status_code = 'PROC' where dep_set_id = 'D_1'")
+                raise ValueError("abort")
+            #
+
+        self.assertRaises(ValueError, failingBlock)
+        self.assertEqual(breaker.getState(), CircuitBreaker.CLOSED)
+
+    def testBreakerProbeReleased(self):
+        # the probe did not reach the server: the next statement probes again
+        dbApi, breaker = self.__getProbingDbApi()
+        with patch.object(DbConnectionPool, "acquire", return_value=None), patch.object(DbConnectionPool, "getLastError", return_value="timeout"):
+            self.assertIsNone(dbApi.runSelectSQL("select 1"))
+        #
+        self.assertEqual(breaker.getState(), CircuitBreaker.HALF_OPEN)
+        self.assertTrue(breaker.allowRequest())
+        breaker.releaseProbe()
+        #
+        self.assertRaises(ValueError, dbApi.runSelectSQL, "abort select")
+        self.assertRaises(ValueError, dbApi.runUpdateSQL, "abort update")
+        rowIter = dbApi.iterSelectSQL("abort select")
+        self.assertRaises(ValueError, next, rowIter)
+        self.assertEqual(breaker.getState(), CircuitBreaker.HALF_OPEN)
+        self.assertEqual(dbApi.runSelectSQL("select 1"), ())
+        self.assertEqual(breaker.getState(), CircuitBreaker.CLOSED)
+
+    def testSelectDataInChunks(self):
+        self.__dbApi.setSchemaMap({"RELEASE_DATE": "select dep_set_id, date_of_RCSB_release from deposition where dep_set_id in ( %s ) order by date_of_RCSB_release"})
+        failingList = []
+        dateMap = {"D_1": "2026-03-01", "D_2": None, "D_3": "2026-01-01", "D_4": "2026-02-01", "D_5": "2026-01-15"}
+
+        def selectData(key=None, parameter=()):  # pylint: disable=unused-argument
+            if "D_5" in parameter[0] and failingList:
+                return None
+            #
+            return tuple([{"dep_set_id": depId, "date_of_RCSB_release": dateMap[depId]} for depId in reversed(parameter[0])])
+
+        with patch.object(DbApiUtil, "selectData", side_effect=selectData) as select:
+            # sorted by the order by column whatever the number of chunks
+            for chunkSize in (10, 2):
+                rows = self.__dbApi.selectDataInChunks(key="RELEASE_DATE", idList=list(dateMap.keys()), chunkSize=chunkSize, workers=2)
+                self.assertEqual([row["dep_set_id"] for row in rows], ["D_2", "D_3", "D_5", "D_4", "D_1"])
+            #
+            self.assertEqual(select.call_count, 4)
+            # one failing chunk fails the whole selection
+            failingList.append("D_5")
+            self.assertIsNone(self.__dbApi.selectDataInChunks(key="RELEASE_DATE", idList=list(dateMap.keys()), chunkSize=2, workers=2))
+        #
+
+    def testRefreshBenchmark(self):
+        """ One Level 1 refresh: per table, the table query and the six enrichment lookups
+        """
+        numTables = 8
+        lookupsPerTable = 6
+        for _table in range(numTables):
+            for _query in range(1 + lookupsPerTable):
+                self.__dbApi.runSelectSQL("select * from deposition where dep_set_id in ( %s, %s )", ("D_1", "D_2"))
+            #
+        #
+        numSelects = numTables * (1 + lookupsPerTable)
+        legacy = numSelects * LEGACY_SELECT_ROUND_TRIPS
+        sys.stderr.write("\nLevel 1 refresh of %d tables: %d SELECTs, %d round trips (previously %d), %d saved\n"
+                         % (numTables, numSelects, self.__counter.count, legacy, legacy - self.__counter.count))
+        self.assertEqual(self.__counter.count, numSelects)
+        self.assertEqual(legacy - self.__counter.count, numSelects)
+
+
+if __name__ == '__main__':
+    unittest.main()
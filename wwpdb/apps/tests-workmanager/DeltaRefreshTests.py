@@ -0,0 +1,264 @@
+##
+# File: DeltaRefreshTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Delta refresh of the Level 1 tables compared with a full refresh over a scripted change sequence"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import copy
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import unittest
+
+import MySQLdb
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from commonsetup import FakeConfigInfo, FakeRequest, patchModule  # pylint: disable=import-error
+else:
+    from .commonsetup import FakeConfigInfo, FakeRequest, patchModule
+
+from wwpdb.apps.workmanager.depict.DepictContent import DepictContent
+from wwpdb.apps.workmanager.depict.ReadConFigFile import dumpPickleFile
+from wwpdb.apps.workmanager.depict.TableStore import loadTableFile
+
+CONFIG = {
+    'page_template': {
+        'id_link_tmplt': {'type': 'text', 'page': '<a href="?identifier=%(dep_set_id)s%(group_info)s">%(display_ids)s</a>'},
+        'commun_tmplt': {'type': 'text', 'page': ''},
+        'commun_image_tmplt': {'type': 'text', 'page': ''},
+    },
+    'page_template_parameter': {
+        'id_link_tmplt': [[], [{'variable': 'dep_set_id', 'type': 'dataInfo', 'value': 'dep_set_id'},
+                               {'variable': 'group_info', 'type': 'dataInfo', 'value': 'group_info'},
+                               {'variable': 'display_ids', 'type': 'dataInfo', 'value': 'display_ids'}]],
+        'commun_tmplt': [[], []],
+        'commun_image_tmplt': [[], []],
+    },
+    'table_data_field_binding': {
+        'id_link': {'type': 'page_template', 'value': 'id_link_tmplt'},
+        'status': {'type': 'dataInfo', 'value': 'dep_status_code'},
+        'dep_title': {'type': 'dataInfo', 'value': 'dep_title'},
+        'annotator': {'type': 'dataInfo', 'value': 'annotator_initials'},
+        'default_order': {'type': 'dataInfo', 'value': 'default_order'},
+    },
+}
+
+SELECT = "select dep_set_id, status_code as dep_status_code, dep_title, annotator_initials, dep_notify from dep_last_instance "
+
+TABLES = {
+    # default_order depends on the dep_notify rank, the row position and the number of rows
+    '1_table_1': {'pkl': 'table_content_1.tbl', 'tab_count_id': '1', 'order_condition': 'dep_notify:N,T',
+                  'sql': SELECT + "where status_code in ( 'PROC', 'AUTH', 'REPL' ) order by dep_status_code, dep_set_id",
+                  'entry_count': {'level1': ['num_entries', 'PROC', 'AUTH']},
+                  'data-field': ['id_link', 'status', 'dep_title', 'annotator', 'default_order']},
+    # streamed, descending text order with NULL titles
+    '2_table_1': {'pkl': 'table_content_2.tbl', 'tab_count_id': '2',
+                  'sql': SELECT + "where annotator_initials = 'AB' order by dep_title desc, dep_set_id",
+                  'entry_count': {'level1': ['num_entries']},
+                  'data-field': ['id_link', 'dep_title', 'status', 'default_order']},
+    # no ORDER BY, always refreshed in full
+    '3_table_1': {'pkl': 'table_content_3.tbl', 'tab_count_id': '3', 'sql': SELECT + "where status_code = 'HPUB'",
+                  'entry_count': {'level1': ['num_entries']}, 'data-field': ['id_link', 'status']},
+}
+
+
+class FakeStatusDb(object):
+    """ Status database in sqlite, keeps the keys of the table queries it runs
+    """
+    def __init__(self, connection, failingKeys=(), failingStreams=()):
+        self.__connection = connection
+        self.__failingKeys = failingKeys
+        self.__failingStreams = failingStreams
+        self.queryKeys = []
+
+    def __select(self, sql, args=()):
+        cursor = self.__connection.execute(sql, args)
+        names = [column[0] for column in cursor.description]
+        return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def runSelectSQL(self, sql, key=None, strict=False):
+        self.queryKeys.append(key)
+        if key in self.__failingKeys:
+            # an SQL error ( lock wait timeout, killed query, ... ) of DbApiUtil.runSelectSQL()
+            return None if strict else ()
+        #
+        return self.__select(sql)
+
+    def iterSelectSQL(self, sql, fetchSize=None, key=None):  # pylint: disable=unused-argument
+        self.queryKeys.append(key)
+        for i, dataD in enumerate(self.__select(sql)):
+            if (key in self.__failingStreams) and (i == 5):
+                raise MySQLdb.OperationalError(2013, "Lost connection to MySQL server during query")
+            #
+            yield dataD
+        #
+
+    def getChangedDepositionIds(self, timestamp=None):
+        return [row['dep_set_id'] for row in self.__select("select distinct dep_set_id from wf_instance where status_timestamp > ?", (timestamp,))]
+
+    def getUserByInitial(self, initial=None):
+        return {'initials': initial, 'site': 'RCSB'}
+
+    def getGroupIds(self, depositionids=None):
+        return [{'dep_set_id': depId, 'group_id': 'G_1000001'} for depId in depositionids if depId.endswith('7')]
+
+    def getAnnoSelection(self, depositionids=None):  # pylint: disable=unused-argument
+        return []
+
+    def getRemindMessageTrack(self, depositionids=None):  # pylint: disable=unused-argument
+        return []
+
+    def ContactAuthorPI(self, _idList):
+        return []
+
+    def ContactAuthorPIOrValid(self, _idList):
+        return []
+
+
+class DeltaRefreshTests(unittest.TestCase):
+    def setUp(self):
+        patchModule(self, "wwpdb.apps.workmanager.depict.DepictBase", ConfigInfo=FakeConfigInfo)
+        self.__deltaPath = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.__deltaPath)
+        self.__fullPath = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.__fullPath)
+        for path in (self.__deltaPath, self.__fullPath):
+            dumpPickleFile(path, 'TableContentMap.pkl', copy.deepcopy(TABLES))
+        #
+        self.__connection = sqlite3.connect(':memory:')
+        self.__connection.execute("create table dep_last_instance ( dep_set_id text primary key, status_code text, dep_title text, "
+                                  + "annotator_initials text, dep_notify text )")
+        self.__connection.execute("create table wf_instance ( dep_set_id text, status_timestamp real )")
+        for i in range(300):
+            self.__connection.execute("insert into dep_last_instance values ( ?, ?, ?, ?, ? )",
+                                      ('D_80002%05d' % i, ['PROC', 'AUTH', 'HPUB', 'REPL', 'DEP'][i % 5], None if i % 11 == 0 else 'Title %03d' % ((i * 37) % 101),
+                                       ['AB', 'CD', 'EF'][i % 3], ['', 'N', 'T*', 'RBA'][i % 4]))
+            self.__connection.execute("insert into wf_instance values ( ?, ? )", ('D_80002%05d' % i, time.time() - 3600))
+        #
+
+    def __refresh(self, path, delta, failingKeys=(), failingStreams=()):
+        # pylint: disable=protected-access
+        statusDB = FakeStatusDb(self.__connection, failingKeys=failingKeys, failingStreams=failingStreams)
+        depict = DepictContent(reqObj=FakeRequest(path), statusDB=statusDB, conFigObj=copy.deepcopy(CONFIG), log=StringIO())
+        depict._contentDB = statusDB
+        returnMap = depict.depictTableContent('all', delta=delta)
+        return returnMap, dict([(index, loadTableFile(path, tableMap['pkl'])) for index, tableMap in TABLES.items()]), statusDB.queryKeys
+
+    def __change(self, sql, args, idList):
+        self.__connection.execute(sql, args)
+        for depId in idList:
+            self.__connection.execute("insert into wf_instance values ( ?, ? )", (depId, time.time()))
+        #
+
+    def __assertSameAsFull(self):
+        deltaMap, deltaTables, deltaKeys = self.__refresh(self.__deltaPath, True)
+        fullMap, fullTables, _fullKeys = self.__refresh(self.__fullPath, False)
+        self.assertEqual(deltaMap, fullMap)
+        for index in TABLES:
+            self.assertEqual(deltaTables[index], fullTables[index], index)
+        #
+        return deltaKeys
+
+    def testDeltaMatchesFullRefresh(self):
+        self.__assertSameAsFull()
+        # nothing changed: the stored tables are kept, only the table without ORDER BY is queried
+        self.assertEqual(self.__assertSameAsFull(), ['table:table_content_3.tbl'])
+        #
+        steps = [
+            # leaves table 1
+            ("update dep_last_instance set status_code = 'HPUB' where dep_set_id in ( 'D_8000200000', 'D_8000200011' )", (),
+             ['D_8000200000', 'D_8000200011']),
+            # moves within table 1, changes the PROC/AUTH counts
+            ("update dep_last_instance set status_code = 'PROC' where dep_set_id = 'D_8000200001'", (), ['D_8000200001']),
+            # new entry
+            ("insert into dep_last_instance values ( 'D_8000200900', 'AUTH', 'Title 050', 'AB', 'N' )", (), ['D_8000200900']),
+            # title change moves it in table 2, dep_notify change changes its default_order rank
+            ("update dep_last_instance set dep_title = 'title 999', dep_notify = 'T' where dep_set_id = 'D_8000200003'", (), ['D_8000200003']),
+            ("update dep_last_instance set dep_title = NULL where dep_set_id = 'D_8000200006'", (), ['D_8000200006']),
+            # reassigned: leaves table 2
+            ("update dep_last_instance set annotator_initials = 'CD' where dep_set_id = 'D_8000200009'", (), ['D_8000200009']),
+            # deleted
+            ("delete from dep_last_instance where dep_set_id = 'D_8000200015'", (), ['D_8000200015']),
+            # workflow activity without any change of the row
+            ("update dep_last_instance set dep_title = dep_title where dep_set_id = 'D_8000200018'", (), ['D_8000200018', 'G_1000001']),
+        ]
+        for sql, args, idList in steps:
+            self.__change(sql, args, idList)
+            deltaKeys = self.__assertSameAsFull()
+            self.assertEqual(sorted(set(deltaKeys)), ['table:table_content_1.tbl:delta', 'table:table_content_2.tbl:delta', 'table:table_content_3.tbl'])
+        #
+        _returnMap, tables, _keys = self.__refresh(self.__deltaPath, True)
+        self.assertNotIn('D_8000200000', str(tables['1_table_1']))
+        self.assertIn('D_8000200900', str(tables['1_table_1']))
+
+    def testFailedDeltaQuery(self):
+        self.__assertSameAsFull()
+        self.__change("update dep_last_instance set status_code = 'PROC' where dep_set_id = 'D_8000200001'", (), ['D_8000200001'])
+        # the changed rows are not dropped, the table is refreshed in full
+        returnMap, tables, keys = self.__refresh(self.__deltaPath, True, failingKeys=('table:table_content_1.tbl:delta',))
+        self.assertIn('table:table_content_1.tbl', keys)
+        _fullMap, fullTables, _fullKeys = self.__refresh(self.__fullPath, False)
+        self.assertEqual(tables['1_table_1'], fullTables['1_table_1'])
+        self.assertIn('D_8000200001', str(tables['1_table_1']))
+        self.assertEqual(returnMap['level1_num_entries_1'], len(fullTables['1_table_1']))
+        self.__assertSameAsFull()
+
+    def testFailedTableQuery(self):
+        self.__assertSameAsFull()
+        self.__change("update dep_last_instance set dep_title = 'title 999' where dep_set_id = 'D_8000200003'", (), ['D_8000200003'])
+        # a broken stream is read again in one query
+        _returnMap, tables, keys = self.__refresh(self.__deltaPath, False, failingStreams=('table:table_content_2.tbl',))
+        _fullMap, fullTables, _fullKeys = self.__refresh(self.__fullPath, False)
+        self.assertEqual(tables, fullTables)
+        self.assertEqual(keys.count('table:table_content_2.tbl'), 2)
+        # the table of the last refresh is kept if that query fails too, its counts are not reported
+        self.__change("update dep_last_instance set dep_title = 'title 998' where dep_set_id = 'D_8000200006'", (), ['D_8000200006'])
+        returnMap, newTables, _keys = self.__refresh(self.__deltaPath, False, failingKeys=('table:table_content_2.tbl',),
+                                                     failingStreams=('table:table_content_2.tbl',))
+        self.assertEqual(newTables['2_table_1'], tables['2_table_1'])
+        self.assertNotIn('level1_num_entries_2', returnMap)
+        self.assertIn('level1_num_entries_1', returnMap)
+
+    def testFullRefreshFallback(self):
+        # pylint: disable=protected-access
+        self.__assertSameAsFull()
+        # too many changed entries
+        idList = ['D_80002%05d' % i for i in range(0, 300, 2)]
+        self.__change("update dep_last_instance set dep_notify = 'N'", (), idList)
+        statusDB = FakeStatusDb(self.__connection)
+        depict = DepictContent(reqObj=FakeRequest(self.__deltaPath), statusDB=statusDB, conFigObj=copy.deepcopy(CONFIG), log=StringIO())
+        depict._contentDB = statusDB
+        depict._DepictContent__deltaMaxEntries = 100
+        depict.depictTableContent('all', delta=True)
+        self.assertEqual(sorted(set(statusDB.queryKeys)), ['table:table_content_1.tbl', 'table:table_content_2.tbl', 'table:table_content_3.tbl'])
+        self.__assertSameAsFull()
+        # a changed table query ( e.g. a new search ) is refreshed in full
+        tables = copy.deepcopy(TABLES)
+        tables['2_table_1']['sql'] = SELECT + "where annotator_initials = 'CD' order by dep_title desc, dep_set_id"
+        dumpPickleFile(self.__deltaPath, 'TableContentMap.pkl', tables)
+        statusDB = FakeStatusDb(self.__connection)
+        depict = DepictContent(reqObj=FakeRequest(self.__deltaPath), statusDB=statusDB, conFigObj=copy.deepcopy(CONFIG), log=StringIO())
+        depict._contentDB = statusDB
+        depict.depictTableContent('2_table_1', delta=True)
+        self.assertEqual(statusDB.queryKeys, ['table:table_content_2.tbl', 'table:table_content_2.tbl:delta'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,188 @@
+##
+# File: DepictContentRowPlanTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+#  18-Oct-2026  zf   read the rendered rows back with loadTableFile()
+##
+"""Row rendering of DepictContent tables through the per-table column plan"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import copy
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+if __package__ is None or __package__ == "":
+    from os import path
+
+    sys.path.append(path.dirname(path.abspath(__file__)))
+    from commonsetup import FakeConfigInfo, FakeRequest, patchModule  # pylint: disable=import-error
+else:
+    from .commonsetup import FakeConfigInfo, FakeRequest, patchModule
+
+from wwpdb.apps.workmanager.depict.DepictContent import DepictContent
+from wwpdb.apps.workmanager.depict.TableStore import loadTableFile
+
+METHODS = ['X-RAY DIFFRACTION', 'Solution NMR', 'ELECTRON MICROSCOPY', 'FIBRE DIFFRACTION', 'SOLID-STATE NMR', 'ELECTRON CRYSTALLOGRAPHY',
+           'Neutron Diffraction', 'ELECTRON TOMOGRAPHY', 'THEORETICAL MODEL', '']
+
+CONFIG = {
+    'page_template': {
+        'id_link_tmplt': {'type': 'text', 'page': '<a href="%(base_url)s?identifier=%(dep_set_id)s%(group_info)s">%(display_ids)s</a>%(detail)s'},
+        'detail_tmplt': {'type': 'text', 'page': ' <span title="%(method)s">%(abbrv)s</span> %(session)s %(site)s %(url)s %(missing)s'},
+        'method_tmplt': {'type': 'text', 'page': '<i>%(abbrv)s</i>'},
+        'workflow_waiting_status_tmplt': {'type': 'text', 'page': 'waiting'},
+        'workflow_close_status_tmplt': {'type': 'text', 'page': 'closed'},
+        'workflow_other_status_tmplt': {'type': 'text', 'page': '%(inst)s'},
+        'workflow_lock_action_tmplt': {'type': 'text', 'page': 'locked'},
+        'workflow_init_action_tmplt': {'type': 'text', 'page': 'init'},
+        'workflow_other_action_tmplt': {'type': 'text', 'page': 'run'},
+        'add_list_tmplt': {'type': 'text', 'page': '<button>Add %(dep_set_id)s</button>'},
+        'commun_tmplt': {'type': 'text', 'page': '<a href="?s=%(sessionid)s&a=%(initials)s&id=%(dep_set_id)s%(locklabel)s">%(commun_image)s</a>'},
+        'commun_image_tmplt': {'type': 'text', 'page': '<img src="%(image)s" alt="%(alt)s"/>'},
+    },
+    'page_template_parameter': {
+        'id_link_tmplt': [[{'variable': 'detail', 'type': 'page_template', 'value': 'detail_tmplt'}],
+                          [{'variable': 'base_url', 'type': 'dataInfo', 'value': 'base_url'},
+                           {'variable': 'dep_set_id', 'type': 'dataInfo', 'value': 'dep_set_id'},
+                           {'variable': 'group_info', 'type': 'dataInfo', 'value': 'group_info'},
+                           {'variable': 'display_ids', 'type': 'dataInfo', 'value': 'display_ids'}]],
+        'detail_tmplt': [[], [{'variable': 'method', 'type': 'dataInfo', 'value': 'method'},
+                              {'variable': 'abbrv', 'type': 'dataInfo', 'value': 'abbrv_method'},
+                              {'variable': 'session', 'type': 'sessionInfo', 'value': 'sessionid'},
+                              {'variable': 'site', 'type': 'constant', 'value': 'RCSB'},
+                              {'variable': 'url', 'type': 'function', 'value': 'self, _processBaseUrl'},
+                              {'variable': 'missing', 'type': 'dataInfo', 'value': 'no_such_item'}]],
+        'method_tmplt': [[], [{'variable': 'abbrv', 'type': 'dataInfo', 'value': 'abbrv_method'}]],
+        'workflow_other_status_tmplt': [[], [{'variable': 'inst', 'type': 'dataInfo', 'value': 'inst_status'}]],
+        'add_list_tmplt': [[], [{'variable': 'dep_set_id', 'type': 'dataInfo', 'value': 'dep_set_id'}]],
+    },
+    'function_parameter': {
+        'detail_tmplt,url': [{'name': 'class_id', 'value': 'AnnMod'}],
+    },
+    'table_data_field_binding': {
+        'id_link': {'type': 'page_template', 'value': 'id_link_tmplt'},
+        'method': {'type': 'page_template', 'value': 'method_tmplt'},
+        'dep_title': {'type': 'dataInfo', 'value': 'dep_title'},
+        'status': {'type': 'dataInfo', 'value': 'dep_status_code'},
+        'default_order': {'type': 'dataInfo', 'value': 'default_order'},
+        'wf_status': {'type': 'function', 'value': '_processWorkFlowStatus'},
+        'wf_action': {'type': 'function', 'value': '_processWorkFlowAction'},
+        'add_list': {'type': 'function', 'value': '_processAddList'},
+        'communication': {'type': 'function', 'value': '_processCommunication'},
+        'auxiliary': {'type': 'function', 'value': '_processAuxiliary'},
+        'unknown_type': {'type': 'no_such_type', 'value': 'dep_title'},
+    },
+}
+for _page_id in CONFIG['page_template']:
+    CONFIG['page_template_parameter'].setdefault(_page_id, [[], []])
+#
+
+TABLE = {'pkl': 'table_1.tbl', 'sql': 'select * from dep_last_instance', 'tab_count_id': '1', 'order_condition': 'dep_notify:N,T',
+         'entry_count': {'level1': ['num_entries', 'PROC', 'AUTH']},
+         'data-field': ['id_link', 'method', 'dep_title', 'status', 'not_bound', 'default_order', 'wf_status', 'wf_action', 'add_list',
+                        'communication', 'auxiliary', 'unknown_type']}
+
+
+class FakeDb(object):
+    """ Status and content database of the rendered rows
+    """
+    def __init__(self, rows):
+        self.__rows = rows
+
+    def getUserByInitial(self, initial=None):
+        return {'initials': initial, 'site': 'RCSB'}
+
+    def runSelectSQL(self, _sql, key=None, strict=False):  # pylint: disable=unused-argument
+        return copy.deepcopy(self.__rows)
+
+    def getGroupIds(self, depositionids=None):
+        return [{'dep_set_id': depId, 'group_id': 'G_1%06d' % int(depId[-4:])} for depId in depositionids if depId.endswith('3')]
+
+    def getAnnoSelection(self, depositionids=None):
+        return [{'dep_set_id': depId, 'annotator_initials': 'CD'} for depId in depositionids if depId.endswith('5')]
+
+    def getRemindMessageTrack(self, depositionids=None):  # pylint: disable=unused-argument
+        return []
+
+    def ContactAuthorPI(self, _idList):
+        return []
+
+    def ContactAuthorPIOrValid(self, _idList):
+        return []
+
+
+def getRows(count):
+    rows = []
+    for i in range(count):
+        rows.append({'dep_set_id': 'D_80002%05d' % i, 'method': METHODS[i % len(METHODS)], 'dep_title': 'Title %d' % i if i % 7 else '',
+                     'dep_status_code': ['PROC', 'AUTH', 'HPUB', 'DEP'][i % 4], 'dep_locking': ['WFM', 'DEP'][i % 2],
+                     'dep_notify': ['', 'N', 'T*', 'RBA'][i % 4], 'inst_status': ['waiting', 'closed(0)', 'init', 'running'][i % 4],
+                     'class_id': ['AnnMod', 'LigMod', ''][i % 3], 'pdb_id': '1ABC'})
+    #
+    return rows
+
+
+def renderTable(sessionPath, rowCount):
+    """ Render TABLE for rowCount rows, returns ( entry counts, rendered rows, seconds spent rendering )
+    """
+    # pylint: disable=protected-access
+    rows = getRows(rowCount)
+    depict = DepictContent(reqObj=FakeRequest(sessionPath), statusDB=FakeDb(rows), conFigObj=copy.deepcopy(CONFIG), log=StringIO())
+    depict._contentDB = FakeDb(rows)
+    startTime = time.time()
+    depict._depictTableContent(copy.deepcopy(TABLE))
+    elapsed = time.time() - startTime
+    return depict._DepictContent__returnMap, loadTableFile(sessionPath, TABLE['pkl']), elapsed
+
+
+class DepictContentRowPlanTests(unittest.TestCase):
+    def setUp(self):
+        patchModule(self, "wwpdb.apps.workmanager.depict.DepictBase", ConfigInfo=FakeConfigInfo)
+        self.__path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.__path)
+
+    def testRenderedRows(self):
+        countMap, contentResults, _elapsed = renderTable(self.__path, 8)
+        self.assertEqual(countMap, {'level1_num_entries_1': 8, 'level1_PROC_1': 2, 'level1_AUTH_1': 2})
+        self.assertEqual(len(contentResults), 8)
+        self.assertEqual(list(contentResults[0].keys()), TABLE['data-field'])
+        self.assertEqual(contentResults[0]['id_link'],
+                         '<a href="https://site_ann_tasks_url?identifier=D_8000200000">D_8000200000</a> <span title="X-RAY DIFFRACTION">X-RAY</span> '
+                         'S_1 RCSB https://site_ann_tasks_url ')
+        self.assertTrue(contentResults[2]['id_link'].startswith('<a href="?identifier=D_8000200002">D_8000200002</a>'))
+        self.assertTrue(contentResults[3]['id_link'].startswith('<a href="https://site_ann_tasks_url?identifier=D_8000200003&group_id=G_1000003">'
+                                                                'D_8000200003/G_1000003</a>'))
+        self.assertEqual([row['method'] for row in contentResults],
+                         ['<i>X-RAY</i>', '<i>NMR</i>', '<i>EM</i>', '<i>FIBER</i>', '<i>SS NMR</i>', '<i>EL. CRYS.</i>', '<i>NEUTRON</i>', '<i>EM</i>'])
+        self.assertEqual([row['dep_title'] for row in contentResults], [''] + ['Title %d' % i for i in range(1, 7)] + [''])
+        self.assertEqual([row['default_order'] for row in contentResults], ['24', '9', '18', '27', '28', '13', '22', '31'])
+        self.assertEqual([row['wf_status'] for row in contentResults][:4], ['waiting', 'closed', 'init', 'running'])
+        self.assertEqual([row['wf_action'] for row in contentResults][:2], ['locked', 'run'])
+        self.assertEqual([row['add_list'] for row in contentResults][4:6], ['<button>Add D_8000200004</button>', 'CD'])
+        self.assertEqual(contentResults[1]['communication'],
+                         '<a href="?s=S_1&a=AB&id=D_8000200001&allowunlock=yes"><img src="wfm_new.png" alt="New Communication"/></a>')
+        self.assertEqual([row['auxiliary'] for row in contentResults][:4], ['background-medpink', '', 'background-medpink', 'background-lightblue'])
+        self.assertEqual(set([row['not_bound'] for row in contentResults] + [row['unknown_type'] for row in contentResults]), set(['']))
+
+    def testBenchmark(self):
+        _countMap, contentResults, elapsed = renderTable(self.__path, 5000)
+        self.assertEqual(len(contentResults), 5000)
+        print("\n5000 rows, %d columns: %.0f rows/s" % (len(TABLE['data-field']), 5000 / elapsed))
+
+
+if __name__ == '__main__':
+    unittest.main()
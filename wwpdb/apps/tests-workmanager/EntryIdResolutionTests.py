@@ -0,0 +1,134 @@
+##
+# File: EntryIdResolutionTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Per ID type union all resolution of getEntryIdListFromInputIdString() on a sqlite copy of deposition"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import random
+import sqlite3
+import sys
+import time
+import unittest
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+if __package__ is None or __package__ == "":
+    from os import path
+
+    sys.path.append(path.dirname(path.abspath(__file__)))
+    from commonsetup import FakeConfigInfo, SqliteDbApi, patchModule  # pylint: disable=import-error
+else:
+    from .commonsetup import FakeConfigInfo, SqliteDbApi, patchModule
+
+from wwpdb.apps.workmanager.db_access.StatusDbApi import StatusDbApi
+
+ID_COLUMNS = ('dep_set_id', 'pdb_id', 'bmrb_id', 'emdb_id')
+
+
+class EntryIdResolutionTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(7)
+        SqliteDbApi.connection = sqlite3.connect(":memory:")
+        SqliteDbApi.connection.execute("create table deposition ( dep_set_id text primary key, pdb_id text, bmrb_id text, emdb_id text )")
+        for column in ID_COLUMNS[1:]:
+            SqliteDbApi.connection.execute("create index deposition_%s on deposition ( %s )" % (column, column))
+        #
+        SqliteDbApi.connection.execute("create table group_deposition_information ( group_id text, dep_set_id text )")
+        cls.rows = []
+        pdbIds = set()
+        for i in range(100000):
+            pdbId = None
+            if rng.random() < 0.7:
+                pdbId = "%d%s" % (rng.randint(1, 9), "".join([rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789") for _j in range(3)]))
+                if pdbId in pdbIds:
+                    pdbId = None
+                else:
+                    pdbIds.add(pdbId)
+                #
+            #
+            bmrbId = str(10000 + i) if (rng.random() < 0.15) and (i < 90000) else None
+            emdbId = "EMD-%d" % (10000 + i) if rng.random() < 0.2 else None
+            cls.rows.append(("D_%d" % (8000200000 + i), pdbId, bmrbId, emdbId))
+        #
+        SqliteDbApi.connection.executemany("insert into deposition values ( ?, ?, ?, ? )", cls.rows)
+        SqliteDbApi.connection.executemany("insert into group_deposition_information values ( ?, ? )",
+                                           [("G_%d" % (1000000 + i // 5), row[0]) for i, row in enumerate(cls.rows[:1000])])
+        cls.rng = rng
+
+    @classmethod
+    def tearDownClass(cls):
+        SqliteDbApi.connection.close()
+        SqliteDbApi.connection = None
+
+    def setUp(self):
+        patchModule(self, "wwpdb.apps.workmanager.db_access.StatusDbApi", ConfigInfo=FakeConfigInfo, DbApiUtil=SqliteDbApi)
+        self.__statusDB = StatusDbApi(log=StringIO())
+        SqliteDbApi.statements = []
+
+    def __getInput(self, count):
+        """ Mixed list of count IDs of all types, a few of them unknown, and the dep_set_ids it resolves to
+        """
+        idList = []
+        expected = set()
+        for _i in range(count):
+            row = self.rng.choice(self.rows)
+            column = self.rng.choice([c for c in range(4) if row[c]])
+            value = row[column]
+            if (column == 1) and (self.rng.random() < 0.3):
+                value = "pdb_0000" + value.lower()
+            elif column == 3:
+                value = value.lower()
+            #
+            idList.append(value)
+            expected.add(row[0])
+        #
+        idList.extend(["D_9999999999", "9ZZZ", "99999", "EMD-99999"])
+        return idList, expected
+
+    def testResolvedIds(self):
+        for count in (1, 10, 300):
+            idList, expected = self.__getInput(count)
+            message, entryList = self.__statusDB.getEntryIdListFromInputIdString(", ".join(idList))
+            self.assertEqual(set(entryList), expected)
+            self.assertEqual(entryList, sorted(entryList))
+            # as before, an extended PDB ID is found through its short form only and is itself reported
+            unknown = set(["D_9999999999", "9ZZZ", "99999", "EMD-99999"] + [value.upper() for value in idList if value.startswith("pdb_")])
+            self.assertEqual(sorted(message.split("\n")), sorted(["'%s' is not a valid ID." % value for value in unknown]))
+        #
+
+    def testOneStatement(self):
+        emdbRow = [row for row in self.rows if row[3]][0]
+        message, entryList = self.__statusDB.getEntryIdListFromInputIdString("D_8000200001 d_8000200002\t%s,%s\nG_1000001" % (emdbRow[3], emdbRow[0]))
+        self.assertEqual(message, "")
+        self.assertEqual(entryList, sorted(set(["D_8000200001", "D_8000200002", emdbRow[0]] + ["D_%d" % (8000200005 + i) for i in range(5)])))
+        # the group lookup and one deposition statement with a selection per ID type
+        deposition = [sql for sql in SqliteDbApi.statements if "from deposition" in sql]
+        self.assertEqual(len(deposition), 1)
+        self.assertEqual(deposition[0].count(" union all "), 1)
+        self.assertEqual(self.__statusDB.getEntryIdListFromInputIdString("D_X ABCDEFG"), ("'ABCDEFG' is not a valid ID.\n'D_X' is not a valid ID.", []))
+
+    def testBenchmark(self):
+        idList, _expected = self.__getInput(300)
+        inputString = " ".join(idList)
+        startTime = time.time()
+        for _i in range(20):
+            self.__statusDB.getEntryIdListFromInputIdString(inputString)
+        #
+        unionTime = (time.time() - startTime) / 20
+        print("\n%d mixed IDs, 100000 deposition rows: union all %.4fs" % (len(idList), unionTime))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+##
+# File: GroupStatusTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Equivalence of the batched submit_group status computation with the former per-group queries"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import copy
+import random
+import unittest
+
+from wwpdb.apps.workmanager.depict.DepictContent import DepictContent
+
+
+class FakeStatusDb(object):
+    """ In-memory group_deposition_information/deposition tables answering like the 'GET_ENTRY_LIST_FROM_GROUP'
+        and 'GET_ENTRY_INFO' queries (distinct rows, ordered by dep_set_id)
+    """
+    def __init__(self, memberList, infoMap):
+        self.memberList = memberList
+        self.infoMap = infoMap
+        self.entryInfoCalls = 0
+
+    def getEntryListForGroup(self, groupids=None):
+        rows = [{"group_id": groupId, "dep_set_id": depId} for groupId, depId in self.memberList if groupId in groupids]
+        return sorted(rows, key=lambda row: row["dep_set_id"])
+
+    def getSimpleEntryInfo(self, depositionids=None):
+        self.entryInfoCalls += 1
+        return [copy.deepcopy(self.infoMap[depId]) for depId in sorted(set(depositionids)) if depId in self.infoMap]
+
+
+def legacySubmitGroupFilter(statusDB, rows, initials, filter_by_annotator_flag):
+    """ submit_group filter as implemented before, with one entry info query per group
+    """
+    idList = [row["dep_set_id"] for row in rows if row.get("dep_set_id", "").startswith("G_")]
+    groupIdMap = {}
+    entryIdList = []
+    for dataD in statusDB.getEntryListForGroup(groupids=idList):
+        if dataD["group_id"] in groupIdMap:
+            groupIdMap[dataD["group_id"]].append(dataD["dep_set_id"])
+        else:
+            groupIdMap[dataD["group_id"]] = [dataD["dep_set_id"]]
+            entryIdList.append(dataD["dep_set_id"])
+        #
+    #
+    if not entryIdList:
+        return []
+    #
+    info_rows = statusDB.getSimpleEntryInfo(depositionids=entryIdList)
+    if not info_rows:
+        return []
+    #
+    infoMap = dict([(dataD["dep_set_id"], dataD) for dataD in info_rows])
+    groupInfoMap = {}
+    for group_id, entry_ids in groupIdMap.items():
+        if not entry_ids[0] in infoMap:
+            continue
+        #
+        if ((not infoMap[entry_ids[0]].get("annotator_initials")) or (infoMap[entry_ids[0]]["annotator_initials"] != initials)) and filter_by_annotator_flag:
+            continue
+        #
+        groupInfoMap[group_id] = {"initial_deposition_date": infoMap[entry_ids[0]].get("initial_deposition_date") or ""}
+        status_code = "unknown"
+        count = 0
+        statusMap = {}
+        for dataD in (statusDB.getSimpleEntryInfo(depositionids=entry_ids) or []):
+            if not dataD.get("status_code"):
+                continue
+            #
+            code = str(dataD["status_code"]).strip().upper()
+            statusMap[code] = statusMap.get(code, 0) + 1
+        #
+        for code, val in statusMap.items():
+            if val > count:
+                count = val
+                status_code = code
+            #
+        #
+        groupInfoMap[group_id]["status_code"] = status_code
+    #
+    group_rows = []
+    for dataD in rows:
+        if dataD.get("dep_set_id") not in groupInfoMap:
+            continue
+        #
+        dataD.update(groupInfoMap[dataD["dep_set_id"]])
+        group_rows.append(dataD)
+    #
+    return group_rows
+
+
+class GroupStatusTests(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(13)
+        self.__memberList = []
+        self.__infoMap = {}
+        for groupIdx in range(300):
+            groupId = "G_%07d" % (1000000 + groupIdx)
+            for _member in range(rng.randint(1, 12)):
+                depId = "D_%d" % rng.randint(800000, 1000500)
+                self.__memberList.append((groupId, depId))
+                if (depId not in self.__infoMap) and (rng.random() > 0.05):
+                    self.__infoMap[depId] = {"dep_set_id": depId, "initial_deposition_date": rng.choice(["2023-05-01", None]),
+                                             "annotator_initials": rng.choice(["AB", "CD", "", None]),
+                                             "status_code": rng.choice(["PROC", "proc ", "AUTH", "WAIT", "REPL", "", None])}
+                #
+            #
+        #
+        self.__rows = [{"dep_set_id": "G_%07d" % (1000000 + groupIdx)} for groupIdx in range(0, 310, 1)]
+        self.__rows.append({"dep_set_id": "D_800001"})
+
+    def __getDepictContent(self, statusDB):
+        # pylint: disable=protected-access
+        content = DepictContent.__new__(DepictContent)
+        content._statusDB = statusDB
+        content._userInfo = {"initials": "AB"}
+        content._uInfoFlag = True
+        return content
+
+    def testSubmitGroupEquivalence(self):
+        for filterFlag, method in ((True, "submit_group"), (False, "submit_group_search")):
+            legacyDb = FakeStatusDb(self.__memberList, self.__infoMap)
+            expected = legacySubmitGroupFilter(legacyDb, copy.deepcopy(self.__rows), "AB", filterFlag)
+            batchedDb = FakeStatusDb(self.__memberList, self.__infoMap)
+            result = getattr(self.__getDepictContent(batchedDb), method)(copy.deepcopy(self.__rows))
+            self.assertTrue(len(expected) > 0)
+            self.assertEqual(result, expected)
+            self.assertEqual(batchedDb.entryInfoCalls, 1)
+            self.assertTrue(legacyDb.entryInfoCalls > 1)
+        #
+
+
+if __name__ == '__main__':
+    unittest.main()
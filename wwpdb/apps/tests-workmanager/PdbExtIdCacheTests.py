@@ -0,0 +1,92 @@
+##
+# File: PdbExtIdCacheTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Process-wide cache of the extended PDB IDs of ContentDbApi.getPdbExtIdMap()"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import sys
+import unittest
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
+if __package__ is None or __package__ == "":
+    from os import path
+
+    sys.path.append(path.dirname(path.abspath(__file__)))
+    from commonsetup import FakeConfigInfo, patchModule  # pylint: disable=import-error
+else:
+    from .commonsetup import FakeConfigInfo, patchModule
+
+from wwpdb.apps.workmanager.db_access import ContentDbApi as ContentDbApiModule
+from wwpdb.apps.workmanager.db_access.ContentDbApi import ContentDbApi
+
+
+class FakeDbApi(object):
+    """ database_2 with an extended PDB ID for the PDB IDs starting with a digit below 8
+    """
+    idLists = []
+
+    def __init__(self, *_args, **_kwargs):
+        pass
+
+    def setSchemaMap(self, schemaMap):
+        pass
+
+    def selectDataInChunks(self, key=None, idList=None, **_kwargs):  # pylint: disable=unused-argument
+        self.idLists.append(sorted(idList))
+        return tuple([{'database_code': pdbId, 'pdbx_database_accession': 'pdb_0000' + pdbId.lower()} for pdbId in idList if pdbId[0] < '8'])
+
+
+class PdbExtIdCacheTests(unittest.TestCase):
+    def setUp(self):
+        patchModule(self, "wwpdb.apps.workmanager.db_access.ContentDbApi", ConfigInfo=FakeConfigInfo, DbApiUtil=FakeDbApi)
+        ContentDbApiModule._pdbExtIdCache.clear()  # pylint: disable=protected-access
+        FakeDbApi.idLists = []
+
+    def testMissingIdsOnly(self):
+        contentDB = ContentDbApi(log=StringIO())
+        self.assertEqual(contentDB.getPdbExtIdMap([]), {})
+        self.assertEqual(FakeDbApi.idLists, [])
+        self.assertEqual(contentDB.getPdbExtIdMap(["1ABC", "2DEF", "1ABC"]), {"1ABC": "pdb_00001abc", "2DEF": "pdb_00002def"})
+        self.assertEqual(FakeDbApi.idLists, [["1ABC", "2DEF"]])
+        # another instance of the same database shares the cache, only the new IDs are selected
+        before = contentDB.getPdbExtIdCacheStats()
+        self.assertEqual(ContentDbApi(log=StringIO()).getPdbExtIdMap(["2DEF", "3GHI", "1ABC", "4JKL"]),
+                         {"1ABC": "pdb_00001abc", "2DEF": "pdb_00002def", "3GHI": "pdb_00003ghi", "4JKL": "pdb_00004jkl"})
+        self.assertEqual(FakeDbApi.idLists[-1], ["3GHI", "4JKL"])
+        after = contentDB.getPdbExtIdCacheStats()
+        self.assertEqual((after["hits"] - before["hits"], after["misses"] - before["misses"]), (2, 2))
+        self.assertEqual(after["size"], 4)
+
+    def testIdsWithoutExtendedIdNotCached(self):
+        contentDB = ContentDbApi(log=StringIO())
+        self.assertEqual(contentDB.getPdbExtIdMap(["9XYZ", "1ABC"]), {"1ABC": "pdb_00001abc"})
+        self.assertEqual(contentDB.getPdbExtIdMap(["9XYZ", "1ABC"]), {"1ABC": "pdb_00001abc"})
+        self.assertEqual(FakeDbApi.idLists, [["1ABC", "9XYZ"], ["9XYZ"]])
+
+    def testScopedByDatabase(self):
+        ContentDbApi(log=StringIO()).getPdbExtIdMap(["1ABC"])
+        with patch.dict(FakeConfigInfo.values, {"SITE_DB_HOST_NAME": "other_host"}):
+            ContentDbApi(log=StringIO()).getPdbExtIdMap(["1ABC"])
+        #
+        self.assertEqual(FakeDbApi.idLists, [["1ABC"], ["1ABC"]])
+
+
+if __name__ == '__main__':
+    unittest.main()
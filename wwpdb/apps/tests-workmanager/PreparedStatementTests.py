@@ -0,0 +1,59 @@
+##
+# File: PreparedStatementTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Test cases for binding schema map templates"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import unittest
+
+from wwpdb.apps.workmanager.db_access.PreparedStatement import PreparedStatement, getPreparedStatement
+
+
+class PreparedStatementTests(unittest.TestCase):
+    def testValueSlots(self):
+        stmt = PreparedStatement("select * from wf_instance where dep_set_id = '%s' and wf_class_id = '%s' order by status_timestamp desc limit 1")
+        sql, args = stmt.bind(("D_1", "Annotate"))
+        self.assertEqual(sql, "select * from wf_instance where dep_set_id = %s and wf_class_id = %s order by status_timestamp desc limit 1")
+        self.assertEqual(args, ("D_1", "Annotate"))
+
+    def testSingleValueNotTuple(self):
+        sql, args = PreparedStatement("select * from deposition where dep_set_id = '%s'").bind(("D_1'2"))
+        self.assertEqual(sql, "select * from deposition where dep_set_id = %s")
+        self.assertEqual(args, ("D_1'2",))
+
+    def testInList(self):
+        stmt = PreparedStatement("select * from user_data where dep_set_id in ( '%s' ) and role = '%s'")
+        sql, args = stmt.bind((["D_1", "D_2", "D_3"], "principa"))
+        self.assertEqual(sql, "select * from user_data where dep_set_id in ( %s, %s, %s ) and role = %s")
+        self.assertEqual(args, ("D_1", "D_2", "D_3", "principa"))
+        # legacy pre-joined form gives the same statement
+        self.assertEqual(stmt.bind(("', '".join(["D_1", "D_2", "D_3"]), "principa")), (sql, args))
+        # empty list behaves as the legacy "in ( '' )"
+        self.assertEqual(stmt.bind(([], "valid"))[1], ("", "valid"))
+
+    def testRawSlotAndPercent(self):
+        sql, args = PreparedStatement("select count(*) from %s").bind(("deposition"))
+        self.assertEqual(sql, "select count(*) from deposition")
+        self.assertIsNone(args)
+        sql, args = PreparedStatement("select * from d where %s and c like 'x%%' and a = '%s'").bind(("b like '5%'", "v"))
+        self.assertEqual(sql, "select * from d where b like '5%%' and c like 'x%%' and a = %s")
+        self.assertEqual(args, ("v",))
+
+    def testSlotMismatch(self):
+        self.assertRaises(ValueError, PreparedStatement("select * from d where a = '%s'").bind, ("x", "y"))
+
+    def testStatementCache(self):
+        template = "select * from anno_selection where dep_set_id in ( '%s' )"
+        self.assertIs(getPreparedStatement(template), getPreparedStatement(template))
+
+
+if __name__ == '__main__':
+    unittest.main()
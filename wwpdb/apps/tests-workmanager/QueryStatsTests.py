@@ -0,0 +1,72 @@
+##
+# File: QueryStatsTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Test cases for the statement statistics"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import unittest
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+from wwpdb.apps.workmanager.db_access.QueryStats import QueryStats, getFingerprint, setCurrentOp
+
+
+class QueryStatsTests(unittest.TestCase):
+    def testFingerprint(self):
+        self.assertEqual(getFingerprint("select * from deposition  where dep_set_id = 'D_1000' and  rcsb_status_code = 'PROC'"),
+                         "select * from deposition where dep_set_id = ? and rcsb_status_code = ?")
+        self.assertEqual(getFingerprint("SELECT * FROM d WHERE id IN ('D_1', 'D_2', 'D_3') LIMIT 10"),
+                         getFingerprint("select * from d where id in ( 'D_4' ) limit 20"))
+        self.assertEqual(getFingerprint("select * from d where id in ( %s, %s ) and a = %s"), "select * from d where id in (...) and a = %s")
+        # digits inside identifiers are kept
+        self.assertEqual(getFingerprint("select pdb_id_1 from t2"), "select pdb_id_1 from t2")
+
+    def testHistogram(self):
+        stats = QueryStats(slowThreshold=None)
+        for elapsed in (0.0005, 0.003, 0.003, 0.04, 3.0):
+            stats.record("GET_X", elapsed, rows=2)
+        #
+        stats.record("GET_X", 0.001, error=True)
+        result = stats.getStats()["GET_X"]
+        self.assertEqual(result["count"], 6)
+        self.assertEqual(result["errors"], 1)
+        self.assertEqual(result["rows"], 10)
+        self.assertEqual(result["max_time"], 3.0)
+        self.assertEqual(result["histogram"]["<=0.001s"], 2)
+        self.assertEqual(result["histogram"]["<=0.005s"], 2)
+        self.assertEqual(result["histogram"]["<=5s"], 1)
+        self.assertEqual(result["p50_time"], 0.005)
+        self.assertEqual(result["p95_time"], 3.0)
+        self.assertEqual(stats.getTopList(1)[0][0], "GET_X")
+        stats.reset()
+        self.assertEqual(stats.getStats(), {})
+
+    def testSlowQueryLog(self):
+        log = StringIO()
+        stats = QueryStats(slowThreshold=0.5)
+        setCurrentOp("_RefreshOp")
+        try:
+            stats.record("sql_selection:level1_proc", 0.2, log=log)
+            stats.record("sql_selection:level1_proc", 1.5, rows=7, log=log)
+        finally:
+            setCurrentOp(None)
+        #
+        self.assertEqual(stats.getSlowCount(), 1)
+        self.assertIn("op=_RefreshOp", log.getvalue())
+        self.assertIn("sql_selection:level1_proc", log.getvalue())
+        self.assertEqual(stats.getStats()["sql_selection:level1_proc"]["ops"], {"_RefreshOp": 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+##
+# File: ReplaceCountSummaryTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Replacement count summary against the GET_REPLACE_COUNTS aggregation"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import random
+import shutil
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+from wwpdb.apps.workmanager.db_access.ReplaceCountSummary import ReplaceCountSummary, getGroupKey
+
+
+class FakeContentDb(object):
+    """ pdbx_audit_revision_details/history as [ ( structure_id, details ordinal, revision ordinal, revision_date ) ] and
+        the principal investigators as { structure_id : [ ( identifier_ORCID, name ) ] }
+    """
+    def __init__(self):
+        self.events = []
+        self.piMap = {}
+        self.sinceList = []
+
+    def getReplaceEvents(self, startdate=None):
+        self.sinceList.append(startdate)
+        return [event for event in self.events if event[3] and (event[3] >= startdate)]
+
+    def getReplacePIMap(self, idList=None):
+        return dict([(entryId, list(self.piMap[entryId])) for entryId in idList if entryId in self.piMap])
+
+    def GetReplaceCounts(self):
+        return self.GetReplaceCountsInRange(startdate=str(date.today() - timedelta(365)), enddate='9999-12-31')
+
+    def GetReplaceCountsInRange(self, startdate=None, enddate=None):
+        """ GET_REPLACE_COUNTS_RANGE: replacements per entry, joined with the PI rows and grouped by ( ORCID, name )
+        """
+        entryCount = {}
+        for entryId, _dOrdinal, _hOrdinal, day in self.events:
+            if day and (startdate <= day <= enddate):
+                entryCount[entryId] = entryCount.get(entryId, 0) + 1
+            #
+        #
+        groupMap = {}
+        for entryId, count in entryCount.items():
+            for orcid, name in self.piMap.get(entryId, []):
+                key = getGroupKey(orcid, name)
+                if key not in groupMap:
+                    groupMap[key] = {'name': name, 'identifier_ORCID': orcid, 'numreplace': 0}
+                #
+                groupMap[key]['numreplace'] += count
+            #
+        #
+        return list(groupMap.values())
+
+
+def normalize(rows):
+    return sorted([(getGroupKey(row['identifier_ORCID'], row['name']), int(row['numreplace'])) for row in rows], key=str)
+
+
+class ReplaceCountSummaryTests(unittest.TestCase):
+    def setUp(self):
+        self.__rng = random.Random(5)
+        self.__today = date.today()
+        self.__db = FakeContentDb()
+        self.__pis = [("0000-0001-%04d" % i, "Last%d, First%d" % (i, i)) for i in range(40)] + [(None, "Smith, Ann"), (None, None), ("0000-0001-0001", "LAST1, FIRST1")]
+        for i in range(800):
+            self.__addEntry("D_%d" % (800000 + i), self.__rng.randint(0, 900))
+        #
+        self.__path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.__path)
+
+    def __addEntry(self, entryId, age):
+        if entryId not in self.__db.piMap:
+            self.__db.piMap[entryId] = [self.__rng.choice(self.__pis) for _i in range(self.__rng.choice([0, 1, 1, 1, 2]))]
+        #
+        ordinal = len([event for event in self.__db.events if event[0] == entryId]) + 1
+        for dOrdinal in range(self.__rng.choice([1, 1, 2])):
+            self.__db.events.append((entryId, ordinal * 10 + dOrdinal, ordinal, str(self.__today - timedelta(age))))
+        #
+
+    def __getSummary(self):
+        return ReplaceCountSummary(snapshotPath=self.__path, contentDB=self.__db, log=StringIO())
+
+    def testRebuildAndCheck(self):
+        summary = self.__getSummary()
+        self.assertEqual(summary.rebuild(), 'OK')
+        self.assertEqual(normalize(summary.getReplaceCounts()), normalize(self.__db.GetReplaceCounts()))
+        self.assertEqual(summary.check(), [])
+        names = [row['name'] for row in summary.getReplaceCounts()]
+        self.assertEqual(names[0], None)
+        self.assertEqual(names[1:], sorted(names[1:], key=lambda name: name.lower()))
+
+    def testIncrementalRefresh(self):
+        self.assertEqual(self.__getSummary().refresh(), 'OK')
+        for _round in range(3):
+            # new replacements of new and existing entries, some dated back into the overlap
+            for _i in range(50):
+                self.__addEntry("D_%d" % (800000 + self.__rng.randint(0, 1000)), self.__rng.randint(0, 20))
+            #
+            summary = self.__getSummary()
+            self.assertEqual(summary.refresh(), 'OK')
+            self.assertEqual(self.__db.sinceList[-1], str(self.__today - timedelta(30)))
+            self.assertEqual(normalize(summary.getReplaceCounts()), normalize(self.__db.GetReplaceCounts()))
+            self.assertEqual(summary.check(), [])
+        #
+
+    def testDateFilter(self):
+        summary = self.__getSummary()
+        self.assertEqual(summary.refresh(maxAge=3600), 'OK')
+        # revisions older than historyDays are not read
+        self.assertEqual(self.__db.sinceList, [str(self.__today - timedelta(730))])
+        self.assertTrue(summary.covers())
+        self.assertTrue(summary.covers(self.__today - timedelta(730)))
+        self.assertFalse(summary.covers(self.__today - timedelta(731)))
+        for startAge, endAge in ((730, 0), (200, 100), (30, 30), (10, 20)):
+            start = str(self.__today - timedelta(startAge))
+            end = str(self.__today - timedelta(endAge))
+            self.assertEqual(normalize(summary.getReplaceCounts(startdate=start, enddate=end)),
+                             normalize(self.__db.GetReplaceCountsInRange(startdate=start, enddate=end)))
+        #
+
+    def testPIChange(self):
+        summary = self.__getSummary()
+        self.assertEqual(summary.rebuild(), 'OK')
+        # a PI change of an entry without new replacements
+        entryId = [event[0] for event in self.__db.events if event[3] >= str(self.__today - timedelta(300))][0]
+        self.__db.piMap[entryId] = [("0000-0009-9999", "New, PI")]
+        self.assertEqual(summary.refresh(), 'OK')
+        self.assertEqual(summary.check(), [])
+        self.assertTrue([row for row in summary.getReplaceCounts() if row['identifier_ORCID'] == "0000-0009-9999"])
+
+    def testCheckReportsDifferences(self):
+        summary = self.__getSummary()
+        self.assertEqual(summary.rebuild(), 'OK')
+        # a revision dated before the refresh overlap is only seen by a rebuild
+        self.__db.events.append(("D_800000", 990, 99, str(self.__today - timedelta(100))))
+        self.__db.piMap["D_800000"] = [("0000-0009-9999", "New, PI")]
+        self.assertEqual(summary.refresh(), 'OK')
+        self.assertTrue([diff for diff in summary.check() if "0000-0009-9999" in diff])
+        self.assertEqual(summary.rebuild(), 'OK')
+        self.assertEqual(summary.check(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
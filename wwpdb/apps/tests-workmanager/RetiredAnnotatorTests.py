@@ -0,0 +1,107 @@
+##
+# File: RetiredAnnotatorTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Retired annotator anti-join query on a case-insensitive sqlite copy of deposition and da_users"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import random
+import sqlite3
+import sys
+import time
+import unittest
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+if __package__ is None or __package__ == "":
+    from os import path
+
+    sys.path.append(path.dirname(path.abspath(__file__)))
+    from commonsetup import FakeConfigInfo, SqliteDbApi, patchModule  # pylint: disable=import-error
+else:
+    from .commonsetup import FakeConfigInfo, SqliteDbApi, patchModule
+
+from wwpdb.apps.workmanager.db_access.StatusDbApi import StatusDbApi
+
+# initials of the deposition rows without an active da_users account ( active = 0 )
+RETIRED = ["A%03d" % i for i in range(120, 300)]
+
+
+class RetiredAnnotatorTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(3)
+        initials = ["A%03d" % i for i in range(300)]
+        SqliteDbApi.connection = sqlite3.connect(":memory:")
+        # case-insensitive text columns, as with the default collation of MySQL
+        SqliteDbApi.connection.execute("create table deposition ( dep_set_id text primary key, annotator_initials text collate nocase )")
+        SqliteDbApi.connection.execute("create table da_users ( initials text collate nocase, active integer )")
+        depRows = []
+        for i in range(200000):
+            value = rng.choice(initials + ["UNKNOWN", "unassign", "", None])
+            if value and (rng.random() < 0.2):
+                value = value.lower()
+            #
+            depRows.append(("D_%d" % (1000000 + i), value))
+        #
+        SqliteDbApi.connection.executemany("insert into deposition values ( ?, ? )", depRows)
+        # active accounts ( active = 0 ), disabled accounts and accounts without entries
+        userRows = [(value.lower() if i % 3 else value, 0) for i, value in enumerate(initials[:120])]
+        userRows += [(value, 1) for value in initials[120:160]] + [("Z%03d" % i, 0) for i in range(20)] + [(None, 0)]
+        SqliteDbApi.connection.executemany("insert into da_users values ( ?, ? )", userRows)
+
+    @classmethod
+    def tearDownClass(cls):
+        SqliteDbApi.connection.close()
+        SqliteDbApi.connection = None
+
+    def setUp(self):
+        patchModule(self, "wwpdb.apps.workmanager.db_access.StatusDbApi", ConfigInfo=FakeConfigInfo, DbApiUtil=SqliteDbApi)
+        SqliteDbApi.statements = []
+        self.__statusDB = StatusDbApi(log=StringIO())
+        self.__statusDB.invalidateReferenceCache()
+
+    def testRetiredInitials(self):
+        # upper case, without UNKNOWN, UNASSIGN, empty and NULL initials, active accounts in any case are left out
+        self.assertEqual(self.__statusDB.getRetiredAnnotatorInitials(), RETIRED)
+
+    def testCachedAndInvalidated(self):
+        retiredSql = StatusDbApi._StatusDbApi__schemaMap["SELECT_RETIRED_ANNOTATOR"]  # pylint: disable=protected-access
+        self.assertEqual(self.__statusDB.getRetiredAnnotatorInitials(), RETIRED)
+        # shared by all instances
+        self.assertEqual(StatusDbApi(log=StringIO()).getRetiredAnnotatorInitials(), RETIRED)
+        self.assertEqual(SqliteDbApi.statements.count(retiredSql), 1)
+        # a da_users update drops the cached list
+        self.addCleanup(SqliteDbApi.connection.execute, "delete from da_users where initials = 'A200'")
+        self.__statusDB.runUpdate(table='da_users', where={'initials': 'A200'}, data={'active': 0})
+        self.assertEqual(self.__statusDB.getRetiredAnnotatorInitials(), [initials for initials in RETIRED if initials != 'A200'])
+        self.assertEqual(SqliteDbApi.statements.count(retiredSql), 2)
+
+    def testBenchmark(self):
+        startTime = time.time()
+        for _i in range(5):
+            self.__statusDB.invalidateReferenceCache()
+            self.__statusDB.getRetiredAnnotatorInitials()
+        #
+        queryTime = (time.time() - startTime) / 5
+        startTime = time.time()
+        for _i in range(1000):
+            self.__statusDB.getRetiredAnnotatorInitials()
+        #
+        cachedTime = (time.time() - startTime) / 1000
+        print("\n200000 deposition rows: anti-join %.4fs, cached %.7fs" % (queryTime, cachedTime))
+        self.assertTrue(cachedTime < queryTime)
+
+
+if __name__ == '__main__':
+    unittest.main()
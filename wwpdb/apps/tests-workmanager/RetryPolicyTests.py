@@ -0,0 +1,88 @@
+##
+# File: RetryPolicyTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Test cases for the database retry policy and circuit breaker"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import time
+import unittest
+
+from wwpdb.apps.workmanager.db_access.RetryPolicy import CircuitBreaker, RetryPolicy, setRequestDeadline
+
+
+class RetryPolicyTests(unittest.TestCase):
+    def testBackoff(self):
+        policy = RetryPolicy(maxAttempts=6, baseDelay=0.1, maxDelay=0.5, deadline=5.0)
+        for attempt in range(1, 6):
+            for _i in range(20):
+                delay = policy.getDelay(attempt)
+                self.assertTrue(0 <= delay <= min(0.5, 0.1 * (2 ** (attempt - 1))))
+            #
+        #
+
+    def testRequestDeadline(self):
+        policy = RetryPolicy(deadline=5.0)
+        startTime = time.time()
+        self.assertAlmostEqual(policy.getDeadline(startTime), startTime + 5.0)
+        setRequestDeadline(1.0)
+        try:
+            self.assertTrue(policy.getDeadline(startTime) <= time.time() + 1.0)
+        finally:
+            setRequestDeadline(None)
+        #
+        self.assertAlmostEqual(policy.getDeadline(startTime), startTime + 5.0)
+
+    def testCircuitBreaker(self):
+        breaker = CircuitBreaker(name="test", failureThreshold=2, resetTimeout=0.05, halfOpenProbes=1)
+        self.assertTrue(breaker.allowRequest())
+        breaker.recordFailure()
+        self.assertEqual(breaker.getState(), CircuitBreaker.CLOSED)
+        breaker.recordFailure()
+        self.assertEqual(breaker.getState(), CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allowRequest())
+        time.sleep(0.06)
+        # one probe is let through, concurrent requests still fail fast
+        self.assertTrue(breaker.allowRequest())
+        self.assertEqual(breaker.getState(), CircuitBreaker.HALF_OPEN)
+        self.assertFalse(breaker.allowRequest())
+        # failed probe re-opens the breaker
+        breaker.recordFailure()
+        self.assertEqual(breaker.getState(), CircuitBreaker.OPEN)
+        time.sleep(0.06)
+        self.assertTrue(breaker.allowRequest())
+        breaker.recordSuccess()
+        self.assertEqual(breaker.getState(), CircuitBreaker.CLOSED)
+        self.assertTrue(breaker.allowRequest())
+        self.assertEqual(breaker.getStats()["opened"], 2)
+
+    def testHalfOpenProbes(self):
+        breaker = CircuitBreaker(name="test", failureThreshold=1, resetTimeout=0.05, halfOpenProbes=1)
+        breaker.recordFailure()
+        time.sleep(0.06)
+        self.assertTrue(breaker.allowRequest())
+        self.assertFalse(breaker.allowRequest())
+        # a probe which did not reach the server gives its slot back
+        breaker.releaseProbe()
+        self.assertTrue(breaker.allowRequest())
+        self.assertFalse(breaker.allowRequest())
+        # a probe which never reports is replaced after resetTimeout
+        time.sleep(0.06)
+        self.assertTrue(breaker.allowRequest())
+        self.assertEqual(breaker.getState(), CircuitBreaker.HALF_OPEN)
+        # releasing does nothing once the breaker is closed
+        breaker.recordSuccess()
+        breaker.releaseProbe()
+        self.assertEqual(breaker.getState(), CircuitBreaker.CLOSED)
+        self.assertEqual(breaker.getStats()["probes"], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,235 @@
+##
+# File: StatsSnapshotTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Incremental refresh of the statistics snapshot against a rebuild from scratch"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import unittest
+from collections import Counter
+from datetime import date, timedelta
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from commonsetup import FakeConfigInfo, SqliteDbApi, patchModule  # pylint: disable=import-error
+else:
+    from .commonsetup import FakeConfigInfo, SqliteDbApi, patchModule
+
+from wwpdb.apps.workmanager.db_access.ContentDbApi import ContentDbApi
+from wwpdb.apps.workmanager.db_access.StatsSnapshot import StatsSnapshot
+
+STATUS_CODES = ['PROC', 'WAIT', 'AUTH', 'HPUB', 'REL', 'POLC', 'REPL', 'AUCO', 'proc', 'Auth', 'wait ', ' PROC', '', None]
+
+
+def compareStatusCode(value1, value2):
+    """ Default MySQL collation: case-insensitive, trailing spaces ignored
+    """
+    value1 = value1.rstrip(' ').upper()
+    value2 = value2.rstrip(' ').upper()
+    return (value1 > value2) - (value1 < value2)
+
+
+class FakeDb(object):
+    """ rcsb_status as { structure_id : ( status_code, rcsb_annotator, date_begin_processing ) } and the
+        wf_instance updates as [ ( timestamp, dep_set_id ) ]. The content database queries are run by ContentDbApi
+        on a sqlite copy of rows.
+    """
+    def __init__(self):
+        self.rows = {}
+        self.updates = []
+        self.queries = 0
+        self.__connection = sqlite3.connect(":memory:", check_same_thread=False)
+        self.__connection.create_collation("mysql_ci", compareStatusCode)
+        self.__connection.execute("create table rcsb_status ( structure_id text primary key, status_code text collate mysql_ci, "
+                                  + "rcsb_annotator text, date_begin_processing text )")
+        self.__contentDB = ContentDbApi(log=StringIO())
+
+    def close(self):
+        self.__connection.close()
+
+    def setRow(self, structureId, state):
+        if state is None:
+            self.rows.pop(structureId, None)
+        else:
+            self.rows[structureId] = state
+        #
+        self.updates.append((time.time(), structureId))
+
+    def __getContentDB(self):
+        SqliteDbApi.connection = self.__connection
+        self.__connection.execute("delete from rcsb_status")
+        self.__connection.executemany("insert into rcsb_status values ( ?, ?, ?, ? )", [(entryId,) + state for entryId, state in self.rows.items()])
+        return self.__contentDB
+
+    def getChangedDepositionIds(self, timestamp=None):
+        self.queries += 1
+        return sorted(set([entryId for clock, entryId in self.updates if clock > timestamp]))
+
+    def getStatsEntryInfo(self, idList=None):
+        self.queries += 1
+        return self.__getContentDB().getStatsEntryInfo(idList=idList)
+
+    def getAllStatsEntryInfo(self, startdate=None):
+        self.queries += 1
+        return self.__getContentDB().getAllStatsEntryInfo(startdate=startdate)
+
+    def getDailyStatsCounts(self, startdate=None, enddate=None):
+        return self.__getContentDB().getDailyStatsCounts(startdate=startdate, enddate=enddate)
+
+    def getInProcessStatsCounts(self):
+        return self.__getContentDB().getInProcessStatsCounts()
+
+
+class StatsSnapshotTests(unittest.TestCase):
+    def setUp(self):
+        patchModule(self, "wwpdb.apps.workmanager.db_access.ContentDbApi", ConfigInfo=FakeConfigInfo, DbApiUtil=SqliteDbApi)
+        self.__rng = random.Random(11)
+        self.__today = date.today()
+        self.__db = FakeDb()
+        self.addCleanup(self.__db.close)
+        for i in range(3000):
+            self.__db.rows["D_%d" % (800000 + i)] = self.__randomState()
+        #
+        self.__path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.__path)
+
+    def __randomState(self):
+        day = str(self.__today - timedelta(self.__rng.randint(0, 120))) if self.__rng.random() > 0.05 else None
+        return (self.__rng.choice(STATUS_CODES), self.__rng.choice(["AB", "CD", "EF", None]), day)
+
+    def __getSnapshot(self, path=None):
+        return StatsSnapshot(snapshotPath=path or self.__path, statusDB=self.__db, contentDB=self.__db, retentionDays=60, log=StringIO())
+
+    def __assertMatchesDatabase(self, snapshot):
+        start = self.__today - timedelta(60)
+        self.assertEqual(snapshot.getDailyCounts(startdate=start, enddate=self.__today), self.__db.getDailyStatsCounts(startdate=start, enddate=self.__today))
+        self.assertEqual(snapshot.getInProcessCounts(), self.__db.getInProcessStatsCounts())
+
+    def testRebuild(self):
+        snapshot = self.__getSnapshot()
+        self.assertEqual(snapshot.rebuild(), 'OK')
+        self.__assertMatchesDatabase(snapshot)
+        self.assertTrue(snapshot.covers(self.__today - timedelta(27)))
+        self.assertFalse(snapshot.covers(self.__today - timedelta(61)))
+        self.assertEqual(snapshot.verify(), [])
+
+    def testIncrementalRefresh(self):
+        snapshot = self.__getSnapshot()
+        self.assertEqual(snapshot.refresh(), 'OK')
+        idList = sorted(self.__db.rows.keys())
+        for _round in range(5):
+            # status changes, re-assignments, new and removed entries
+            for _i in range(200):
+                entryId = self.__rng.choice(idList)
+                self.__db.setRow(entryId, self.__randomState())
+            #
+            for i in range(20):
+                self.__db.setRow("D_9%05d%d" % (i, _round), self.__randomState())
+            #
+            for _i in range(10):
+                self.__db.setRow(self.__rng.choice(idList), None)
+            #
+            self.assertEqual(self.__getSnapshot().refresh(), 'OK')
+            snapshot = self.__getSnapshot()
+            self.assertEqual(snapshot.load(), 'OK')
+            self.__assertMatchesDatabase(snapshot)
+            self.assertEqual(snapshot.verify(), [])
+        #
+        rebuilt = self.__getSnapshot(path=tempfile.mkdtemp(dir=self.__path))
+        self.assertEqual(rebuilt.rebuild(), 'OK')
+        self.assertEqual(rebuilt.getDailyCounts(startdate=self.__today - timedelta(60), enddate=self.__today),
+                         snapshot.getDailyCounts(startdate=self.__today - timedelta(60), enddate=self.__today))
+        self.assertEqual(rebuilt.getInProcessCounts(), snapshot.getInProcessCounts())
+
+    def testRefreshEntriesAndMaxAge(self):
+        snapshot = self.__getSnapshot()
+        self.assertEqual(snapshot.refreshEntries(["D_800000"]), None)
+        self.assertEqual(snapshot.rebuild(), 'OK')
+        self.__db.rows["D_800000"] = ("AUTH", "AB", str(self.__today))
+        self.__db.rows["D_800001"] = ("HPUB", "CD", str(self.__today))
+        self.assertEqual(snapshot.refreshEntries(["D_800000", "D_800001"]), 'OK')
+        self.__assertMatchesDatabase(snapshot)
+        # a fresh snapshot is used without any database query
+        self.__db.queries = 0
+        self.assertEqual(self.__getSnapshot().refresh(maxAge=300), 'OK')
+        self.assertEqual(self.__db.queries, 0)
+
+    def testWindowMoves(self):
+        self.assertEqual(self.__getSnapshot().rebuild(), 'OK')
+        # a later day looks like a shorter retention
+        snapshot = StatsSnapshot(snapshotPath=self.__path, statusDB=self.__db, contentDB=self.__db, retentionDays=30, log=StringIO())
+        self.__db.setRow("D_800000", ("HPUB", "AB", str(self.__today - timedelta(45))))
+        self.__db.setRow("D_800001", ("HPUB", "AB", str(self.__today - timedelta(5))))
+        self.assertEqual(snapshot.refresh(), 'OK')
+        self.assertFalse(snapshot.covers(self.__today - timedelta(45)))
+        start = self.__today - timedelta(30)
+        self.assertEqual(snapshot.getDailyCounts(startdate=start, enddate=self.__today), self.__db.getDailyStatsCounts(startdate=start, enddate=self.__today))
+        self.assertEqual(snapshot.verify(), [])
+
+    def testVerifyReportsDifferences(self):
+        snapshot = self.__getSnapshot()
+        self.assertEqual(snapshot.rebuild(), 'OK')
+        # changed without a workflow instance update, only the rebuild sees it
+        self.__db.rows["D_800000"] = ("AUTH", "XY", str(self.__today))
+        self.assertEqual(snapshot.refresh(), 'OK')
+        self.assertEqual(len([diff for diff in snapshot.verify() if "'XY'" in diff]), 2)
+        self.assertEqual(snapshot.rebuild(), 'OK')
+        self.assertEqual(snapshot.verify(), [])
+
+    def testStatusCodeRules(self):
+        today = str(self.__today)
+        self.__db.rows = {}
+        for i, status in enumerate(['proc', 'Proc ', 'PROC', 'Auth', 'auth  ', 'REPL', ' PROC', '', None, 'hpub', 'Hpub ', 'auco']):
+            self.__db.rows["D_%d" % (800000 + i)] = (status, "AB", today)
+        #
+        snapshot = self.__getSnapshot()
+        self.assertEqual(snapshot.rebuild(), 'OK')
+        self.__assertMatchesDatabase(snapshot)
+        # done: not PROC, WAIT, POLC, AUCO in any case, with an empty or unknown code, without a NULL one
+        self.assertEqual(snapshot.getDailyCounts(startdate=today, enddate=today), {self.__today: Counter({"AB": 7})})
+        self.assertEqual(snapshot.getInProcessCounts(), {"PROC": Counter({"AB": 3}), "AUTH": Counter({"AB": 2}), "REPL": Counter({"AB": 1})})
+
+    def testMaxBuildAge(self):
+        snapshot = StatsSnapshot(snapshotPath=self.__path, statusDB=self.__db, contentDB=self.__db, retentionDays=60, maxBuildAge=3600, log=StringIO())
+        self.assertEqual(snapshot.refresh(), 'OK')
+        builtAt = snapshot.getInfo()['built_at']
+        # changed without a workflow instance update: the refresh misses it until the snapshot is a day old
+        self.__db.rows["D_800000"] = ("AUTH", "XY", str(self.__today))
+        self.assertEqual(snapshot.refresh(), 'OK')
+        self.assertEqual(snapshot.getInfo()['built_at'], builtAt)
+        self.assertNotEqual(snapshot.verify(), [])
+        now = time.time()
+        with patch("wwpdb.apps.workmanager.db_access.StatsSnapshot.time.time", return_value=now + 3600):
+            self.assertEqual(snapshot.refresh(), 'OK')
+        #
+        self.assertEqual(snapshot.getInfo()['built_at'], now + 3600)
+        self.__assertMatchesDatabase(snapshot)
+        self.assertEqual(snapshot.verify(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,202 @@
+##
+# File: StatsUtilTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Equivalence of the grouped statistics queries with the former per-day / per-week queries"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import functools
+import shutil
+import tempfile
+import unittest
+from collections import Counter
+from datetime import date, timedelta
+
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
+from wwpdb.apps.workmanager.db_access.StatsSnapshot import StatsSnapshot
+from wwpdb.apps.workmanager.db_access.StatsUtil import StatsUtil
+
+DONE_EXCLUDED = ('PROC', 'WAIT', 'POLC', 'AUCO')
+IN_PROCESS = ('WAIT', 'PROC', 'AUTH', 'POLC', 'REPL')
+STATUS_CODES = ['PROC', 'WAIT', 'AUTH', 'HPUB', 'REL', 'POLC', 'REPL', 'AUCO']
+# a Wednesday: the last column of the monthly table is a partial week
+TODAY = date(2026, 10, 14)
+# names of the ContentDbApi methods called, in order
+QUERY_LOG = []
+
+# Tables returned by the former StatsUtil ( one getDailyStatsList() per day, one getRangeStatsList() per week,
+# getInProcessStatsList() ) run against FakeContentDb with the rows of getRows() and TODAY
+WEEKLY_COLUMNS = [{'label': 'Annotator', 'data-field': '0'}, {'label': 'Thu (10/08)', 'data-field': '1'}, {'label': 'Fri (10/09)', 'data-field': '2'},
+                  {'label': 'Sat (10/10)', 'data-field': '3'}, {'label': 'Sun (10/11)', 'data-field': '4'}, {'label': 'Mon (10/12)', 'data-field': '5'},
+                  {'label': 'Tue (10/13)', 'data-field': '6'}, {'label': 'Wed (10/14)', 'data-field': '7'}, {'label': 'Total', 'data-field': '8'},
+                  {'label': 'Average', 'data-field': '9'}]
+WEEKLY_DATA = [
+    {'0': 'AB', '1': '5', '2': '3', '3': '5', '4': '3', '5': '4', '6': '4', '7': '6', '8': '30', '9': '6.00'},
+    {'0': 'CD', '1': '9', '2': '8', '3': '9', '4': '8', '5': '8', '6': '9', '7': '6', '8': '57', '9': '11.40'},
+    {'0': 'EF', '1': '1', '2': '4', '3': '3', '4': '1', '5': '2', '6': '2', '7': '0', '8': '13', '9': '2.60'},
+    {'0': 'total', '1': '15', '2': '15', '3': '17', '4': '12', '5': '14', '6': '15', '7': '12', '8': '100', '9': '20.00'},
+]
+MONTHLY_COLUMNS = [{'label': 'Annotator', 'data-field': '0'}, {'label': 'Mon(09/21) - Sun(09/27)', 'data-field': '1'},
+                   {'label': 'Mon(09/28) - Sun(10/04)', 'data-field': '2'}, {'label': 'Mon(10/05) - Sun(10/11)', 'data-field': '3'},
+                   {'label': 'Mon(10/12) - Wed(10/14)', 'data-field': '4'}, {'label': 'Total', 'data-field': '5'}, {'label': 'Average', 'data-field': '6'}]
+MONTHLY_DATA = [
+    {'0': 'AB', '1': '43', '2': '34', '3': '36', '4': '14', '5': '127', '6': '31.75'},
+    {'0': 'CD', '1': '53', '2': '43', '3': '54', '4': '23', '5': '173', '6': '43.25'},
+    {'0': 'EF', '1': '15', '2': '10', '3': '15', '4': '4', '5': '44', '6': '11.00'},
+    {'0': 'total', '1': '111', '2': '87', '3': '105', '4': '41', '5': '344', '6': '86.00'},
+]
+PROCESS_COLUMNS = [{'label': 'Annotator', 'data-field': '0'}, {'label': 'WAIT', 'data-field': '1'}, {'label': 'PROC', 'data-field': '2'},
+                   {'label': 'AUTH', 'data-field': '3'}, {'label': 'POLC', 'data-field': '4'}, {'label': 'REPL', 'data-field': '5'},
+                   {'label': 'Total', 'data-field': '6'}]
+PROCESS_DATA = [
+    {'0': 'AB', '1': '43', '2': '58', '3': '57', '4': '42', '5': '58', '6': '258'},
+    {'0': 'CD', '1': '58', '2': '77', '3': '76', '4': '57', '5': '77', '6': '345'},
+    {'0': 'EF', '1': '14', '2': '18', '3': '20', '4': '14', '5': '19', '6': '85'},
+    {'0': 'total', '1': '115', '2': '153', '3': '153', '4': '113', '5': '154', '6': '688'},
+]
+
+
+def getRows():
+    return [{"structure_id": "D_%d" % (800000 + i), "rcsb_annotator": ["AB", "CD", "EF", "XY", None][(i * i + i // 3) % 5],
+             "status_code": STATUS_CODES[(i * 3 + i // 7) % 8], "date_begin_processing": TODAY - timedelta((i * 7 + i // 11) % 41)} for i in range(2000)]
+
+
+class FixedDate(date):
+    @classmethod
+    def today(cls):
+        return TODAY
+
+
+class FakeStatusDb(object):
+    def __init__(self, *_args, **_kwargs):
+        pass
+
+    def getActiveAnnoList(self):
+        return [{"initials": "AB"}, {"initials": "CD"}, {"initials": "EF"}]
+
+    def getChangedDepositionIds(self, timestamp=None):  # pylint: disable=unused-argument
+        return []
+
+
+class UnavailableSnapshot(object):
+    def __init__(self, *_args, **_kwargs):
+        pass
+
+    def refresh(self, maxAge=None):  # pylint: disable=unused-argument
+        return None
+
+
+class FakeContentDb(object):
+    """ In-memory rcsb_status answering the former per-day / per-week queries ( GET_DAILY_STATS, GET_RANGE_STATS,
+        GET_INPROCESS_STATS ) and the grouped statistics queries
+    """
+    rows = []
+
+    def __init__(self, *_args, **_kwargs):
+        pass
+
+    def getDailyStatsList(self, date=None):  # pylint: disable=redefined-outer-name
+        QUERY_LOG.append("getDailyStatsList")
+        return [row["rcsb_annotator"] for row in self.rows if (row["status_code"] not in DONE_EXCLUDED) and (row["date_begin_processing"] == date)]
+
+    def getRangeStatsList(self, startdate=None, enddate=None):
+        QUERY_LOG.append("getRangeStatsList")
+        return [row["rcsb_annotator"] for row in self.rows if (row["status_code"] not in DONE_EXCLUDED)
+                and (startdate <= row["date_begin_processing"] <= enddate)]
+
+    def getInProcessStatsList(self):
+        QUERY_LOG.append("getInProcessStatsList")
+        return [{"rcsb_annotator": row["rcsb_annotator"], "status_code": row["status_code"]} for row in self.rows if row["status_code"] in IN_PROCESS]
+
+    def getDailyStatsCounts(self, startdate=None, enddate=None):
+        QUERY_LOG.append("getDailyStatsCounts")
+        return_dir = {}
+        for row in self.rows:
+            if (row["status_code"] not in DONE_EXCLUDED) and (startdate <= row["date_begin_processing"] <= enddate):
+                return_dir.setdefault(row["date_begin_processing"], Counter())[row["rcsb_annotator"]] += 1
+            #
+        #
+        return return_dir
+
+    def getAllStatsEntryInfo(self, startdate=None):
+        return [(row["structure_id"], row["status_code"], row["rcsb_annotator"], str(row["date_begin_processing"])) for row in self.rows
+                if (row["status_code"] in IN_PROCESS) or (str(row["date_begin_processing"]) >= startdate)]
+
+    def getInProcessStatsCounts(self):
+        QUERY_LOG.append("getInProcessStatsCounts")
+        return_dir = {}
+        for row in (row for row in self.rows if row["status_code"] in IN_PROCESS):
+            return_dir.setdefault(row["status_code"], Counter())[row["rcsb_annotator"]] += 1
+        #
+        return return_dir
+
+
+class StatsUtilTests(unittest.TestCase):
+    def setUp(self):
+        FakeContentDb.rows = getRows()
+        for name, fake in (("StatsUtil.StatusDbApi", FakeStatusDb), ("StatsUtil.ContentDbApi", FakeContentDb), ("StatsUtil.date", FixedDate),
+                           ("StatsSnapshot.date", FixedDate)):
+            patcher = patch("wwpdb.apps.workmanager.db_access." + name, fake)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        #
+        self.__snapshotPatcher = patch("wwpdb.apps.workmanager.db_access.StatsUtil.StatsSnapshot", UnavailableSnapshot)
+        self.__snapshotPatcher.start()
+        self.addCleanup(self.__stopSnapshotPatcher)
+
+    def __stopSnapshotPatcher(self):
+        self.__snapshotPatcher.stop()
+
+    def __useSnapshot(self):
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        self.__snapshotPatcher.stop()
+        self.__snapshotPatcher = patch("wwpdb.apps.workmanager.db_access.StatsUtil.StatsSnapshot", functools.partial(StatsSnapshot, snapshotPath=path))
+        self.__snapshotPatcher.start()
+
+    def __getResult(self, method):
+        """ Returns the ( columns, data ) of StatsUtil.method() and the ContentDbApi queries it ran
+        """
+        del QUERY_LOG[:]
+        columns, data = getattr(StatsUtil(), method)()
+        return (list(columns), list(data)), list(QUERY_LOG)
+
+    def testWeeklyStatus(self):
+        result, queries = self.__getResult("getWeeklyStatus")
+        self.assertEqual(result, (WEEKLY_COLUMNS, WEEKLY_DATA))
+        self.assertEqual(queries, ["getDailyStatsCounts"])
+
+    def testMonthlyStats(self):
+        result, queries = self.__getResult("getMonthlyStats")
+        self.assertEqual(result, (MONTHLY_COLUMNS, MONTHLY_DATA))
+        self.assertEqual(queries, ["getDailyStatsCounts"])
+
+    def testProcessStats(self):
+        result, queries = self.__getResult("getProcessStats")
+        self.assertEqual(result, (PROCESS_COLUMNS, PROCESS_DATA))
+        self.assertEqual(queries, ["getInProcessStatsCounts"])
+
+    def testSnapshot(self):
+        self.__useSnapshot()
+        for method, expected in (("getWeeklyStatus", (WEEKLY_COLUMNS, WEEKLY_DATA)), ("getMonthlyStats", (MONTHLY_COLUMNS, MONTHLY_DATA)),
+                                 ("getProcessStats", (PROCESS_COLUMNS, PROCESS_DATA))):
+            result, queries = self.__getResult(method)
+            self.assertEqual(result, expected)
+            # counts come from the snapshot instead of the grouped queries
+            self.assertEqual(queries, [])
+        #
+
+
+if __name__ == '__main__':
+    unittest.main()
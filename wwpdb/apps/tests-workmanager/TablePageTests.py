@@ -0,0 +1,109 @@
+##
+# File: TablePageTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Server-side paging, sorting and filtering of the rendered table rows"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import time
+import unittest
+
+from wwpdb.apps.workmanager.depict.TablePage import getCellText, getRowOrderCacheStats, getTablePage
+
+
+def getRows(count):
+    rows = []
+    for i in range(count):
+        depId = 'D_80002%05d' % i
+        rows.append({'id_link': '<a href="?identifier=%s">%s</a>' % (depId, depId), 'status': ['PROC', 'AUTH', 'HPUB', 'DEP'][i % 4],
+                     'default_order': str((i * 7) % 23), 'dep_title': '<i>Title %d</i>' % i if i % 5 else ''})
+    #
+    return rows
+
+
+class TablePageTests(unittest.TestCase):
+    def testCellText(self):
+        self.assertEqual(getCellText('<a href="?identifier=D_1">D_1</a> <span title="X-RAY">X-RAY</span> '), 'D_1 X-RAY')
+        self.assertEqual(getCellText(None), '')
+        self.assertEqual(getCellText(12), '12')
+        self.assertEqual(getCellText('<i>\u03b1-helix</i> '), '\u03b1-helix')
+
+    def testPage(self):
+        rows = getRows(10)
+        page, total = getTablePage(rows, offset=2, limit=3)
+        self.assertEqual((page, total), (rows[2:5], 10))
+        self.assertEqual(getTablePage(rows, offset=8, limit=5), (rows[8:], 10))
+        self.assertEqual(getTablePage(rows, offset=20, limit=5), ([], 10))
+        self.assertEqual(getTablePage([], offset=0, limit=5), ([], 0))
+
+    def testSort(self):
+        rows = getRows(30)
+        # numbers sort numerically, not as text
+        page, _total = getTablePage(rows, sortKey='default_order')
+        self.assertEqual([int(row['default_order']) for row in page], sorted([int(row['default_order']) for row in rows]))
+        page, _total = getTablePage(rows, sortKey='default_order', descending=True, limit=3)
+        self.assertEqual([row['default_order'] for row in page], ['22', '21', '21'])
+        # HTML tags are ignored, the sort is stable
+        page, _total = getTablePage(rows, sortKey='dep_title', limit=7)
+        self.assertEqual([getCellText(row['dep_title']) for row in page], [''] * 6 + ['Title 1'])
+        self.assertEqual([row['id_link'] for row in page[:6]], [rows[i]['id_link'] for i in range(0, 30, 5)])
+        # only plain decimal text is a number
+        rows = [{'value': value} for value in ('inf', '10', 'nan', '-2.5', '1e3', 'Infinity', '3')]
+        page, _total = getTablePage(rows, sortKey='value')
+        self.assertEqual([row['value'] for row in page], ['-2.5', '3', '10', '1e3', 'inf', 'Infinity', 'nan'])
+
+    def testFilters(self):
+        rows = getRows(40)
+        page, total = getTablePage(rows, filterMap={'status': 'proc'})
+        self.assertEqual(total, 10)
+        self.assertEqual(page, rows[0::4])
+        # all filters must match ignoring case, the link target is not part of the displayed text
+        page, total = getTablePage(rows, filterMap={'status': 'PROC', 'id_link': 'd_800020000', 'dep_title': ''}, sortKey='default_order', limit=2)
+        self.assertEqual(total, 3)
+        self.assertEqual([row['id_link'] for row in page], [rows[0]['id_link'], rows[4]['id_link']])
+        self.assertEqual(getTablePage(rows, filterMap={'id_link': 'identifier'}), ([], 0))
+        self.assertEqual(getTablePage(rows, filterMap={'no_such_column': 'x'}), ([], 0))
+        # unicode cells and filters
+        rows = [{'dep_title': '<i>\u03b1-helix</i>'}, {'dep_title': '\u03b2-sheet'}, {'dep_title': 'coil'}]
+        self.assertEqual(getTablePage(rows, filterMap={'dep_title': '\u0391-HELIX'}), (rows[:1], 1))
+        self.assertEqual(getTablePage(rows, filterMap={'dep_title': '-'}, sortKey='dep_title', descending=True), ([rows[1], rows[0]], 2))
+
+    def testCachedOrder(self):
+        rows = getRows(50)
+        version = ('/tmp/table_1.pkl', 100.0, 2048)
+        before = getRowOrderCacheStats()
+        first = getTablePage(rows, offset=0, limit=10, sortKey='status', version=version)
+        second = getTablePage(rows, offset=10, limit=10, sortKey='status', version=version)
+        after = getRowOrderCacheStats()
+        self.assertEqual((after['hits'] - before['hits'], after['misses'] - before['misses']), (1, 1))
+        self.assertEqual(first[0] + second[0], getTablePage(rows, sortKey='status')[0][:20])
+        # a new version of the table is sorted again
+        rows = rows[:20]
+        self.assertEqual(getTablePage(rows, offset=10, limit=10, sortKey='status', version=('/tmp/table_1.pkl', 200.0, 1024)),
+                         (getTablePage(rows, sortKey='status')[0][10:], 20))
+
+    def testBenchmark(self):
+        rows = getRows(20000)
+        version = ('/tmp/table_2.pkl', 100.0, 4096)
+        startTime = time.time()
+        getTablePage(rows, offset=0, limit=50, sortKey='dep_title', filterMap={'status': 'U'}, version=version)
+        firstTime = time.time() - startTime
+        startTime = time.time()
+        for offset in range(50, 1050, 50):
+            page, total = getTablePage(rows, offset=offset, limit=50, sortKey='dep_title', filterMap={'status': 'U'}, version=version)
+            self.assertEqual(len(page), 50)
+        #
+        pageTime = (time.time() - startTime) / 20
+        self.assertEqual(total, 10000)
+        print("\n20000 rows: first page %.4fs, next pages %.6fs" % (firstTime, pageTime))
+
+
+if __name__ == '__main__':
+    unittest.main()
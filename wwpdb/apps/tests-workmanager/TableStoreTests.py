@@ -0,0 +1,153 @@
+##
+# File: TableStoreTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Columnar table content store and benchmark against the per-table pickles"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from wwpdb.apps.workmanager.depict.ReadConFigFile import dumpPickleFile, loadPickleFile
+from wwpdb.apps.workmanager.depict.TablePage import getTableFilePage, getTablePage
+from wwpdb.apps.workmanager.depict.TableStore import dumpTableFile, loadTableFile, openTableFile
+
+COLUMNS = ['id_link', 'method', 'dep_title', 'status', 'default_order', 'wf_status', 'wf_action', 'add_list', 'communication', 'auxiliary']
+
+
+def getRows(count):
+    rows = []
+    for i in range(count):
+        depId = 'D_80002%05d' % i
+        rows.append({'id_link': '<a href="https://site_ann_tasks_url?identifier=%s">%s</a> <span title="X-RAY DIFFRACTION">X-RAY</span>'
+                     % (depId, depId),
+                     'method': '<i>%s</i>' % ['X-RAY', 'NMR', 'EM'][i % 3],
+                     'dep_title': 'Structure of protein %d α-helix' % i if i % 7 else '',
+                     'status': ['PROC', 'AUTH', 'HPUB', 'DEP'][i % 4], 'default_order': str((i * 7) % 23),
+                     'wf_status': ['waiting', 'closed', 'running'][i % 3], 'wf_action': ['locked', 'run'][i % 2],
+                     'add_list': '<button>Add %s</button>' % depId if i % 5 else 'CD',
+                     'communication': '<a href="?s=S_1&a=AB&id=%s"><img src="wfm_new.png" alt="New Communication"/></a>' % depId,
+                     'auxiliary': ['background-medpink', '', 'background-lightblue'][i % 3]})
+    #
+    return rows
+
+
+class TableStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.__path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.__path)
+
+    def testRoundTrip(self):
+        rows = getRows(100)
+        dumpTableFile(self.__path, 'table_1.tbl', rows)
+        self.assertEqual(loadTableFile(self.__path, 'table_1.tbl'), rows)
+        self.assertEqual(os.listdir(self.__path), ['table_1.tbl'])
+        with openTableFile(self.__path, 'table_1.tbl') as tableFile:
+            self.assertEqual(tableFile.getRowCount(), 100)
+            self.assertEqual(tableFile.getColumnNames(), COLUMNS)
+            self.assertEqual(tableFile.getRows(10, 13), rows[10:13])
+            self.assertEqual(tableFile.getRows(98, 120), rows[98:])
+            self.assertEqual(tableFile.getRows(120, 130), [])
+            self.assertEqual(tableFile.getColumn('dep_title', 5, 8), [row['dep_title'] for row in rows[5:8]])
+            self.assertEqual(tableFile.getColumn('no_such_column', 0, 3), [None, None, None])
+            self.assertEqual(tableFile.getRowsByIndex([42, 7, 99]), [rows[42], rows[7], rows[99]])
+        #
+
+    def testMixedValues(self):
+        rows = [{'a': 'text', 'b': 1, 'c': None}, {'a': 'é', 'b': 2.5, 'c': 'x'}, {'a': '', 'b': True, 'c': 0}]
+        dumpTableFile(self.__path, 'table_1.tbl', rows)
+        self.assertIsNotNone(openTableFile(self.__path, 'table_1.tbl'))
+        self.assertEqual(loadTableFile(self.__path, 'table_1.tbl'), rows)
+        self.assertIs(loadTableFile(self.__path, 'table_1.tbl')[2]['b'], True)
+
+    def testManyColumns(self):
+        # the absolute column positions make the header longer than the header without them
+        rows = [dict([('column_%d' % j, 'x' * (j * 50 + i)) for j in range(400)]) for i in range(3)]
+        dumpTableFile(self.__path, 'table_1.tbl', rows)
+        with openTableFile(self.__path, 'table_1.tbl') as tableFile:
+            self.assertEqual(tableFile.getRows(), rows)
+            self.assertEqual(tableFile.getColumn('column_399', 2, 3), ['x' * (399 * 50 + 2)])
+        #
+
+    def testPickledTables(self):
+        # rows which do not fit the columnar layout, empty tables and pickles of an older session
+        for rows in ([{'a': '1'}, {'b': '2'}], [{'a': ('x', 'y')}], [], [['a', 'b']]):
+            dumpTableFile(self.__path, 'table_1.tbl', rows)
+            self.assertIsNone(openTableFile(self.__path, 'table_1.tbl'))
+            self.assertEqual(loadTableFile(self.__path, 'table_1.tbl'), rows)
+        #
+        rows = getRows(20)
+        dumpPickleFile(self.__path, 'table_content_1.pkl', rows)
+        self.assertEqual(loadTableFile(self.__path, 'table_content_1.pkl'), rows)
+        self.assertIsNone(loadTableFile(self.__path, 'no_such_table.tbl'))
+        self.assertIsNone(openTableFile(self.__path, 'no_such_table.tbl'))
+
+    def testReplaceWhileOpen(self):
+        rows = getRows(50)
+        dumpTableFile(self.__path, 'table_1.tbl', rows)
+        tableFile = openTableFile(self.__path, 'table_1.tbl')
+        dumpTableFile(self.__path, 'table_1.tbl', rows[:10])
+        self.assertEqual(tableFile.getRows(40, 50), rows[40:])
+        newFile = openTableFile(self.__path, 'table_1.tbl')
+        self.assertNotEqual(tableFile.getVersion(), newFile.getVersion())
+        self.assertEqual(newFile.getRowCount(), 10)
+        tableFile.close()
+        newFile.close()
+
+    def testFilePage(self):
+        rows = getRows(300)
+        dumpTableFile(self.__path, 'table_1.tbl', rows)
+        with openTableFile(self.__path, 'table_1.tbl') as tableFile:
+            for kwargs in ({'offset': 20, 'limit': 10}, {'offset': 290, 'limit': 50}, {'sortKey': 'default_order', 'descending': True, 'limit': 25},
+                           {'sortKey': 'dep_title', 'filterMap': {'status': 'proc', 'method': 'x-ray'}, 'offset': 5, 'limit': 5},
+                           {'filterMap': {'id_link': 'd_8000200001'}}, {'filterMap': {'status': ''}, 'offset': 3, 'limit': 2}):
+                self.assertEqual(getTableFilePage(tableFile, **kwargs), getTablePage(rows, **kwargs))
+            #
+        #
+
+    def testBenchmark(self):
+        rows = getRows(10000)
+        startTime = time.time()
+        dumpPickleFile(self.__path, 'table_1.pkl', rows)
+        pickleDumpTime = time.time() - startTime
+        startTime = time.time()
+        dumpTableFile(self.__path, 'table_1.tbl', rows)
+        tableDumpTime = time.time() - startTime
+        #
+        startTime = time.time()
+        for _i in range(10):
+            data = loadPickleFile(self.__path, 'table_1.pkl')
+        #
+        pickleLoadTime = (time.time() - startTime) / 10
+        self.assertEqual(data[5000:5050], rows[5000:5050])
+        startTime = time.time()
+        for _i in range(10):
+            data = loadTableFile(self.__path, 'table_1.tbl')
+        #
+        tableLoadTime = (time.time() - startTime) / 10
+        self.assertEqual(data, rows)
+        startTime = time.time()
+        for _i in range(10):
+            with openTableFile(self.__path, 'table_1.tbl') as tableFile:
+                page = tableFile.getRows(5000, 5050)
+            #
+        #
+        tableSliceTime = (time.time() - startTime) / 10
+        self.assertEqual(page, rows[5000:5050])
+        print("\n10000 rows, pickle: %d bytes, dump %.4fs, load %.4fs; columnar: %d bytes, dump %.4fs, load %.4fs, 50 row slice %.5fs"
+              % (os.path.getsize(os.path.join(self.__path, 'table_1.pkl')), pickleDumpTime, pickleLoadTime,
+                 os.path.getsize(os.path.join(self.__path, 'table_1.tbl')), tableDumpTime, tableLoadTime, tableSliceTime))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+##
+# File: TemplateCacheTests.py
+# Date:  18-Oct-2026
+#
+# Updates:
+##
+"""Template cache revalidation and rendering micro-benchmark"""
+
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.01"
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from wwpdb.apps.workmanager.depict.TemplateCache import CompiledTemplate, TemplateCache
+
+ROW_TEMPLATE = '<tr><td><a href="/service/workmanager/%(class_id)s?identifier=%(dep_set_id)s">%(dep_set_id)s</a></td>' + \
+               '<td>%(status_code)s</td><td style="width:100%%">%(annotator_initials)s</td></tr>\n'
+
+
+def readAndFormat(filePath, parameterDict):
+    """ Former BaseClass._processTemplate()
+    """
+    ifh = open(filePath, 'r')
+    sIn = ifh.read()
+    ifh.close()
+    return (sIn % parameterDict)
+
+
+class TemplateCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.__path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.__path)
+        self.__rowPath = self.__writeTemplate('row_tmplt.html', ROW_TEMPLATE * 5)
+
+    def __writeTemplate(self, fileName, text):
+        filePath = os.path.join(self.__path, fileName)
+        with open(filePath, 'w') as ofh:
+            ofh.write(text)
+        #
+        return filePath
+
+    def testCompiledTemplate(self):
+        myD = {'class_id': 'Annotate', 'dep_set_id': 'D_8000200001', 'status_code': 'PROC', 'annotator_initials': 'AB'}
+        template = CompiledTemplate(ROW_TEMPLATE)
+        self.assertEqual(template.substitute(myD), ROW_TEMPLATE % myD)
+        self.assertEqual(CompiledTemplate('<div>no parameters</div>').substitute(myD), '<div>no parameters</div>')
+        self.assertEqual(CompiledTemplate('100%%').substitute({}), '100%')
+        self.assertRaises(KeyError, CompiledTemplate('%(missing)s').substitute, myD)
+
+    def testRevalidation(self):
+        cache = TemplateCache(checkInterval=0)
+        self.assertEqual(cache.get(self.__rowPath).getText(), ROW_TEMPLATE * 5)
+        self.assertIs(cache.get(self.__rowPath), cache.get(self.__rowPath))
+        # an edited file is read again
+        self.__writeTemplate('row_tmplt.html', '<p>%(dep_set_id)s</p>')
+        st = os.stat(self.__rowPath)
+        os.utime(self.__rowPath, (st.st_atime, st.st_mtime + 10))
+        self.assertEqual(cache.get(self.__rowPath).substitute({'dep_set_id': 'D_1'}), '<p>D_1</p>')
+        # within checkInterval the cached template is used without looking at the file
+        cache = TemplateCache(checkInterval=3600)
+        template = cache.get(self.__rowPath)
+        os.remove(self.__rowPath)
+        self.assertIs(cache.get(self.__rowPath), template)
+        self.assertRaises((IOError, OSError), TemplateCache(checkInterval=0).get, self.__rowPath)
+
+    def testBenchmark(self):
+        cache = TemplateCache()
+        rowList = [{'class_id': 'Annotate', 'dep_set_id': 'D_%d' % (8000200000 + i), 'status_code': 'PROC', 'annotator_initials': 'AB'}
+                   for i in range(2000)]
+        startTime = time.time()
+        expected = [readAndFormat(self.__rowPath, myD) for myD in rowList]
+        readTime = time.time() - startTime
+        startTime = time.time()
+        result = [cache.get(self.__rowPath).substitute(myD) for myD in rowList]
+        cacheTime = time.time() - startTime
+        self.assertEqual(result, expected)
+        self.assertEqual(cache.getStats()['misses'], 1)
+        print("\n2000 rows: read and format %.4fs, template cache %.4fs" % (readTime, cacheTime))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 import sys
 import os
 import platform
+import threading
 
 HERE = os.path.abspath(os.path.dirname(__file__))
 TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
@@ -11,9 +12,9 @@ if not os.path.exists(TESTOUTPUT):
 # We do this here - as unittest loads all at once - need to insure common
 
 try:
-    from unittest.mock import Mock, MagicMock
+    from unittest.mock import Mock, MagicMock, patch
 except ImportError:
-    from mock import Mock, MagicMock
+    from mock import Mock, MagicMock, patch
 
 configInfo = {
     "SITE_REFDATA_PROJ_NAME_CC": "ligand-dict-v3",
@@ -48,3 +49,86 @@ sys.modules["wwpdb.utils.config.ConfigInfo"] = Mock(ConfigInfo=configMock)
 dbAPIMock = MagicMock()
 dbAPIMock.dbAPI.runSelectNQ.return_value = ["someone@unknown.com", "principal investigator/group leader", "One"]
 sys.modules["wwpdb.utils.wf.dbapi.dbAPI"] = dbAPIMock
+
+
+# Shared fakes of the database and depiction tests, imported after the stubs above
+from wwpdb.apps.workmanager.db_access.DbApiUtil import DbApiUtil  # noqa: E402 pylint: disable=wrong-import-position
+
+
+class FakeConfigInfo(object):
+    """ ConfigInfo replacement, patch.dict() values for other site settings
+    """
+    values = {
+        "SITE_DB_HOST_NAME": "localhost",
+        "SITE_DB_DATABASE_NAME": "status",
+        "SITE_DB_PORT_NUMBER": "3306",
+        "SITE_ANN_TASKS_URL": "https://site_ann_tasks_url",
+        "SITE_LE_URL": "https://site_le_url",
+        "SITE_SE_URL": "https://site_se_url",
+        "SITE_TRANS_EDITOR_URL": "https://site_trans_editor_url",
+        "SITE_VAL_TASKS_URL": "https://site_val_tasks_url",
+    }
+
+    def __init__(self, siteId=None):
+        pass
+
+    def get(self, name, default=None):
+        return self.values.get(name, default)
+
+
+class FakeRequest(object):
+    """ Request and session object of annotator 'AB', the session files are kept in sessionPath
+    """
+    def __init__(self, sessionPath):
+        self.__sessionPath = sessionPath
+        self.__values = {"WWPDB_SITE_ID": "TEST", "TemplatePath": sessionPath, "annotator": "AB", "sessionid": "S_1"}
+
+    def getValue(self, name):
+        return self.__values.get(name, "")
+
+    def newSessionObj(self):
+        return self
+
+    def getId(self):
+        return "S_1"
+
+    def getPath(self):
+        return self.__sessionPath
+
+
+class SqliteDbApi(DbApiUtil):
+    """ DbApiUtil running its statements on the sqlite database in connection, the '%s' placeholders bound as '?'.
+        statements keeps the SQL of all instances. The chunk queries run in other threads, connection is opened
+        with check_same_thread=False if chunked selections are used.
+    """
+    connection = None
+    statements = []
+    __lock = threading.Lock()
+
+    def runSelectSQL(self, sql, args=None, key=None, strict=False):
+        with self.__lock:
+            SqliteDbApi.statements.append(sql)
+            curs = self.connection.execute(sql.replace("%s", "?"), args or ())
+            names = [column[0] for column in curs.description]
+            return tuple([dict(zip(names, row)) for row in curs.fetchall()])
+        #
+
+    def iterSelectSQL(self, sql, args=None, fetchSize=None, key=None):
+        return iter(self.runSelectSQL(sql, args, key=key))
+
+    def runUpdateSQL(self, sql, args=None, key=None):
+        with self.__lock:
+            SqliteDbApi.statements.append(sql)
+            self.connection.execute(sql.replace("%s", "?"), args or ())
+            return "OK"
+        #
+
+
+def patchModule(testCase, module, **replacements):
+    """ Replace names of module until the end of testCase
+    """
+    for name, value in replacements.items():
+        patcher = patch(module + "." + name, value)
+        patcher.start()
+        testCase.addCleanup(patcher.stop)
+    #
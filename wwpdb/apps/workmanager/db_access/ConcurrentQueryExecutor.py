@@ -0,0 +1,155 @@
+##
+# File:  ConcurrentQueryExecutor.py
+# Date:  18-Oct-2026
+# Updates:
+#  18-Oct-2026  zf   run on a process-wide shared executor, add runConcurrently() for the chunk queries of DbApiUtil
+##
+"""
+Runs a set of independent database lookups concurrently, each on its own pooled connection.
+
+Lookups are registered with submit( name, function, args ) and executed by run(), which waits for all of
+them and returns { name : result }. If lookups fail, run() re-raises the exception of the first failing
+lookup in submission order, independent of which one finished first. The wall time of each lookup is
+available from getTimings() and is recorded in the query statistics under "lookup:<name>".
+
+All fan-outs of the process share one thread pool ( getSharedExecutor() ), each one bounded by its own number
+of workers. A fan-out started from a thread of that pool ( e.g. chunked IN list queries inside a lookup ) runs
+in the calling thread, so nested fan-outs can not wait on each other for a free thread.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2026 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from wwpdb.apps.workmanager.db_access.QueryStats import getCurrentOp, getQueryStats, setCurrentOp
+
+# threads of the shared executor, at most half of the connections of a pool are used by fan-outs
+_maxSharedWorkers = 4
+# { 'pid' : process which created the executor, 'executor' : ThreadPoolExecutor }
+_sharedExecutorMap = {}
+_sharedExecutorLock = threading.Lock()
+_workerLocal = threading.local()
+
+
+def getSharedExecutor():
+    """ Return the process-wide executor of the concurrent lookups, created on first use ( again in a forked child )
+    """
+    with _sharedExecutorLock:
+        if _sharedExecutorMap.get('pid') != os.getpid():
+            _sharedExecutorMap['executor'] = ThreadPoolExecutor(max_workers=_maxSharedWorkers)
+            _sharedExecutorMap['pid'] = os.getpid()
+        #
+        return _sharedExecutorMap['executor']
+    #
+
+
+def _runGroup(function, argList):
+    _workerLocal.active = True
+    return [function(arg) for arg in argList]
+
+
+def runConcurrently(function, argList, workers):
+    """ Return [ function( arg ) for arg in argList ], computed by at most workers threads of the shared executor.
+        The first exception raised by function is re-raised.
+    """
+    workers = min(workers, len(argList))
+    if (workers < 2) or getattr(_workerLocal, 'active', False):
+        return [function(arg) for arg in argList]
+    #
+    executor = getSharedExecutor()
+    # worker i computes the arguments i, i + workers, ...
+    futureList = [executor.submit(_runGroup, function, argList[i::workers]) for i in range(workers)]
+    resultList = [None] * len(argList)
+    for i, future in enumerate(futureList):
+        resultList[i::workers] = future.result()
+    #
+    return resultList
+
+
+class ConcurrentQueryExecutor(object):
+    """ Bounded fan-out of named lookups
+    """
+    def __init__(self, maxWorkers=4, log=sys.stderr):
+        """
+        """
+        self.__maxWorkers = maxWorkers
+        self.__lfh = log
+        # list of ( name, function, args, kwargs ) in submission order
+        self.__taskList = []
+        self.__timingMap = {}
+
+    def submit(self, name, function, *args, **kwargs):
+        """ Register lookup name as function( *args, **kwargs )
+        """
+        self.__taskList.append((name, function, args, kwargs))
+
+    def run(self):
+        """ Run all submitted lookups and return { name : result }. The task list is cleared.
+        """
+        taskList = self.__taskList
+        self.__taskList = []
+        self.__timingMap = {}
+        if not taskList:
+            return {}
+        #
+        opName = getCurrentOp()
+        outcomeList = runConcurrently(lambda task: self.__runTask(task, opName), taskList, self.__maxWorkers)
+        resultMap = {}
+        firstError = None
+        for (name, _function, _args, _kwargs), (result, error, elapsed) in zip(taskList, outcomeList):
+            self.__timingMap[name] = elapsed
+            if error is None:
+                resultMap[name] = result
+            else:
+                self.__lfh.write("+ConcurrentQueryExecutor.run() lookup %s failed: %s\n" % (name, str(error)))
+                if firstError is None:
+                    firstError = error
+                #
+            #
+        #
+        if firstError is not None:
+            raise firstError
+        #
+        return resultMap
+
+    def getTimings(self):
+        """ Return { name : seconds } of the lookups of the last run()
+        """
+        return dict(self.__timingMap)
+
+    def __runTask(self, task, opName):
+        """ Returns ( result, exception, elapsed time ), exceptions are handed back to run()
+        """
+        name, function, args, kwargs = task
+        # report the statements under the operation of the calling thread, restore the one of this thread afterwards
+        previousOp = getCurrentOp()
+        setCurrentOp(opName)
+        result = None
+        error = None
+        startTime = time.time()
+        try:
+            result = function(*args, **kwargs)
+        except Exception as e:  # pylint: disable=broad-except
+            error = e
+        finally:
+            setCurrentOp(previousOp)
+        #
+        elapsed = time.time() - startTime
+        getQueryStats().record("lookup:" + name, elapsed, error=(error is not None), log=self.__lfh)
+        return result, error, elapsed
@@ -4,6 +4,16 @@
 #
 # Updates:
 #  09-Dec-2024  zf   add getPdbExtIdMap() method.
+#  18-Oct-2026  zf   pass IN list parameters as lists for bound execution
+#  18-Oct-2026  zf   run IN list selections in chunks, getReleaseDate() accepts a list of IDs
+#  18-Oct-2026  zf   add runBulkUpsert()
+#  18-Oct-2026  zf   runSelectSQL() accepts the query statistics key
+#  18-Oct-2026  zf   add getDailyStatsCounts()/getInProcessStatsCounts() grouped statistics queries
+#  18-Oct-2026  zf   add getStatsEntryInfo()/getAllStatsEntryInfo() for the statistics snapshot
+#  18-Oct-2026  zf   add getReplaceEvents()/getReplacePIMap()/GetReplaceCountsInRange() for the replacement count summary
+#  18-Oct-2026  zf   getPdbExtIdMap() serves assigned extended PDB IDs from a process-wide LRU cache
+#  18-Oct-2026  zf   the grouped statistics queries return no counts instead of partial ones if their stream fails
+#  18-Oct-2026  zf   getInProcessStatsCounts() keys the counts by the upper case status code
 #
 ##
 """
@@ -26,9 +36,16 @@ __version__ = "V0.07"
 
 
 import sys
+from collections import Counter
+import datetime
+import MySQLdb
 
 from wwpdb.utils.config.ConfigInfo import ConfigInfo
 from wwpdb.apps.workmanager.db_access.DbApiUtil import DbApiUtil
+from wwpdb.apps.workmanager.db_access.LRUCache import LRUCache
+
+# ( database scope, pdb_id ) -> extended PDB ID, an assigned extended ID never changes
+_pdbExtIdCache = LRUCache(maxSize=20000)
 
 
 class ContentDbApi(object):
@@ -48,6 +65,14 @@ class ContentDbApi(object):
                     "GET_RANGE_STATS" : "select rcsb_annotator from rcsb_status where status_code not in ('PROC','WAIT','POLC','AUCO') " +
                                         "and date_begin_processing  >= '%s' and date_begin_processing <= '%s'",
                 "GET_INPROCESS_STATS" : "select rcsb_annotator, status_code from rcsb_status where status_code in ('WAIT','PROC','AUTH','POLC','REPL')",
+             "GET_DAILY_STATS_COUNTS" : "select date_begin_processing, rcsb_annotator, count(*) as num from rcsb_status where status_code not in " +
+                                        "('PROC','WAIT','POLC','AUCO') and date_begin_processing  >= '%s' and date_begin_processing <= '%s' " +
+                                        "group by date_begin_processing, rcsb_annotator",
+         "GET_INPROCESS_STATS_COUNTS" : "select status_code, rcsb_annotator, count(*) as num from rcsb_status where status_code in " +
+                                        "('WAIT','PROC','AUTH','POLC','REPL') group by status_code, rcsb_annotator",
+              "GET_STATS_ENTRY_INFO" : "select structure_id, status_code, rcsb_annotator, date_begin_processing from rcsb_status where structure_id in ( '%s' )",
+          "GET_STATS_ENTRY_INFO_ALL" : "select structure_id, status_code, rcsb_annotator, date_begin_processing from rcsb_status where status_code in " +
+                                        "('WAIT','PROC','AUTH','POLC','REPL') or date_begin_processing >= '%s'",
                    "GET_RELEASE_DATE" : "select structure_id, pdb_id, date_of_RCSB_release from rcsb_status where structure_id in ( '%s' ) order by structure_id",
                 "GET_EM_RELEASE_DATE" : "select structure_id, current_status, map_release_date date_of_EM_release from em_admin where structure_id in ( '%s' ) order by structure_id",
                  "GET_REPLACE_COUNTS" : "select s2.name, s2.identifier_ORCID, sum(s2.count) as numreplace from " +
@@ -56,6 +81,17 @@ class ContentDbApi(object):
                         "h.Structure_id = d.Structure_id and h.ordinal = d.revision_ordinal and d.type='Coordinate replacement' and DATEDIFF(CURDATE(), h.revision_date) <= 365 " +
                         "group by d.Structure_id  ) s1  where s1.Structure_id = c.Structure_Id and c.role='principal investigator/group leader' " +
                         "order by c.identifier_ORCID ) s2 group by identifier_ORCID, name order by name",
+           "GET_REPLACE_COUNTS_RANGE" : "select s2.name, s2.identifier_ORCID, sum(s2.count) as numreplace from " +
+                        "(select c.identifier_ORCID, CONCAT('', c.name_last, ', ', c.name_first) as name, s1.count from pdbx_contact_author as c, " +
+                        "(select d.Structure_id, count(d.Structure_id) as count   from pdbx_audit_revision_details as d, pdbx_audit_revision_history as h where " +
+                        "h.Structure_id = d.Structure_id and h.ordinal = d.revision_ordinal and d.type='Coordinate replacement' and h.revision_date >= '%s' " +
+                        "and h.revision_date <= '%s' group by d.Structure_id  ) s1  where s1.Structure_id = c.Structure_Id and " +
+                        "c.role='principal investigator/group leader' order by c.identifier_ORCID ) s2 group by identifier_ORCID, name order by name",
+                 "GET_REPLACE_EVENTS" : "select d.Structure_ID as structure_id, d.ordinal as details_ordinal, h.ordinal as revision_ordinal, h.revision_date " +
+                                        "from pdbx_audit_revision_details as d, pdbx_audit_revision_history as h where h.Structure_ID = d.Structure_ID and " +
+                                        "h.ordinal = d.revision_ordinal and d.type='Coordinate replacement' and h.revision_date >= '%s'",
+                "GET_REPLACE_PI_LIST" : "select Structure_ID as structure_id, identifier_ORCID, CONCAT('', name_last, ', ', name_first) as name from " +
+                                        "pdbx_contact_author where Structure_ID in ( '%s' ) and role = 'principal investigator/group leader'",
                  "GET_LIGAND_ID_LIST" : "select Structure_ID, comp_id from pdbx_entity_nonpoly where Structure_ID in ( '%s' )",
                  "GET_EXT_PDB_ID_INFO": "select distinct database_code,pdbx_database_accession from database_2 where database_id = 'PDB' and pdbx_database_accession " +
                                         "is not NULL and pdbx_database_accession != '' and database_code in ( '%s' )"
@@ -80,6 +116,7 @@ class ContentDbApi(object):
         self.__dbApi = DbApiUtil(dbServer=self.__dbServer, dbHost=self.__dbHost, dbName=self.__dbName, dbUser=self.__dbUser, dbPw=self.__dbPw,
                                  dbSocket=self.__dbSocket, dbPort=self.__dbPort, verbose=self.__verbose, log=self.__lfh)
         self.__dbApi.setSchemaMap(self.__schemaMap)
+        self.__cacheScope = (self.__dbHost, self.__dbPort, self.__dbSocket, self.__dbName)
 
     # def __getDataDir(self, key, parameter):
     #     rlist = self.__dbApi.selectData(key=key, parameter=parameter)
@@ -99,7 +136,7 @@ class ContentDbApi(object):
             return None
         #
         if isinstance(depositionid, list):
-            return self.__dbApi.selectData(key="CONTACT_AUTHOR_LIST", parameter=("', '".join(depositionid)))
+            return self.__dbApi.selectDataInChunks(key="CONTACT_AUTHOR_LIST", idList=depositionid)
         #
         return self.__dbApi.selectData(key="CONTACT_AUTHOR", parameter=(depositionid))
 
@@ -108,7 +145,7 @@ class ContentDbApi(object):
             return None
         #
         if isinstance(depositionid, list):
-            return self.__dbApi.selectData(key="CONTACT_AUTHOR_PI_LIST", parameter=("', '".join(depositionid)))
+            return self.__dbApi.selectDataInChunks(key="CONTACT_AUTHOR_PI_LIST", idList=depositionid)
         #
         return self.__dbApi.selectData(key="CONTACT_AUTHOR_PI", parameter=(depositionid))
 
@@ -145,9 +182,90 @@ class ContentDbApi(object):
     def getInProcessStatsList(self):
         return self.__dbApi.selectData(key="GET_INPROCESS_STATS", parameter=())
 
+    def getDailyStatsCounts(self, startdate=None, enddate=None):
+        """ Returns { date : Counter( rcsb_annotator ) } of the GET_DAILY_STATS rows from startdate to enddate,
+            counted by the database in one grouped query. Dates without rows are missing, all dates if the query fails.
+        """
+        return_dir = {}
+        if not startdate or not enddate:
+            return return_dir
+        #
+        try:
+            for row in self.__dbApi.iterSelectData(key="GET_DAILY_STATS_COUNTS", parameter=(startdate, enddate)):
+                day = self.__getDate(row['date_begin_processing'])
+                if day is None:
+                    continue
+                #
+                if day not in return_dir:
+                    return_dir[day] = Counter()
+                #
+                return_dir[day][row['rcsb_annotator']] += int(row['num'])
+            #
+        except MySQLdb.Error:
+            return {}
+        #
+        return return_dir
+
+    def getInProcessStatsCounts(self):
+        """ Returns { status_code : Counter( rcsb_annotator ) } of the GET_INPROCESS_STATS rows, counted by the database.
+            status_code is upper case. Empty if the query fails.
+        """
+        return_dir = {}
+        try:
+            for row in self.__dbApi.iterSelectData(key="GET_INPROCESS_STATS_COUNTS", parameter=()):
+                # the group holds the codes equal to it case-insensitively, any of them may be returned
+                status = str(row['status_code']).rstrip(' ').upper()
+                if status not in return_dir:
+                    return_dir[status] = Counter()
+                #
+                return_dir[status][row['rcsb_annotator']] += int(row['num'])
+            #
+        except MySQLdb.Error:
+            return {}
+        #
+        return return_dir
+
+    def getStatsEntryInfo(self, idList=None):
+        """ Returns [ ( structure_id, status_code, rcsb_annotator, date_begin_processing as 'YYYY-MM-DD' or None ) ] of the
+            entries of idList, None on failure
+        """
+        if not idList:
+            return []
+        #
+        return self.__getStatsEntryInfo(self.__dbApi.selectDataInChunks(key="GET_STATS_ENTRY_INFO", idList=idList))
+
+    def getAllStatsEntryInfo(self, startdate=None):
+        """ Same as getStatsEntryInfo() for all entries in process or with date_begin_processing from startdate on
+        """
+        if not startdate:
+            return None
+        #
+        return self.__getStatsEntryInfo(self.__dbApi.selectData(key="GET_STATS_ENTRY_INFO_ALL", parameter=(str(startdate))))
+
+    def __getStatsEntryInfo(self, rows):
+        if rows is None:
+            return None
+        #
+        entryList = []
+        for row in rows:
+            day = self.__getDate(row['date_begin_processing'])
+            if day is not None:
+                day = str(day)
+            #
+            entryList.append((row['structure_id'], row['status_code'], row['rcsb_annotator'], day))
+        #
+        return entryList
+
     def getReleaseDate(self, id_string):
+        """ id_string is a list of entry IDs, or the IDs joined with "', '"
+        """
+        if isinstance(id_string, (list, tuple, set)):
+            idList = list(id_string)
+        else:
+            idList = str(id_string).split("', '")
+        #
         emReleaseDateMap = {}
-        em_rows = self.__dbApi.selectData(key='GET_EM_RELEASE_DATE', parameter=(id_string))
+        em_rows = self.__dbApi.selectDataInChunks(key='GET_EM_RELEASE_DATE', idList=idList)
         if em_rows:
             for row in em_rows:
                 if ('structure_id' not in row) or (not row['structure_id']) or ('date_of_EM_release' not in row) or \
@@ -158,7 +276,7 @@ class ContentDbApi(object):
             #
         #
         releaseDateMap = {}
-        rows = self.__dbApi.selectData(key='GET_RELEASE_DATE', parameter=(id_string))
+        rows = self.__dbApi.selectDataInChunks(key='GET_RELEASE_DATE', idList=idList)
         if rows:
             for row in rows:
                 if ('structure_id' not in row) or (not row['structure_id']):
@@ -179,31 +297,114 @@ class ContentDbApi(object):
         #
         return self.__dbApi.selectData(key="GET_REPLACE_COUNTS")
 
+    def GetReplaceCountsInRange(self, startdate=None, enddate=None):
+        """ GET_REPLACE_COUNTS for the revisions from startdate to enddate
+        """
+        if not startdate or not enddate:
+            return None
+        #
+        return self.__dbApi.selectData(key="GET_REPLACE_COUNTS_RANGE", parameter=(str(startdate), str(enddate)))
+
+    def getReplaceEvents(self, startdate=None):
+        """ Returns [ ( structure_id, details ordinal, revision ordinal, revision_date as 'YYYY-MM-DD' or None ) ] of the
+            coordinate replacement revisions from startdate on, None on failure
+        """
+        if not startdate:
+            return None
+        #
+        rows = self.__dbApi.selectData(key="GET_REPLACE_EVENTS", parameter=(str(startdate)))
+        if rows is None:
+            return None
+        #
+        eventList = []
+        for row in rows:
+            day = self.__getDate(row['revision_date'])
+            if day is not None:
+                day = str(day)
+            #
+            eventList.append((row['structure_id'], row['details_ordinal'], row['revision_ordinal'], day))
+        #
+        return eventList
+
+    def getReplacePIMap(self, idList=None):
+        """ Returns { structure_id : [ ( identifier_ORCID, 'last, first' name ) ] } of the principal investigators, None on failure
+        """
+        piMap = {}
+        if not idList:
+            return piMap
+        #
+        rows = self.__dbApi.selectDataInChunks(key="GET_REPLACE_PI_LIST", idList=idList)
+        if rows is None:
+            return None
+        #
+        for row in rows:
+            piMap.setdefault(row['structure_id'], []).append((row['identifier_ORCID'], row['name']))
+        #
+        return piMap
+
     def getLigandIdList(self, entryIdList=None):
         #
         if not entryIdList:
             return None
         #
-        return self.__dbApi.selectData(key="GET_LIGAND_ID_LIST", parameter=("', '".join(entryIdList)))
+        return self.__dbApi.selectDataInChunks(key="GET_LIGAND_ID_LIST", idList=entryIdList)
 
     def getPdbExtIdMap(self, pdbIdList):
+        """ Returns { pdb_id : extended PDB ID }. IDs found in the process-wide cache are not selected again,
+            the others are selected in one batch. IDs without an extended ID are not cached.
+        """
         pdbExtIdMap = {}
-        if len(pdbIdList) > 0:
-            rows = self.__dbApi.selectData(key="GET_EXT_PDB_ID_INFO", parameter=("', '".join(pdbIdList)))
-            for row in rows:
+        missingList = []
+        for pdbId in sorted(set(pdbIdList)):
+            extId = _pdbExtIdCache.get((self.__cacheScope, pdbId))
+            if extId:
+                pdbExtIdMap[pdbId] = extId
+            else:
+                missingList.append(pdbId)
+            #
+        #
+        if len(missingList) > 0:
+            rows = self.__dbApi.selectDataInChunks(key="GET_EXT_PDB_ID_INFO", idList=missingList)
+            for row in (rows or ()):
                 if ('database_code' in row) and row['database_code'] and ('pdbx_database_accession' in row) and row['pdbx_database_accession']:
                     pdbExtIdMap[row['database_code']] = row['pdbx_database_accession']
+                    _pdbExtIdCache.put((self.__cacheScope, row['database_code']), row['pdbx_database_accession'])
                 #
             #
         #
         return pdbExtIdMap
 
-    def runSelectSQL(self, sql):
-        return self.__dbApi.runSelectSQL(sql)
+    def getPdbExtIdCacheStats(self):
+        """ Returns the counters ( size, hits, misses, evictions, hit_rate ) of the extended PDB ID cache
+        """
+        return _pdbExtIdCache.getStats()
+
+    def runSelectSQL(self, sql, key=None):
+        return self.__dbApi.runSelectSQL(sql, key=key)
 
     def runUpdate(self, table=None, where=None, data=None):
         return self.__dbApi.runUpdate(table=table, where=where, data=data)
 
+    def runBulkUpsert(self, table=None, key_columns=None, rows=None):
+        return self.__dbApi.runBulkUpsert(table=table, key_columns=key_columns, rows=rows)
+
+    def __getDate(self, value):
+        """ date_begin_processing column value as datetime.date
+        """
+        if not value:
+            return None
+        #
+        if isinstance(value, datetime.datetime):
+            return value.date()
+        elif isinstance(value, datetime.date):
+            return value
+        #
+        try:
+            return datetime.datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+        except ValueError:
+            return None
+        #
+
     def __getAnnoList(self, rlist):
         initial_list = []
         if rlist:
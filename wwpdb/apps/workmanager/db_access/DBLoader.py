@@ -2,6 +2,7 @@
 # File:  DBLoader.py
 # Date:  01-Jul-2016
 # Updates:
+#  18-Oct-2026  zf   write the deposition info of all entries with one bulk upsert
 ##
 """
 
@@ -87,8 +88,8 @@ class DBLoader(object):
     def __runDBLoading(self):
         """
         """
-        statusDB = StatusDbApi(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
         file_list = []
+        depositionRows = []
         for entry_id in self.__entryList:
             sourceFile = self.__pI.getFilePath(dataSetId=entry_id, wfInstanceId=None, contentType='model', formatType='pdbx',
                                                fileSource='archive', versionId='latest', partNumber='1')
@@ -103,7 +104,9 @@ class DBLoader(object):
                     info_data = vList[0]
                     if info_data:
                         self.__returnMessage += 'Loaded ' + entry_id + ' successfully.\n'
-                        statusDB.runUpdate(table='deposition', where={'dep_set_id' : entry_id}, data=info_data)
+                        row = {'dep_set_id' : entry_id}
+                        row.update(info_data)
+                        depositionRows.append(row)
                     else:
                         self.__returnMessage += 'Loading ' + entry_id + ' failed.\n'
                     #
@@ -114,6 +117,10 @@ class DBLoader(object):
                 self.__returnMessage += 'Loading ' + entry_id + ' failed.\n'
             #
         #
+        if depositionRows:
+            statusDB = StatusDbApi(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+            statusDB.runBulkUpsert(table='deposition', key_columns=['dep_set_id'], rows=depositionRows)
+        #
         if file_list:
             dbLoader = DBLoadUtil(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
             dbLoader.doLoading(file_list)
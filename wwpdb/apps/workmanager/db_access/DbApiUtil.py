@@ -2,6 +2,22 @@
 # File:  DbApiUtil.py
 # Date:  04-May-2015
 # Updates:
+#  18-Oct-2026  zf   borrow connections from the process-wide DbConnectionPool instead of holding one per instance
+#  18-Oct-2026  zf   bind schema map parameters through cached PreparedStatement objects, runUpdate uses bound values
+#  18-Oct-2026  zf   add selectDataInChunks() for large IN lists
+#  18-Oct-2026  zf   add transaction() and runBulkUpsert()
+#  18-Oct-2026  zf   add iterSelectSQL()/iterSelectData() streaming through an unbuffered server-side cursor
+#  18-Oct-2026  zf   record wall time and row count of every statement in the process-wide QueryStats
+#  18-Oct-2026  zf   replace the fixed sleep/reconnect loops with RetryPolicy backoff and a shared CircuitBreaker
+#  18-Oct-2026  zf   pooled connections run in autocommit/READ COMMITTED mode: no commit before each SELECT,
+#                    single statements are committed by the server, transaction() uses "start transaction"
+#  18-Oct-2026  zf   add selectDataUnionAll()
+#  18-Oct-2026  zf   selectDataInChunks() runs on the shared executor of ConcurrentQueryExecutor and always re-sorts by the order by column
+#  18-Oct-2026  zf   retries wait at most retryAcquireTimeout for a pooled connection, an exhausted pool is not retried
+#  18-Oct-2026  zf   SQL errors count as an answer of the server for the circuit breaker, statements ending without
+#                    reaching it release their half-open probe
+#  18-Oct-2026  zf   runSelectSQL( strict=True ) returns None on any error instead of an empty result
+#  18-Oct-2026  zf   iterSelectSQL() checks out a stream connection of the pool and raises its errors
 ##
 """
 Providing general APIs for database access
@@ -21,21 +37,30 @@ __email__ = "zfeng@rcsb.rutgers.edu"
 __license__ = "Creative Commons Attribution 3.0 Unported"
 __version__ = "V0.07"
 
+import contextlib
+import functools
 import os
+import re
 import sys
 import time
-import datetime
 import MySQLdb
 #
-from wwpdb.utils.wf.dbapi.DbConnection import DbConnection
+from wwpdb.apps.workmanager.db_access.ConcurrentQueryExecutor import runConcurrently
+from wwpdb.apps.workmanager.db_access.DbConnectionPool import getConnectionPool
+from wwpdb.apps.workmanager.db_access.PreparedStatement import getPreparedStatement
+from wwpdb.apps.workmanager.db_access.QueryStats import QueryTimer, getCurrentOp, getFingerprint, getQueryStats, setCurrentOp
+from wwpdb.apps.workmanager.db_access.RetryPolicy import getCircuitBreaker, getDefaultRetryPolicy
+
+
+_orderByPattern = re.compile(r"\sorder\s+by\s+(\w+)(\s+asc)?\s*$", re.IGNORECASE)
 
 
 class DbApiUtil(object):
-    def __init__(self, dbServer=None, dbHost=None, dbName=None, dbUser=None, dbPw=None, dbSocket=None, dbPort=None, verbose=False, log=sys.stderr):  # pylint: disable=unused-argument
+    def __init__(self, dbServer=None, dbHost=None, dbName=None, dbUser=None, dbPw=None, dbSocket=None, dbPort=None, verbose=False, log=sys.stderr,  # pylint: disable=unused-argument
+                 inListChunkSize=500, inListWorkers=4, fetchSize=1000, retryPolicy=None, retryAcquireTimeout=1.0):
         """
         """
         self.__debug = False
-        self.__Nretry = 5
         self.__dbServer = dbServer
         self.__dbHost = dbHost
         self.__dbName = dbName
@@ -46,149 +71,419 @@ class DbApiUtil(object):
         # self.__verbose = verbose
         self.__lfh = log
         self.__schemaMap = {}
-        self.__dbState = 0
+        self.__inListChunkSize = inListChunkSize
+        self.__inListWorkers = inListWorkers
+        self.__fetchSize = fetchSize
+        self.__retryAcquireTimeout = retryAcquireTimeout
 
         if (self.__debug):
             self.__lfh.write("\n+DbApiUtil.__init__() using socket %r\n" % self.__dbSocket)
             self.__lfh.write("+DbApiUtil.__init__() using socket environment reference %r\n" % os.getenv("SITE_DB_SOCKET", None))
 
-        self.__myDb = DbConnection(dbServer=self.__dbServer, dbHost=self.__dbHost, dbName=self.__dbName, dbUser=self.__dbUser,
-                                   dbPw=self.__dbPw, dbPort=self.__dbPort, dbSocket=self.__dbSocket)
+        # Connections are checked out of the shared pool for each statement, nothing is opened here
+        self.__pool = getConnectionPool(dbServer=self.__dbServer, dbHost=self.__dbHost, dbName=self.__dbName, dbUser=self.__dbUser,
+                                        dbPw=self.__dbPw, dbPort=self.__dbPort, dbSocket=self.__dbSocket, log=self.__lfh)
+        self.__queryStats = getQueryStats()
+        self.__retryPolicy = retryPolicy if retryPolicy else getDefaultRetryPolicy()
+        # shared by all instances using the same database
+        self.__breaker = getCircuitBreaker(self.__pool.getName())
 
-        self.__dbcon = self.__myDb.connect()
+    def __acquire(self, deadline=None, stream=False):
+        """ Borrow a connection from the pool, waiting at most until deadline. Returns None without waiting
+            while the circuit breaker is open. stream: the connection is held for a streamed result.
+        """
+        if not self.__breaker.allowRequest():
+            self.__lfh.write("+DbApiUtil.acquire() database %s unavailable, failing fast\n" % self.__pool.getName())
+            return None
+        #
+        timeout = None
+        if deadline is not None:
+            timeout = max(0.0, deadline - time.time())
+        #
+        con = self.__pool.acquire(timeout=timeout, stream=stream)
+        if con is None:
+            if self.__pool.getLastError() == "connect":
+                self.__breaker.recordFailure()
+            else:
+                # an exhausted pool says nothing about the server
+                self.__breaker.releaseProbe()
+            #
+        #
+        return con
 
-    def __reConnect(self):
+    def __isAcquireRetryable(self):
+        """ A failed __acquire() is worth retrying if a connection could not be opened. An exhausted pool ( the wait
+            already used up the time given ) or an open circuit breaker fail fast.
         """
+        return (self.__breaker.getState() == self.__breaker.CLOSED) and (self.__pool.getLastError() == "connect")
+
+    def __recordError(self, e):
+        """ Log a database error and report it to the circuit breaker, returns True if it was a connection failure.
+            Other errors ( syntax, duplicate key, ... ) were answered by the server.
         """
-        try:
-            self.__myDb.close(self.__dbcon)
-        except MySQLdb.Error:
-            self.__lfh.write("+DbApiUtil.reConnect() DB connection lost - cannot close\n")
-            self.__lfh.write("+DbApiUtil.reConnect() Re-connecting to the database ..\n")
-            self.__lfh.write("+DbApiUtil.reConnect() UTC time = %s\n" % datetime.datetime.utcnow())
+        self.__lfh.write("Database error %d: %s\n" % (e.args[0], e.args[1]))
+        if self.__isConnectionError(e):
+            self.__breaker.recordFailure()
+            return True
+        #
+        self.__breaker.recordSuccess()
+        return False
 
-        for i in range(1, self.__Nretry):
-            try:
-                self.__dbcon = self.__myDb.connect()
-                self.__dbState = 0
-                return True
-            except MySQLdb.Error:
-                self.__lfh.write("+DbApiUtil.reConnect() Cannot get re-connection : trying again\n")
-                time.sleep(2 * i)
+    def __runWithRetry(self, method, sql, args, key):
+        """ Run method( sql, args, key ) -> ( result, retryable ) until it succeeds, fails with an error that is
+            not worth retrying, runs out of attempts or would pass the deadline. Stale idle connections are
+            dropped before each retry, which waits at most retryAcquireTimeout seconds for a pooled connection.
+        """
+        startTime = time.time()
+        deadline = self.__retryPolicy.getDeadline(startTime)
+        attempt = 1
+        acquireDeadline = deadline
+        while True:
+            ret, retryable = method(sql, args, key, acquireDeadline)
+            if (not retryable) or (attempt >= self.__retryPolicy.getMaxAttempts()):
+                return ret
+            #
+            delay = self.__retryPolicy.getDelay(attempt)
+            if (time.time() + delay) >= deadline:
+                self.__lfh.write("+DbApiUtil.runWithRetry() giving up after %d attempt(s) in %.1fs\n" % (attempt, time.time() - startTime))
+                return ret
+            #
+            self.__pool.clear()
+            time.sleep(delay)
+            attempt += 1
+            acquireDeadline = min(deadline, time.time() + self.__retryAcquireTimeout)
+        #
 
-        return False
+    def __startTimer(self, sql, key=None):
+        """ Statements are reported under their schema map key, ad hoc SQL under its fingerprint
+        """
+        return QueryTimer(self.__queryStats, key if key else getFingerprint(sql), log=self.__lfh)
 
-    def __runSelectSQL(self, query):
+    def __isConnectionError(self, e):
+        """ Errors after which the connection can not be reused
         """
+        return isinstance(e, (MySQLdb.OperationalError, MySQLdb.InterfaceError))
+
+    def __runSelectSQL(self, query, args=None, key=None, deadline=None, strict=False):
+        """ Returns ( rows, retryable ): rows is None on connection failure and empty on other errors ( None if strict )
         """
+        dbcon = self.__acquire(deadline)
+        if dbcon is None:
+            return None, self.__isAcquireRetryable()
+        #
         rows = ()
+        broken = False
+        reported = False
+        timer = self.__startTimer(query, key)
         try:
-            self.__dbcon.commit()
-            curs = self.__dbcon.cursor(MySQLdb.cursors.DictCursor)
-            curs.execute(query)
+            # autocommit connections see the latest committed data without an extra commit
+            curs = dbcon.cursor(MySQLdb.cursors.DictCursor)
+            curs.execute(query, args)
             rows = curs.fetchall()
+            curs.close()
+            timer.stop(rows=len(rows))
+            self.__breaker.recordSuccess()
+            reported = True
         except MySQLdb.Error as e:
-            self.__dbState = e.args[0]
-            self.__lfh.write("Database error %d: %s\n" % (e.args[0], e.args[1]))
-
-        return rows
+            timer.stop(error=True)
+            broken = self.__recordError(e)
+            reported = True
+            if strict:
+                rows = None
+            #
+        finally:
+            if not reported:
+                self.__breaker.releaseProbe()
+            #
+            self.__pool.release(dbcon, broken=broken)
+        #
+        if broken:
+            return None, True
+        #
+        return rows, False
 
-    def __runUpdateSQL(self, query):
-        """
+    def __runUpdateSQL(self, query, args=None, key=None, deadline=None):
+        """ Returns ( 'OK' or None, retryable )
         """
+        dbcon = self.__acquire(deadline)
+        if dbcon is None:
+            return None, self.__isAcquireRetryable()
+        #
+        broken = False
+        reported = False
+        timer = self.__startTimer(query, key)
         try:
-            curs = self.__dbcon.cursor()
-            curs.execute("set autocommit=0")
-            _nrows = curs.execute(query)  # noqa: F841
-            self.__dbcon.commit()
-            curs.execute("set autocommit=1")
+            # a single statement in autocommit mode is atomic and committed by the server,
+            # statements that have to go together use transaction()
+            curs = dbcon.cursor()
+            nrows = curs.execute(query, args)
             curs.close()
-            return 'OK'
+            timer.stop(rows=nrows if (nrows and nrows > 0) else 0)
+            self.__breaker.recordSuccess()
+            reported = True
+            return 'OK', False
         except MySQLdb.Error as e:
-            self.__dbcon.rollback()
-            self.__dbState = e.args[0]
-            self.__lfh.write("Database error %d: %s\n" % (e.args[0], e.args[1]))
+            timer.stop(error=True)
+            broken = self.__recordError(e)
+            reported = True
+            retryable = broken
+        finally:
+            if not reported:
+                self.__breaker.releaseProbe()
+            #
+            self.__pool.release(dbcon, broken=broken)
         #
-        return None
+        # only statements that failed on the connection are retried, SQL errors would fail again
+        return None, retryable
+
+    def getPoolStats(self):
+        """ Return the counters of the connection pool used by this instance
+        """
+        return self.__pool.getStats()
+
+    def getCircuitBreakerStats(self):
+        """ Return the state of the circuit breaker of this database
+        """
+        return self.__breaker.getStats()
+
+    def getQueryStats(self):
+        """ Return the process-wide per statement statistics, see QueryStats.getStats()
+        """
+        return self.__queryStats.getStats()
 
     def setSchemaMap(self, schemaMap):
         """
         """
         self.__schemaMap = schemaMap
 
-    def runSelectSQL(self, sql):
-        """ method to run a query
-        """
-        for retry in range(1, self.__Nretry):
-            ret = self.__runSelectSQL(sql)
-            if ret is None:
-                if self.__dbState > 0:
-                    time.sleep(retry * 2)
-                    if not self.__reConnect():
-                        return None
-                else:
-                    return None
+    def runSelectSQL(self, sql, args=None, key=None, strict=False):
+        """ method to run a query, args are bound to the '%s' placeholders of sql by the driver.
+            key names the statement in the query statistics (default: the SQL fingerprint).
+            Returns None if no connection could be made. SQL errors ( lock wait timeout, killed query, ... ) return
+            an empty result, or None if strict, so that a failed query is not taken for one without matching rows.
+        """
+        return self.__runWithRetry(functools.partial(self.__runSelectSQL, strict=strict), sql, args, key)
+
+    def iterSelectSQL(self, sql, args=None, fetchSize=None, key=None):
+        """ Generator yielding the rows of a query one by one. Rows are read from an unbuffered server-side cursor
+            fetchSize rows at a time, so the result set is never held in memory as a whole. The pooled connection
+            stays checked out until the generator is exhausted or closed, it is one of the pool's stream connections.
+            Errors are logged and raised ( MySQLdb.Error ), so that a truncated result is not taken for a complete one.
+        """
+        if not fetchSize:
+            fetchSize = self.__fetchSize
+        #
+        dbcon = self.__acquire(self.__retryPolicy.getDeadline(time.time()), stream=True)
+        if dbcon is None:
+            raise MySQLdb.OperationalError(2003, "No database connection available")
+        #
+        curs = None
+        exhausted = False
+        broken = False
+        error = False
+        reported = False
+        numRows = 0
+        # the time includes the consumer's processing between batches
+        timer = self.__startTimer(sql, key)
+        try:
+            curs = dbcon.cursor(MySQLdb.cursors.SSDictCursor)
+            curs.execute(sql, args)
+            # the server answered, whether or not the consumer reads all rows
+            self.__breaker.recordSuccess()
+            reported = True
+            while True:
+                rows = curs.fetchmany(fetchSize)
+                if not rows:
+                    break
+                #
+                numRows += len(rows)
+                for row in rows:
+                    yield row
+                #
+            #
+            exhausted = True
+        except MySQLdb.Error as e:
+            error = True
+            self.__recordError(e)
+            reported = True
+            raise
+        finally:
+            if not reported:
+                self.__breaker.releaseProbe()
+            #
+            timer.stop(rows=numRows, error=error)
+            # a connection with unread rows of an unbuffered result can not be reused
+            broken = not exhausted
+            if curs is not None:
+                try:
+                    curs.close()
+                except MySQLdb.Error:
+                    broken = True
                 #
-            else:
-                return ret
             #
+            self.__pool.release(dbcon, broken=broken)
         #
-        return None
 
-    def runUpdateSQL(self, sql):
-        """ method to run a query
+    def runUpdateSQL(self, sql, args=None, key=None):
+        """ method to run a query, args are bound to the '%s' placeholders of sql by the driver.
+            key names the statement in the query statistics (default: the SQL fingerprint)
         """
-        for retry in range(1, self.__Nretry):
-            ret = self.__runUpdateSQL(sql)
-            if ret is None:
-                if self.__dbState > 0:
-                    time.sleep(retry * 2)
-                    if not self.__reConnect():
-                        return None
-                else:
-                    return None
+        return self.__runWithRetry(self.__runUpdateSQL, sql, args, key)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """ Context manager yielding a cursor on one pooled connection inside an explicit transaction. The transaction
+            is committed when the block exits normally and rolled back (exception re-raised) otherwise. The connection
+            returns to autocommit mode afterwards.
+        """
+        dbcon = self.__acquire(self.__retryPolicy.getDeadline(time.time()))
+        if dbcon is None:
+            raise MySQLdb.OperationalError(2003, "No database connection available")
+        #
+        broken = False
+        reported = False
+        curs = None
+        try:
+            curs = dbcon.cursor()
+            curs.execute("start transaction")
+            self.__breaker.recordSuccess()
+            reported = True
+            yield curs
+            dbcon.commit()
+        except BaseException as e:
+            broken = self.__isConnectionError(e)
+            if broken:
+                self.__breaker.recordFailure()
+                reported = True
+            elif isinstance(e, MySQLdb.Error) and (not reported):
+                # the server answered the start of the transaction with an error
+                self.__breaker.recordSuccess()
+                reported = True
+            #
+            try:
+                dbcon.rollback()
+            except MySQLdb.Error:
+                broken = True
+            #
+            raise
+        finally:
+            if not reported:
+                self.__breaker.releaseProbe()
+            #
+            try:
+                if curs is not None:
+                    curs.close()
+                #
+            except MySQLdb.Error:
+                broken = True
+            #
+            self.__pool.release(dbcon, broken=broken)
+        #
+
+    def runBulkUpsert(self, table=None, key_columns=None, rows=None, batchSize=200):
+        """ Insert rows (list of column -> value dictionaries) into table, updating the existing rows whose
+            key_columns match. The key columns must form a primary or unique key of the table. Rows are grouped by
+            their column set and written with multi-row "insert ... on duplicate key update" statements of at most
+            batchSize rows, all in one transaction. Returns 'OK', or None if nothing was written.
+        """
+        if not table or not key_columns or not rows:
+            return None
+        #
+        # group rows sharing the same columns, keeping the input order
+        groupList = []
+        groupMap = {}
+        for row in rows:
+            columns = tuple(row.keys())
+            if columns not in groupMap:
+                groupMap[columns] = []
+                groupList.append(columns)
+            #
+            groupMap[columns].append(row)
+        #
+        numRows = 0
+        timer = QueryTimer(self.__queryStats, "bulk_upsert:" + str(table), log=self.__lfh)
+        try:
+            with self.transaction() as curs:
+                for columns in groupList:
+                    updateColumns = [c for c in columns if c not in key_columns]
+                    if updateColumns:
+                        sqlSuffix = " on duplicate key update " + ', '.join(["%s = values(%s)" % (c, c) for c in updateColumns])
+                        sqlPrefix = "insert into " + str(table)
+                    else:
+                        sqlSuffix = ""
+                        sqlPrefix = "insert ignore into " + str(table)
+                    #
+                    sqlPrefix += " (" + ','.join(columns) + ") values "
+                    rowPlaceholder = "(" + ','.join(['%s'] * len(columns)) + ")"
+                    groupRows = groupMap[columns]
+                    for i in range(0, len(groupRows), batchSize):
+                        batch = groupRows[i:i + batchSize]
+                        args = []
+                        for row in batch:
+                            args.extend([row[c] for c in columns])
+                        #
+                        curs.execute(sqlPrefix + ','.join([rowPlaceholder] * len(batch)) + sqlSuffix, tuple(args))
+                        numRows += len(batch)
+                    #
                 #
-            else:
-                return ret
             #
+        except MySQLdb.Error as e:
+            timer.stop(rows=numRows, error=True)
+            self.__lfh.write("Database error %d: %s\n" % (e.args[0], e.args[1]))
+            return None
         #
-        return None
+        timer.stop(rows=numRows)
+        return 'OK'
 
     def runUpdate(self, table=None, where=None, data=None):
+        """ Update the row(s) matching where with data, or insert a new row if none exists
+        """
         if not table:
             return None
         #
         if (not where) and (not data):
             return None
         #
+        whereItems = list(where.items()) if where else []
+        dataItems = list(data.items()) if data else []
         rowExists = False
-        if where:
-            sql = "select * from " + str(table) + " where " + ' and '.join(["%s = '%s'" % (k, v.replace("'", "\\'")) for k, v in where.items()])
-            rows = self.runSelectSQL(sql)
+        if whereItems:
+            sql = "select * from " + str(table) + " where " + ' and '.join(["%s = %%s" % k for k, _v in whereItems])
+            rows = self.runSelectSQL(sql, tuple([v for _k, v in whereItems]))
             if rows and len(rows) > 0:
                 rowExists = True
             #
         #
-        if rowExists and (not data):
+        if rowExists and (not dataItems):
             return 'OK'
         #
         if rowExists:
-            sql = "update " + str(table) + " set " + ','.join(["%s = '%s'" % (k, v.replace("'", "\\'")) for k, v in data.items()])
-            if where:
-                sql += ' where ' + ' and '.join(["%s = '%s'" % (k, v.replace("'", "\\'")) for k, v in where.items()])
+            sql = "update " + str(table) + " set " + ','.join(["%s = %%s" % k for k, _v in dataItems])
+            args = [v for _k, v in dataItems]
+            if whereItems:
+                sql += ' where ' + ' and '.join(["%s = %%s" % k for k, _v in whereItems])
+                args.extend([v for _k, v in whereItems])
             #
         else:
-            sql = "insert into " + str(table) + " (" + ','.join(['%s' % (k) for k, v in where.items()])
-            if data:
-                sql += "," + ','.join(['%s' % (k) for k, v in data.items()])
-            #
-            sql += ") values (" + ','.join(["'%s'" % (v.replace("'", "\\'")) for k, v in where.items()])
-            if data:
-                sql += "," + ','.join(["'%s'" % (v.replace("'", "\\'")) for k, v in data.items()])
-            #
-            sql += ")"
+            itemList = whereItems + dataItems
+            sql = "insert into " + str(table) + " (" + ','.join([k for k, _v in itemList]) + ") values (" + ','.join(['%s'] * len(itemList)) + ")"
+            args = [v for _k, v in itemList]
+        #
+        return self.runUpdateSQL(sql, tuple(args))
+
+    def __bindParameter(self, key, parameter):
+        """ Return ( sql, args ) for schema map key. Templates whose slots do not match the parameters
+            fall back to the plain '%' substitution.
+        """
+        sql = self.__schemaMap[key]
+        if not parameter:
+            return sql, None
+        #
+        try:
+            return getPreparedStatement(sql).bind(parameter)
+        except ValueError:
+            return sql % parameter, None
         #
-        return self.runUpdateSQL(sql)
 
     def runUpdateSQLwithKey(self, key=None, parameter=()):
         """
@@ -196,11 +491,8 @@ class DbApiUtil(object):
         if not key or not self.__schemaMap or (key not in self.__schemaMap):
             return None
         #
-        sql = self.__schemaMap[key]
-        if parameter:
-            sql = self.__schemaMap[key] % parameter
-        #
-        return self.runUpdateSQL(sql)
+        sql, args = self.__bindParameter(key, parameter)
+        return self.runUpdateSQL(sql, args, key=key)
 
     def selectData(self, key=None, parameter=()):
         """
@@ -208,8 +500,97 @@ class DbApiUtil(object):
         if not key or not self.__schemaMap or (key not in self.__schemaMap):
             return None
         #
-        sql = self.__schemaMap[key]
-        if parameter:
-            sql = self.__schemaMap[key] % parameter
+        sql, args = self.__bindParameter(key, parameter)
+        return self.runSelectSQL(sql, args, key=key)
+
+    def setInListOptions(self, chunkSize=None, workers=None):
+        """ Set the default chunk size and number of concurrent chunk queries used by selectDataInChunks()
+        """
+        if chunkSize:
+            self.__inListChunkSize = chunkSize
+        #
+        if workers:
+            self.__inListWorkers = workers
+        #
+
+    def selectDataInChunks(self, key=None, idList=None, parameter=(), listIndex=0, chunkSize=None, workers=None):
+        """ Run schema map key with idList bound to its IN list slot. idList is de-duplicated, sorted and split
+            into chunks of chunkSize IDs which are queried concurrently. parameter holds the values of the other
+            slots, idList is inserted at position listIndex. Rows are merged in chunk order and, if the template
+            ends with "order by <column>", re-sorted by that column, so the result does not depend on timing.
+            Returns None if any chunk fails.
+        """
+        if not key or not self.__schemaMap or (key not in self.__schemaMap):
+            return None
+        #
+        if not idList:
+            return None
+        #
+        if not chunkSize:
+            chunkSize = self.__inListChunkSize
+        #
+        if not workers:
+            workers = self.__inListWorkers
+        #
+        if not isinstance(parameter, tuple):
+            parameter = (parameter,)
+        #
+        sortedIdList = sorted(set(idList))
+        chunkList = [sortedIdList[i:i + chunkSize] for i in range(0, len(sortedIdList), chunkSize)]
+        parameterList = [parameter[:listIndex] + (chunk,) + parameter[listIndex:] for chunk in chunkList]
+        opName = getCurrentOp()
+
+        def selectChunk(chunkParameter):
+            # report the chunk queries under the operation of the calling thread
+            previousOp = getCurrentOp()
+            setCurrentOp(opName)
+            try:
+                return self.selectData(key=key, parameter=chunkParameter)
+            finally:
+                setCurrentOp(previousOp)
+            #
+
+        rows = []
+        for chunkRows in runConcurrently(selectChunk, parameterList, workers):
+            if chunkRows is None:
+                return None
+            #
+            rows.extend(chunkRows)
+        #
+        m = _orderByPattern.search(self.__schemaMap[key])
+        if m:
+            # NULL first, as in an ascending MySQL sort
+            column = m.group(1)
+            rows.sort(key=lambda row: (row.get(column) is not None, row.get(column)))
+        #
+        return tuple(rows)
+
+    def selectDataUnionAll(self, key=None, parameterList=None):
+        """ Run schema map key once for each parameter of parameterList as a single statement, the selections
+            combined with "union all". The template must not end with "order by" or "limit".
+        """
+        if not key or not self.__schemaMap or (key not in self.__schemaMap):
+            return None
+        #
+        if not parameterList:
+            return None
+        #
+        sqlList = []
+        args = []
+        for parameter in parameterList:
+            sql, sqlArgs = self.__bindParameter(key, parameter)
+            sqlList.append(sql)
+            if sqlArgs:
+                args.extend(sqlArgs)
+            #
+        #
+        return self.runSelectSQL(' union all '.join(sqlList), tuple(args) if args else None, key=key)
+
+    def iterSelectData(self, key=None, parameter=(), fetchSize=None):
+        """ Streaming version of selectData(), see iterSelectSQL()
+        """
+        if not key or not self.__schemaMap or (key not in self.__schemaMap):
+            return iter(())
         #
-        return self.runSelectSQL(sql)
+        sql, args = self.__bindParameter(key, parameter)
+        return self.iterSelectSQL(sql, args, fetchSize=fetchSize, key=key)
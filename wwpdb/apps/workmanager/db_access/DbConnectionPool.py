@@ -0,0 +1,313 @@
+##
+# File:  DbConnectionPool.py
+# Date:  18-Oct-2026
+# Updates:
+#  18-Oct-2026  zf   add getLastError() telling a pool timeout from a connection failure
+#  18-Oct-2026  zf   open connections in autocommit mode with READ COMMITTED isolation
+#  18-Oct-2026  zf   back to at most 8 connections, table refreshes bound their own connection use
+#  18-Oct-2026  zf   streams ( acquire( stream=True ) ) hold at most maxStreams connections, the others are left to short statements
+##
+"""
+Process-wide, bounded pool of database connections shared by all DbApiUtil instances
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2026 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import os
+import sys
+import threading
+import time
+import MySQLdb
+#
+from wwpdb.utils.wf.dbapi.DbConnection import DbConnection
+
+_poolMap = {}
+_poolLock = threading.Lock()
+
+
+class DbConnectionPool(object):
+    """ Bounded pool of connections to a single database. Connections are opened lazily on the first
+        checkout, handed back with release() and validated with ping() when they have been idle longer
+        than checkInterval seconds. New connections are switched to autocommit mode with the session
+        isolation level isolationLevel (None keeps the server default), so each read sees the latest
+        committed data. Connections must be released in autocommit mode. Connections checked out for a streamed
+        result, which keep them until the consumer is done, are limited to maxStreams, so that the lookups run
+        while the rows are consumed always find a connection.
+    """
+    def __init__(self, dbServer=None, dbHost=None, dbName=None, dbUser=None, dbPw=None, dbSocket=None, dbPort=None,
+                 maxSize=8, maxIdle=4, maxStreams=4, checkInterval=60, acquireTimeout=30, isolationLevel="READ COMMITTED", log=sys.stderr):
+        """
+        """
+        self.__dbServer = dbServer
+        self.__dbHost = dbHost
+        self.__dbName = dbName
+        self.__dbUser = dbUser
+        self.__dbPw = dbPw
+        self.__dbSocket = dbSocket
+        self.__dbPort = dbPort
+        self.__maxSize = maxSize
+        self.__maxIdle = maxIdle
+        self.__maxStreams = min(maxStreams, maxSize)
+        self.__checkInterval = checkInterval
+        self.__acquireTimeout = acquireTimeout
+        self.__isolationLevel = isolationLevel
+        self.__lfh = log
+        #
+        self.__cond = threading.Condition()
+        # reason of the last failed acquire() of each thread
+        self.__local = threading.local()
+        self.__pid = os.getpid()
+        # list of [ connection, DbConnection object, last released time ]
+        self.__idle = []
+        # id(connection) -> DbConnection object for checked-out connections
+        self.__inUse = {}
+        # ids of the checked-out connections ( or of their reserved slots ) holding a stream
+        self.__streams = set()
+        self.__stats = {"created": 0, "closed": 0, "acquired": 0, "released": 0, "discarded": 0, "ping_failed": 0,
+                        "timeouts": 0, "connect_errors": 0, "wait_time": 0.0, "max_in_use": 0, "max_streams": 0}
+
+    def getName(self):
+        """
+        """
+        return "%s@%s" % (self.__dbName, self.__dbHost if self.__dbHost else self.__dbSocket)
+
+    def acquire(self, timeout=None, stream=False):
+        """ Check out a connection. Returns None if no connection could be made or if the pool stayed
+            exhausted for longer than timeout seconds. stream: the connection is held for a streamed result,
+            wait while maxStreams connections already are.
+        """
+        if timeout is None:
+            timeout = self.__acquireTimeout
+        #
+        startTime = time.time()
+        entry = None
+        self.__local.error = None
+        with self.__cond:
+            self.__checkFork()
+            while ((not self.__idle) and (len(self.__inUse) >= self.__maxSize)) or (stream and (len(self.__streams) >= self.__maxStreams)):
+                remaining = timeout - (time.time() - startTime)
+                if remaining <= 0:
+                    self.__stats["timeouts"] += 1
+                    self.__local.error = "timeout"
+                    self.__lfh.write("+DbConnectionPool.acquire() pool %s exhausted (%d connections in use, %d streams)\n"
+                                     % (self.getName(), len(self.__inUse), len(self.__streams)))
+                    return None
+                #
+                self.__cond.wait(remaining)
+            #
+            if self.__idle:
+                entry = self.__idle.pop()
+            #
+            # Reserve the slot before leaving the lock, the connection is validated/opened outside of it
+            token = object()
+            self.__inUse[id(token)] = None
+            if stream:
+                self.__streams.add(id(token))
+            #
+            self.__stats["wait_time"] += time.time() - startTime
+        #
+        con = None
+        myDb = None
+        if entry is not None:
+            con, myDb, lastUsed = entry
+            if (time.time() - lastUsed) > self.__checkInterval and (not self.__ping(con)):
+                self.__closeConnection(con, myDb)
+                with self.__cond:
+                    self.__stats["ping_failed"] += 1
+                #
+                con = None
+            #
+        #
+        if con is None:
+            con, myDb = self.__openConnection()
+        #
+        with self.__cond:
+            self.__inUse.pop(id(token), None)
+            self.__streams.discard(id(token))
+            if con is None:
+                self.__local.error = "connect"
+                self.__cond.notify_all()
+                return None
+            #
+            self.__inUse[id(con)] = myDb
+            if stream:
+                self.__streams.add(id(con))
+                self.__stats["max_streams"] = max(self.__stats["max_streams"], len(self.__streams))
+            #
+            self.__stats["acquired"] += 1
+            self.__stats["max_in_use"] = max(self.__stats["max_in_use"], len(self.__inUse))
+        #
+        return con
+
+    def getLastError(self):
+        """ Return why the last acquire() of the calling thread failed: 'timeout' (pool exhausted), 'connect'
+            (no connection could be opened) or None
+        """
+        return getattr(self.__local, 'error', None)
+
+    def release(self, con, broken=False):
+        """ Return a checked-out connection. Broken connections, and connections beyond maxIdle, are closed.
+        """
+        if con is None:
+            return
+        #
+        with self.__cond:
+            if id(con) not in self.__inUse:
+                # checked out before a fork or already released
+                return
+            #
+            myDb = self.__inUse.pop(id(con))
+            self.__streams.discard(id(con))
+            self.__stats["released"] += 1
+            keep = (not broken) and (len(self.__idle) < self.__maxIdle)
+            if keep:
+                self.__idle.append([con, myDb, time.time()])
+            elif broken:
+                self.__stats["discarded"] += 1
+            #
+            # waiting streams and waiting statements check different conditions
+            self.__cond.notify_all()
+        #
+        if not keep:
+            self.__closeConnection(con, myDb)
+        #
+
+    def clear(self):
+        """ Close all idle connections
+        """
+        with self.__cond:
+            idle = self.__idle
+            self.__idle = []
+        #
+        for con, myDb, _lastUsed in idle:
+            self.__closeConnection(con, myDb)
+        #
+
+    def getStats(self):
+        """ Return a snapshot of the pool counters
+        """
+        with self.__cond:
+            stats = dict(self.__stats)
+            stats["name"] = self.getName()
+            stats["max_size"] = self.__maxSize
+            stats["idle"] = len(self.__idle)
+            stats["in_use"] = len(self.__inUse)
+            stats["streams"] = len(self.__streams)
+        #
+        return stats
+
+    def __checkFork(self):
+        """ Connections inherited from a parent process can not be shared, forget them (caller holds the lock)
+        """
+        if self.__pid == os.getpid():
+            return
+        #
+        self.__pid = os.getpid()
+        self.__idle = []
+        self.__inUse = {}
+        self.__streams = set()
+
+    def __ping(self, con):
+        """
+        """
+        try:
+            con.ping()
+            return True
+        except MySQLdb.Error:
+            return False
+        #
+
+    def __openConnection(self):
+        """
+        """
+        myDb = DbConnection(dbServer=self.__dbServer, dbHost=self.__dbHost, dbName=self.__dbName, dbUser=self.__dbUser,
+                            dbPw=self.__dbPw, dbPort=self.__dbPort, dbSocket=self.__dbSocket)
+        con = None
+        try:
+            con = myDb.connect()
+            con.autocommit(True)
+            if self.__isolationLevel:
+                curs = con.cursor()
+                curs.execute("set session transaction isolation level " + self.__isolationLevel)
+                curs.close()
+            #
+        except MySQLdb.Error as e:
+            self.__lfh.write("+DbConnectionPool.acquire() cannot connect to %s: %s\n" % (self.getName(), str(e)))
+            if con is not None:
+                self.__closeConnection(con, myDb)
+                con = None
+            #
+        #
+        with self.__cond:
+            if con is None:
+                self.__stats["connect_errors"] += 1
+            else:
+                self.__stats["created"] += 1
+            #
+        #
+        return con, myDb
+
+    def __closeConnection(self, con, myDb):
+        """
+        """
+        try:
+            if myDb is not None:
+                myDb.close(con)
+            else:
+                con.close()
+            #
+        except MySQLdb.Error:
+            pass
+        #
+        with self.__cond:
+            self.__stats["closed"] += 1
+        #
+
+
+def getConnectionPool(dbServer=None, dbHost=None, dbName=None, dbUser=None, dbPw=None, dbSocket=None, dbPort=None, log=sys.stderr, **kwargs):
+    """ Return the process-wide pool for the given database, creating it on first use
+    """
+    key = (dbServer, dbHost, dbPort, dbSocket, dbName, dbUser)
+    with _poolLock:
+        if key not in _poolMap:
+            _poolMap[key] = DbConnectionPool(dbServer=dbServer, dbHost=dbHost, dbName=dbName, dbUser=dbUser, dbPw=dbPw, dbSocket=dbSocket,
+                                             dbPort=dbPort, log=log, **kwargs)
+        #
+        return _poolMap[key]
+    #
+
+
+def getPoolStats():
+    """ Return { pool name : stats } for all pools of this process
+    """
+    with _poolLock:
+        pools = list(_poolMap.values())
+    #
+    statsMap = {}
+    for pool in pools:
+        statsMap[pool.getName()] = pool.getStats()
+    #
+    return statsMap
+
+
+def closeAllPools():
+    """ Close the idle connections of all pools
+    """
+    with _poolLock:
+        pools = list(_poolMap.values())
+    #
+    for pool in pools:
+        pool.clear()
+    #
@@ -0,0 +1,99 @@
+##
+# File:  LRUCache.py
+# Date:  18-Oct-2026
+# Updates:
+##
+"""
+Thread-safe, size-bounded least-recently-used cache with hit/miss counters
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2026 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import threading
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """ Mapping that keeps at most maxSize items, evicting the least recently used one first
+    """
+    def __init__(self, maxSize=128):
+        """
+        """
+        self.__maxSize = maxSize
+        self.__lock = threading.Lock()
+        self.__data = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def get(self, key, default=None):
+        """ Return the cached value (marking it as recently used) or default
+        """
+        with self.__lock:
+            if key in self.__data:
+                self.__data.move_to_end(key)
+                self.__hits += 1
+                return self.__data[key]
+            #
+            self.__misses += 1
+        #
+        return default
+
+    def put(self, key, value):
+        """
+        """
+        with self.__lock:
+            if key in self.__data:
+                self.__data.move_to_end(key)
+            #
+            self.__data[key] = value
+            while len(self.__data) > self.__maxSize:
+                self.__data.popitem(last=False)
+                self.__evictions += 1
+            #
+        #
+
+    def pop(self, key, default=None):
+        """ Remove key from the cache
+        """
+        with self.__lock:
+            return self.__data.pop(key, default)
+        #
+
+    def clear(self):
+        """
+        """
+        with self.__lock:
+            self.__data.clear()
+        #
+
+    def getStats(self):
+        """ Return the cache counters
+        """
+        with self.__lock:
+            total = self.__hits + self.__misses
+            return {"size": len(self.__data), "max_size": self.__maxSize, "hits": self.__hits, "misses": self.__misses,
+                    "evictions": self.__evictions, "hit_rate": (float(self.__hits) / total) if total else 0.0}
+        #
+
+    def __contains__(self, key):
+        with self.__lock:
+            return key in self.__data
+        #
+
+    def __len__(self):
+        with self.__lock:
+            return len(self.__data)
+        #
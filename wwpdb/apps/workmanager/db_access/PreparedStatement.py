@@ -0,0 +1,177 @@
+##
+# File:  PreparedStatement.py
+# Date:  18-Oct-2026
+# Updates:
+##
+"""
+Parameterized form of the '%s' schema map templates used by StatusDbApi and ContentDbApi.
+
+A template is parsed once into literal text and slots:
+
+    '%s'         quoted value, bound by the driver
+    ( '%s' )     IN list, expanded into one bound value per item
+    %s           bare SQL fragment (table name, where clause), inserted as text
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2026 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import re
+
+from wwpdb.apps.workmanager.db_access.LRUCache import LRUCache
+
+_slotPattern = re.compile(r"\(\s*'%s'\s*\)|'%s'|%s|%%")
+_statementCache = LRUCache(maxSize=256)
+
+
+class PreparedStatement(object):
+    """ Compiled schema map template
+    """
+    def __init__(self, template):
+        """
+        """
+        self.__template = template
+        # list of literal text pieces, one more than the number of slots
+        self.__textList = []
+        self.__slotKinds = []
+        text = ''
+        pos = 0
+        for m in _slotPattern.finditer(template):
+            text += template[pos:m.start()]
+            token = m.group(0)
+            pos = m.end()
+            if token == '%%':
+                text += '%'
+                continue
+            #
+            self.__textList.append(text)
+            text = ''
+            if token.startswith('('):
+                self.__slotKinds.append('list')
+            elif token.startswith("'"):
+                self.__slotKinds.append('value')
+            else:
+                self.__slotKinds.append('raw')
+            #
+        #
+        self.__textList.append(text + template[pos:])
+        self.__hasRaw = 'raw' in self.__slotKinds
+        # assembled SQL text keyed by the lengths of the IN lists
+        self.__sqlCache = LRUCache(maxSize=32)
+
+    def getTemplate(self):
+        """
+        """
+        return self.__template
+
+    def getSlotCount(self):
+        """
+        """
+        return len(self.__slotKinds)
+
+    def bind(self, parameter=()):
+        """ Return ( sql, args ) ready for cursor.execute(). parameter follows the '%' operator convention:
+            a tuple holds one value per slot, anything else is the value of a single slot.
+            Raises ValueError if the number of values does not match the template.
+        """
+        if isinstance(parameter, tuple):
+            values = parameter
+        else:
+            values = (parameter,)
+        #
+        if len(values) != len(self.__slotKinds):
+            raise ValueError("%d values given for %d slots in '%s'" % (len(values), len(self.__slotKinds), self.__template))
+        #
+        args = []
+        shape = []
+        rawValues = []
+        for kind, value in zip(self.__slotKinds, values):
+            if kind == 'list':
+                itemList = self.__toList(value)
+                shape.append(len(itemList))
+                args.extend(itemList)
+            elif kind == 'value':
+                args.append(value)
+            else:
+                rawValues.append(str(value))
+            #
+        #
+        if self.__hasRaw:
+            return self.__assemble(shape, rawValues, len(args) > 0), (tuple(args) if args else None)
+        #
+        key = tuple(shape)
+        sql = self.__sqlCache.get(key)
+        if sql is None:
+            sql = self.__assemble(shape, rawValues, True)
+            self.__sqlCache.put(key, sql)
+        #
+        return sql, tuple(args)
+
+    def __toList(self, value):
+        """ IN list values may be given as a list or, as in the legacy interface, pre-joined with "', '"
+        """
+        if isinstance(value, (list, tuple, set, frozenset)):
+            itemList = list(value)
+        else:
+            itemList = str(value).split("', '")
+        #
+        if not itemList:
+            # same as the legacy "in ( '' )"
+            itemList = ['']
+        #
+        return itemList
+
+    def __assemble(self, shape, rawValues, hasArgs):
+        """
+        """
+        shapeIter = iter(shape)
+        rawIter = iter(rawValues)
+        sqlList = []
+        for idx, kind in enumerate(self.__slotKinds):
+            sqlList.append(self.__escape(self.__textList[idx], hasArgs))
+            if kind == 'list':
+                sqlList.append('( ' + ', '.join(['%s'] * next(shapeIter)) + ' )')
+            elif kind == 'value':
+                sqlList.append('%s')
+            else:
+                sqlList.append(self.__escape(next(rawIter), hasArgs))
+            #
+        #
+        sqlList.append(self.__escape(self.__textList[-1], hasArgs))
+        return ''.join(sqlList)
+
+    def __escape(self, text, hasArgs):
+        """ The driver applies '%' formatting only when arguments are passed
+        """
+        if hasArgs:
+            return text.replace('%', '%%')
+        #
+        return text
+
+
+def getPreparedStatement(template):
+    """ Return the compiled statement for template from the process-wide statement cache
+    """
+    statement = _statementCache.get(template)
+    if statement is None:
+        statement = PreparedStatement(template)
+        _statementCache.put(template, statement)
+    #
+    return statement
+
+
+def getStatementCacheStats():
+    """
+    """
+    return _statementCache.getStats()
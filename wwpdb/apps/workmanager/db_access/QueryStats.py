@@ -0,0 +1,211 @@
+##
+# File:  QueryStats.py
+# Date:  18-Oct-2026
+# Updates:
+##
+"""
+In-process statistics of the SQL statements run through DbApiUtil.
+
+Every statement is recorded under its schema map key or, for ad hoc SQL, under a normalized fingerprint
+(literals replaced by '?', IN lists collapsed). For each label the wall time histogram, row counts, errors
+and the calling web operations are kept. Statements slower than the threshold are written to the log
+together with the name of the operation that issued them.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2026 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import bisect
+import re
+import sys
+import threading
+import time
+
+from wwpdb.apps.workmanager.db_access.LRUCache import LRUCache
+
+# upper bounds (seconds) of the histogram buckets, the last bucket is open ended
+_bucketBounds = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0, 10.0)
+_bucketLabels = tuple(["<=%gs" % bound for bound in _bucketBounds]) + (">%gs" % _bucketBounds[-1],)
+
+_stringPattern = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"")
+_numberPattern = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_inListPattern = re.compile(r"\bin\s*\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))*\s*\)", re.IGNORECASE)
+_spacePattern = re.compile(r"\s+")
+
+_fingerprintCache = LRUCache(maxSize=1024)
+_opLocal = threading.local()
+
+
+def getFingerprint(sql):
+    """ Return sql with literals replaced by '?', IN lists collapsed to "in (...)" and white space normalized
+    """
+    fingerprint = _fingerprintCache.get(sql)
+    if fingerprint is None:
+        fingerprint = _stringPattern.sub('?', sql)
+        fingerprint = _numberPattern.sub('?', fingerprint)
+        fingerprint = _inListPattern.sub('in (...)', fingerprint)
+        fingerprint = _spacePattern.sub(' ', fingerprint).strip().lower()
+        _fingerprintCache.put(sql, fingerprint)
+    #
+    return fingerprint
+
+
+def setCurrentOp(opName):
+    """ Set the name of the operation issuing the statements of the current thread (None to clear)
+    """
+    _opLocal.name = opName
+
+
+def getCurrentOp():
+    """
+    """
+    return getattr(_opLocal, 'name', None)
+
+
+class QueryStats(object):
+    """ Thread-safe per-label aggregation of statement timings
+    """
+    def __init__(self, slowThreshold=1.0):
+        """
+        """
+        self.__slowThreshold = slowThreshold
+        self.__lock = threading.Lock()
+        self.__statsMap = {}
+        self.__slowCount = 0
+
+    def setSlowThreshold(self, slowThreshold):
+        """ Statements taking longer than slowThreshold seconds are logged, None turns the slow-query log off
+        """
+        self.__slowThreshold = slowThreshold
+
+    def getSlowThreshold(self):
+        """
+        """
+        return self.__slowThreshold
+
+    def record(self, label, elapsed, rows=0, error=False, log=sys.stderr):
+        """ Add one statement execution
+        """
+        opName = getCurrentOp()
+        with self.__lock:
+            if label not in self.__statsMap:
+                self.__statsMap[label] = {"count": 0, "errors": 0, "rows": 0, "total_time": 0.0, "max_time": 0.0,
+                                          "histogram": [0] * len(_bucketLabels), "ops": {}}
+            #
+            stats = self.__statsMap[label]
+            stats["count"] += 1
+            stats["rows"] += rows
+            stats["total_time"] += elapsed
+            if elapsed > stats["max_time"]:
+                stats["max_time"] = elapsed
+            #
+            if error:
+                stats["errors"] += 1
+            #
+            stats["histogram"][bisect.bisect_left(_bucketBounds, elapsed)] += 1
+            if opName:
+                stats["ops"][opName] = stats["ops"].get(opName, 0) + 1
+            #
+            isSlow = (self.__slowThreshold is not None) and (elapsed > self.__slowThreshold)
+            if isSlow:
+                self.__slowCount += 1
+            #
+        #
+        if isSlow and log:
+            log.write("+QueryStats slow query %.3fs rows=%d op=%s: %s\n" % (elapsed, rows, opName if opName else 'unknown', label))
+        #
+
+    def getStats(self):
+        """ Return { label : stats } where stats holds count, errors, rows, total_time, mean_time, max_time,
+            the estimated p50/p95 (upper bound of the bucket holding the percentile), the histogram as
+            { bucket : count } and the number of executions per calling operation
+        """
+        with self.__lock:
+            statsMap = {}
+            for label, stats in self.__statsMap.items():
+                statsMap[label] = {"count": stats["count"], "errors": stats["errors"], "rows": stats["rows"],
+                                   "total_time": stats["total_time"], "max_time": stats["max_time"],
+                                   "histogram": list(stats["histogram"]), "ops": dict(stats["ops"])}
+            #
+        #
+        for stats in statsMap.values():
+            stats["mean_time"] = stats["total_time"] / stats["count"]
+            stats["p50_time"] = self.__percentile(stats["histogram"], stats["count"], 0.50, stats["max_time"])
+            stats["p95_time"] = self.__percentile(stats["histogram"], stats["count"], 0.95, stats["max_time"])
+            stats["histogram"] = dict(zip(_bucketLabels, stats["histogram"]))
+        #
+        return statsMap
+
+    def getSlowCount(self):
+        """
+        """
+        with self.__lock:
+            return self.__slowCount
+        #
+
+    def getTopList(self, n=10, sortKey="total_time"):
+        """ Return [ ( label, stats ) ] of the n labels with the largest sortKey value
+        """
+        statsMap = self.getStats()
+        return sorted(statsMap.items(), key=lambda item: item[1][sortKey], reverse=True)[:n]
+
+    def reset(self):
+        """
+        """
+        with self.__lock:
+            self.__statsMap = {}
+            self.__slowCount = 0
+        #
+
+    def __percentile(self, histogram, count, fraction, maxTime):
+        """
+        """
+        target = fraction * count
+        cumulative = 0
+        for idx, bucketCount in enumerate(histogram):
+            cumulative += bucketCount
+            if cumulative >= target:
+                if idx < len(_bucketBounds):
+                    return min(_bucketBounds[idx], maxTime)
+                #
+                return maxTime
+            #
+        #
+        return maxTime
+
+
+class QueryTimer(object):
+    """ Measures one statement: call stop( rows, error ) when done
+    """
+    def __init__(self, queryStats, label, log=sys.stderr):
+        """
+        """
+        self.__queryStats = queryStats
+        self.__label = label
+        self.__log = log
+        self.__startTime = time.time()
+
+    def stop(self, rows=0, error=False):
+        """
+        """
+        self.__queryStats.record(self.__label, time.time() - self.__startTime, rows=rows, error=error, log=self.__log)
+
+
+_queryStats = QueryStats()
+
+
+def getQueryStats():
+    """ Return the process-wide statement statistics object
+    """
+    return _queryStats
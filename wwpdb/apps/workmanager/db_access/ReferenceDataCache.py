@@ -0,0 +1,130 @@
+##
+# File:  ReferenceDataCache.py
+# Date:  18-Oct-2026
+# Updates:
+##
+"""
+In-process cache with expiry for rarely changing reference data (users, groups, sites, workflow classes)
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2026 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import copy
+import threading
+import time
+
+
+class ReferenceDataCache(object):
+    """ Values are stored under ( scope, category, args ) keys, where scope identifies the database and category
+        the kind of lookup (e.g. 'sites', 'user_initial'). Entries expire after ttl seconds and can be dropped
+        per category with invalidate(). Callers always get a copy of the cached value.
+    """
+    def __init__(self, ttl=300):
+        """
+        """
+        self.__ttl = ttl
+        self.__lock = threading.Lock()
+        # key -> ( expiry time, value )
+        self.__data = {}
+        self.__warmScopes = set()
+        # bumped by invalidate() so that a load racing with an invalidation is not stored
+        self.__generation = 0
+        self.__stats = {"hits": 0, "misses": 0, "expired": 0, "invalidated": 0}
+
+    def setTTL(self, ttl):
+        """
+        """
+        self.__ttl = ttl
+
+    def get(self, scope, category, args, loader):
+        """ Return the cached value for ( scope, category, args ), calling loader() to fill it when missing or expired.
+            Empty results are not cached.
+        """
+        key = (scope, category, args)
+        now = time.time()
+        with self.__lock:
+            if key in self.__data:
+                expiry, value = self.__data[key]
+                if expiry > now:
+                    self.__stats["hits"] += 1
+                    return copy.deepcopy(value)
+                #
+                del self.__data[key]
+                self.__stats["expired"] += 1
+            #
+            self.__stats["misses"] += 1
+            generation = self.__generation
+        #
+        value = loader()
+        if value:
+            with self.__lock:
+                if generation == self.__generation:
+                    self.__data[key] = (now + self.__ttl, copy.deepcopy(value))
+                #
+            #
+        #
+        return value
+
+    def invalidate(self, scope=None, categories=None):
+        """ Drop the entries of the given categories (all categories if None) for scope (all scopes if None)
+        """
+        with self.__lock:
+            keyList = [key for key in self.__data if ((scope is None) or (key[0] == scope)) and ((categories is None) or (key[1] in categories))]
+            for key in keyList:
+                del self.__data[key]
+            #
+            self.__stats["invalidated"] += len(keyList)
+            self.__generation += 1
+            if scope is None:
+                self.__warmScopes.clear()
+            else:
+                self.__warmScopes.discard(scope)
+            #
+        #
+
+    def isWarm(self, scope):
+        """
+        """
+        with self.__lock:
+            return scope in self.__warmScopes
+        #
+
+    def setWarm(self, scope):
+        """
+        """
+        with self.__lock:
+            self.__warmScopes.add(scope)
+        #
+
+    def getStats(self):
+        """ Return the cache counters
+        """
+        with self.__lock:
+            stats = dict(self.__stats)
+            stats["size"] = len(self.__data)
+            stats["ttl"] = self.__ttl
+        #
+        total = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = (float(stats["hits"]) / total) if total else 0.0
+        return stats
+
+
+_referenceDataCache = ReferenceDataCache()
+
+
+def getReferenceDataCache():
+    """ Return the process-wide reference data cache
+    """
+    return _referenceDataCache
@@ -0,0 +1,243 @@
+##
+# File:  ReplaceCountSummary.py
+# Date:  18-Oct-2026
+# Updates:
+#  18-Oct-2026  zf   keep the revisions of the last historyDays days only, refresh() re-reads the PIs of all kept entries
+##
+"""
+Precomputed author initiated coordinate replacement counts ( GET_REPLACE_COUNTS ) of the replacement history page.
+
+The summary keeps the number of coordinate replacement revisions per ( revision_date, PI ORCID, PI name ) of the
+last historyDays days in a pickle file which the page reads, so counts for a date range inside that window
+( see covers() ) are summed from the daily buckets instead of aggregating pdbx_audit_revision_history. A second
+file keeps the replacement revisions and the principal investigators of their entries.
+
+refresh() re-reads the replacement revisions from overlapDays before the watermark on, replaces the stored
+revisions of that period with them and re-reads the principal investigators of all entries with a revision in
+the window, so that a PI change of an entry without new revisions is picked up too. rebuild()
+recomputes the summary from scratch and check() compares the summary with the original GET_REPLACE_COUNTS query.
+See utils/ReplaceCountCli.py for the command line interface.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2026 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import sys
+import time
+from datetime import date, timedelta
+
+from wwpdb.apps.workmanager.db_access.ContentDbApi import ContentDbApi
+from wwpdb.apps.workmanager.db_access.SnapshotFileStore import SnapshotFileStore, getSnapshotPath
+
+
+def getGroupKey(orcid, name):
+    """ ( identifier_ORCID, name ) compared like the GROUP BY of GET_REPLACE_COUNTS ( case-insensitive, trailing spaces ignored )
+    """
+    return tuple([str(value).rstrip().lower() if value is not None else None for value in (orcid, name)])
+
+
+class ReplaceCountSummary(object):
+    """
+    """
+    __countFile = 'replace_counts.pickle'
+    __eventFile = 'replace_events.pickle'
+    __lockFile = 'replace.lock'
+    __version = 2
+
+    def __init__(self, siteId=None, snapshotPath=None, contentDB=None, overlapDays=30, historyDays=730, verbose=False, log=sys.stderr):
+        """
+        """
+        self.__siteId = siteId
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__contentDB = contentDB
+        self.__overlapDays = overlapDays
+        self.__historyDays = historyDays
+        #
+        if not snapshotPath:
+            snapshotPath = getSnapshotPath(self.__siteId)
+        #
+        self.__store = SnapshotFileStore(snapshotPath=snapshotPath, lockFile=self.__lockFile, log=self.__lfh)
+        self.__counts = None
+
+    def getReplaceCounts(self, startdate=None, enddate=None):
+        """ Returns the rows of GET_REPLACE_COUNTS ( name, identifier_ORCID, numreplace ) ordered by name for the revisions
+            from startdate ( default: 365 days ago, as the original query ) to enddate ( default: no limit )
+        """
+        if not self.__counts:
+            return []
+        #
+        start = self.__getStartDate(startdate)
+        end = str(enddate) if enddate else None
+        groupMap = {}
+        for day, pairMap in self.__counts['days'].items():
+            if (day < start) or (end and (day > end)):
+                continue
+            #
+            for (orcid, name), num in pairMap.items():
+                key = getGroupKey(orcid, name)
+                if key in groupMap:
+                    groupMap[key]['numreplace'] += num
+                else:
+                    groupMap[key] = {'name': name, 'identifier_ORCID': orcid, 'numreplace': num}
+                #
+            #
+        #
+        return sorted(groupMap.values(), key=lambda row: (row['name'] is not None, getGroupKey(None, row['name'])[1], str(row['identifier_ORCID'])))
+
+    def covers(self, startdate=None):
+        """ Whether the revisions from startdate ( default: 365 days ago ) on are kept in the summary
+        """
+        return bool(self.__counts) and (self.__getStartDate(startdate) >= self.__counts['window_start'])
+
+    def getInfo(self):
+        """ Returns watermark, window start, refresh time and number of buckets of the loaded summary
+        """
+        if not self.__counts:
+            return {}
+        #
+        return {'watermark': self.__counts['watermark'], 'window_start': self.__counts['window_start'], 'refresh_time': self.__counts['refresh_time'],
+                'days': len(self.__counts['days']), 'buckets': sum([len(pairMap) for pairMap in self.__counts['days'].values()])}
+
+    def load(self):
+        """ Load the counts, returns 'OK' if a summary exists
+        """
+        data = self.__store.read(self.__countFile)
+        if (not data) or (data.get('version') != self.__version):
+            self.__counts = None
+            return None
+        #
+        self.__counts = data
+        return 'OK'
+
+    def refresh(self, maxAge=None):
+        """ Add the new replacement revisions, the summary is (re)built if missing. With maxAge, a summary refreshed less
+            than maxAge seconds ago is used as is. Returns 'OK' if the loaded counts can be used.
+        """
+        if (self.load() == 'OK') and maxAge and ((time.time() - self.__counts['refresh_time']) < maxAge):
+            return 'OK'
+        #
+        return self.__store.locked(self.__refresh, maxAge)
+
+    def rebuild(self):
+        """ Recompute the summary from scratch
+        """
+        return self.__store.locked(self.__rebuild)
+
+    def check(self):
+        """ Compare the summary with the original GET_REPLACE_COUNTS query. Returns the list of differences, None on failure.
+        """
+        if self.load() != 'OK':
+            self.__lfh.write("+ReplaceCountSummary.check() no summary in %s\n" % self.__store.getPath())
+            return None
+        #
+        rows = self.__getContentDB().GetReplaceCounts()
+        if rows is None:
+            return None
+        #
+        expected = {}
+        for row in rows:
+            key = getGroupKey(row['identifier_ORCID'], row['name'])
+            expected[key] = expected.get(key, 0) + int(row['numreplace'])
+        #
+        stored = dict([(getGroupKey(row['identifier_ORCID'], row['name']), row['numreplace']) for row in self.getReplaceCounts()])
+        diffList = []
+        for key in sorted(set(stored.keys()) | set(expected.keys()), key=str):
+            if stored.get(key, 0) != expected.get(key, 0):
+                diffList.append("ORCID %r name %r: summary %d, database %d" % (key[0], key[1], stored.get(key, 0), expected.get(key, 0)))
+            #
+        #
+        return diffList
+
+    def __refresh(self, maxAge):
+        """ Runs with the lock held
+        """
+        if self.load() != 'OK':
+            return self.__rebuild()
+        #
+        # another process may have refreshed while waiting for the lock
+        if maxAge and ((time.time() - self.__counts['refresh_time']) < maxAge):
+            return 'OK'
+        #
+        state = self.__store.read(self.__eventFile)
+        if state is None:
+            return self.__rebuild()
+        #
+        windowStart = self.__getWindowStart()
+        since = max(str(self.__toDate(self.__counts['watermark']) - timedelta(self.__overlapDays)), windowStart)
+        eventList = self.__getContentDB().getReplaceEvents(since)
+        if eventList is None:
+            return None
+        #
+        events = dict([(key, day) for key, day in state['events'].items() if (day is not None) and (windowStart <= day < since)])
+        for event in eventList:
+            events[event[:3]] = event[3]
+        #
+        return self.__saveWithAuthors(events, windowStart)
+
+    def __rebuild(self):
+        """ Runs with the lock held
+        """
+        windowStart = self.__getWindowStart()
+        eventList = self.__getContentDB().getReplaceEvents(windowStart)
+        if eventList is None:
+            return None
+        #
+        return self.__saveWithAuthors(dict([(event[:3], event[3]) for event in eventList]), windowStart)
+
+    def __saveWithAuthors(self, events, windowStart):
+        """ Read the principal investigators of the entries of events and save the summary
+        """
+        piMap = self.__getContentDB().getReplacePIMap(sorted(set([key[0] for key in events.keys()])))
+        if piMap is None:
+            return None
+        #
+        authors = dict([(entryId, piMap.get(entryId, [])) for entryId in set([key[0] for key in events.keys()])])
+        return self.__save(events, authors, str(date.today()), windowStart)
+
+    def __save(self, events, authors, watermark, windowStart):
+        """ Recompute the daily buckets from the replacement revisions and write both files
+        """
+        days = {}
+        for key, day in events.items():
+            if day is None:
+                continue
+            #
+            pairMap = days.setdefault(day, {})
+            for pair in authors.get(key[0], []):
+                pairMap[pair] = pairMap.get(pair, 0) + 1
+            #
+        #
+        counts = {'version': self.__version, 'watermark': watermark, 'window_start': windowStart, 'refresh_time': time.time(), 'days': days}
+        self.__store.write(self.__eventFile, {'events': events, 'authors': authors})
+        self.__store.write(self.__countFile, counts)
+        self.__counts = counts
+        return 'OK'
+
+    def __getStartDate(self, startdate):
+        """ First revision date of a query, the original query counts the last 365 days
+        """
+        return str(startdate) if startdate else str(date.today() - timedelta(365))
+
+    def __getWindowStart(self):
+        return str(date.today() - timedelta(self.__historyDays))
+
+    def __toDate(self, day):
+        return date(*[int(value) for value in day.split('-')])
+
+    def __getContentDB(self):
+        if self.__contentDB is None:
+            self.__contentDB = ContentDbApi(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        #
+        return self.__contentDB
@@ -0,0 +1,237 @@
+##
+# File:  RetryPolicy.py
+# Date:  18-Oct-2026
+# Updates:
+#  18-Oct-2026  zf   add CircuitBreaker.releaseProbe(), a half-open breaker whose probes did not report lets new probes
+#                    through after resetTimeout seconds
+##
+"""
+Retry policy and circuit breaker for database statements.
+
+RetryPolicy spaces the attempts of a failed statement with capped exponential backoff and full jitter and
+stops once the deadline of the statement (or of the current request) would be exceeded.
+
+CircuitBreaker is shared by all users of one database. After failureThreshold consecutive connection
+failures it opens and statements fail immediately. After resetTimeout seconds it lets a limited number of
+probe statements through (half-open): a probe answered by the server closes it again, a failed one re-opens it.
+A probe which ends without either outcome gives its slot back with releaseProbe(); probes which never report
+are replaced by new ones after another resetTimeout seconds.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2026 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import random
+import threading
+import time
+
+_breakerMap = {}
+_breakerLock = threading.Lock()
+_deadlineLocal = threading.local()
+
+
+class RetryPolicy(object):
+    """ maxAttempts: total number of attempts of a statement; baseDelay/maxDelay: backoff range in seconds;
+        deadline: seconds after the first attempt beyond which no retry is started
+    """
+    def __init__(self, maxAttempts=4, baseDelay=0.2, maxDelay=2.0, deadline=10.0):
+        """
+        """
+        self.__maxAttempts = maxAttempts
+        self.__baseDelay = baseDelay
+        self.__maxDelay = maxDelay
+        self.__deadline = deadline
+
+    def getMaxAttempts(self):
+        """
+        """
+        return self.__maxAttempts
+
+    def getDeadline(self, startTime):
+        """ Return the absolute time by which a statement started at startTime must have completed
+        """
+        deadline = startTime + self.__deadline
+        requestDeadline = getRequestDeadline()
+        if (requestDeadline is not None) and (requestDeadline < deadline):
+            return requestDeadline
+        #
+        return deadline
+
+    def getDelay(self, attempt):
+        """ Delay before retry number attempt (1, 2, ...): uniformly drawn from [ 0, min( maxDelay, baseDelay * 2 ** ( attempt - 1 ) ) ]
+        """
+        return random.uniform(0, min(self.__maxDelay, self.__baseDelay * (2 ** (attempt - 1))))
+
+
+class CircuitBreaker(object):
+    """ Closed -> open after failureThreshold consecutive failures, open -> half-open after resetTimeout seconds,
+        half-open -> closed on a successful probe or back to open on a failed one. Probes which report neither
+        are released, or expire after resetTimeout seconds
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name="", failureThreshold=5, resetTimeout=30.0, halfOpenProbes=1):
+        """
+        """
+        self.__name = name
+        self.__failureThreshold = failureThreshold
+        self.__resetTimeout = resetTimeout
+        self.__halfOpenProbes = halfOpenProbes
+        self.__lock = threading.Lock()
+        self.__state = self.CLOSED
+        self.__failures = 0
+        self.__openedAt = 0.0
+        self.__probes = 0
+        self.__probedAt = 0.0
+        self.__stats = {"opened": 0, "rejected": 0, "probes": 0}
+
+    def allowRequest(self):
+        """ Return True if a statement may be sent to the database
+        """
+        with self.__lock:
+            if self.__state == self.CLOSED:
+                return True
+            #
+            now = time.time()
+            if (self.__state == self.OPEN) and ((now - self.__openedAt) >= self.__resetTimeout):
+                self.__state = self.HALF_OPEN
+                self.__probes = 0
+            elif (self.__state == self.HALF_OPEN) and ((now - self.__probedAt) >= self.__resetTimeout):
+                # the probes let through did not report back
+                self.__probes = 0
+            #
+            if (self.__state == self.HALF_OPEN) and (self.__probes < self.__halfOpenProbes):
+                self.__probes += 1
+                self.__probedAt = now
+                self.__stats["probes"] += 1
+                return True
+            #
+            self.__stats["rejected"] += 1
+            return False
+        #
+
+    def recordSuccess(self):
+        """
+        """
+        with self.__lock:
+            self.__state = self.CLOSED
+            self.__failures = 0
+        #
+
+    def releaseProbe(self):
+        """ A statement let through by allowRequest() ended without telling whether the database is reachable
+            ( e.g. no pooled connection was free, or it was abandoned before reaching the server ): free its
+            probe slot. Does nothing unless the breaker is half-open.
+        """
+        with self.__lock:
+            if (self.__state == self.HALF_OPEN) and (self.__probes > 0):
+                self.__probes -= 1
+            #
+        #
+
+    def recordFailure(self):
+        """ Count a connection failure, returns True if the breaker is (now) open
+        """
+        with self.__lock:
+            self.__failures += 1
+            if (self.__state == self.HALF_OPEN) or ((self.__state == self.CLOSED) and (self.__failures >= self.__failureThreshold)):
+                self.__state = self.OPEN
+                self.__openedAt = time.time()
+                self.__stats["opened"] += 1
+            elif self.__state == self.OPEN:
+                # a probe admitted before the breaker re-opened
+                self.__openedAt = time.time()
+            #
+            return self.__state == self.OPEN
+        #
+
+    def getState(self):
+        """
+        """
+        with self.__lock:
+            return self.__state
+        #
+
+    def reset(self):
+        """
+        """
+        with self.__lock:
+            self.__state = self.CLOSED
+            self.__failures = 0
+        #
+
+    def getStats(self):
+        """
+        """
+        with self.__lock:
+            stats = dict(self.__stats)
+            stats["name"] = self.__name
+            stats["state"] = self.__state
+            stats["consecutive_failures"] = self.__failures
+        #
+        return stats
+
+
+# { 'default' : policy of the DbApiUtil instances created without an explicit one }
+_retryPolicyMap = {'default': RetryPolicy()}
+
+
+def getDefaultRetryPolicy():
+    """
+    """
+    return _retryPolicyMap['default']
+
+
+def setDefaultRetryPolicy(policy):
+    """ Replace the policy used by DbApiUtil instances created without an explicit one
+    """
+    _retryPolicyMap['default'] = policy
+
+
+def getCircuitBreaker(name, **kwargs):
+    """ Return the process-wide breaker for database name, creating it on first use
+    """
+    with _breakerLock:
+        if name not in _breakerMap:
+            _breakerMap[name] = CircuitBreaker(name=name, **kwargs)
+        #
+        return _breakerMap[name]
+    #
+
+
+def getCircuitBreakerStats():
+    """ Return { database name : breaker stats }
+    """
+    with _breakerLock:
+        breakers = list(_breakerMap.items())
+    #
+    statsMap = {}
+    for name, breaker in breakers:
+        statsMap[name] = breaker.getStats()
+    #
+    return statsMap
+
+
+def setRequestDeadline(seconds):
+    """ Limit the retries of all statements issued by the current thread to the next seconds seconds (None to clear)
+    """
+    _deadlineLocal.deadline = (time.time() + seconds) if seconds else None
+
+
+def getRequestDeadline():
+    """
+    """
+    return getattr(_deadlineLocal, 'deadline', None)
@@ -0,0 +1,112 @@
+##
+# File:  SnapshotFileStore.py
+# Date:  18-Oct-2026
+# Updates:
+##
+"""
+Pickle files of the precomputed summaries ( statistics snapshot, replacement counts ) with a lock for the writers.
+
+Files are written to a temporary file and renamed, so that readers never see a partial file and need no lock.
+Updates run through locked(), which holds an exclusive lock on the store's lock file.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2026 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import fcntl
+import os
+import sys
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle as pickle
+
+from wwpdb.utils.config.ConfigInfo import ConfigInfo
+
+
+def getSnapshotPath(siteId=None):
+    """ Default directory of the summaries, None if the site has no sessions path
+    """
+    topSessionPath = ConfigInfo(siteId).get('SITE_WEB_APPS_TOP_SESSIONS_PATH')
+    if not topSessionPath:
+        return None
+    #
+    return os.path.join(topSessionPath, 'wfm_stats')
+
+
+class SnapshotFileStore(object):
+    """
+    """
+    def __init__(self, snapshotPath=None, lockFile='snapshot.lock', log=sys.stderr):
+        """ A store without snapshotPath reads nothing and refuses all updates
+        """
+        self.__snapshotPath = snapshotPath
+        self.__lockFile = lockFile
+        self.__lfh = log
+
+    def getPath(self):
+        return self.__snapshotPath
+
+    def locked(self, function, *args):
+        """ Run function( *args ) holding the lock, file errors are logged and return None
+        """
+        if not self.__snapshotPath:
+            return None
+        #
+        try:
+            if not os.access(self.__snapshotPath, os.F_OK):
+                os.makedirs(self.__snapshotPath)
+            #
+            with open(os.path.join(self.__snapshotPath, self.__lockFile), 'a') as lockFile:
+                fcntl.flock(lockFile, fcntl.LOCK_EX)
+                try:
+                    return function(*args)
+                finally:
+                    fcntl.flock(lockFile, fcntl.LOCK_UN)
+                #
+            #
+        except (IOError, OSError) as e:
+            self.__lfh.write("+SnapshotFileStore.locked() update in %s failed: %s\n" % (self.__snapshotPath, str(e)))
+        #
+        return None
+
+    def read(self, fileName):
+        """ Returns the unpickled content of fileName, None if it is missing or unreadable
+        """
+        if not self.__snapshotPath:
+            return None
+        #
+        filePath = os.path.join(self.__snapshotPath, fileName)
+        if not os.access(filePath, os.F_OK):
+            return None
+        #
+        try:
+            with open(filePath, 'rb') as fb:
+                return pickle.load(fb)
+            #
+        except Exception as e:  # pylint: disable=broad-except
+            self.__lfh.write("+SnapshotFileStore.read() reading %s failed: %s\n" % (filePath, str(e)))
+        #
+        return None
+
+    def write(self, fileName, data):
+        """ Write to a temporary file and rename, only to be called through locked()
+        """
+        filePath = os.path.join(self.__snapshotPath, fileName)
+        tmpPath = filePath + '.' + str(os.getpid())
+        with open(tmpPath, 'wb') as fb:
+            pickle.dump(data, fb, 2)
+        #
+        os.rename(tmpPath, filePath)
@@ -0,0 +1,356 @@
+##
+# File:  StatsSnapshot.py
+# Date:  18-Oct-2026
+# Updates:
+#  18-Oct-2026  zf   read/write the files through SnapshotFileStore
+#  18-Oct-2026  zf   refresh() rebuilds a snapshot older than maxBuildAge
+#  18-Oct-2026  zf   compare status codes as the statistics queries do, in-process buckets keyed by the upper case code
+##
+"""
+Incrementally maintained counts behind the statistics page.
+
+The snapshot keeps the number of entries per ( date_begin_processing, rcsb_annotator ) bucket of the finished
+entries ( GET_DAILY_STATS ) of the last retentionDays days and per ( status_code, rcsb_annotator ) bucket of the
+entries in process ( GET_INPROCESS_STATS ). The counts are stored in a small pickle file which the statistics
+page reads instead of aggregating rcsb_status. A second file keeps the ( status_code, rcsb_annotator,
+date_begin_processing ) of the entries which contribute to a bucket, so that a refresh can take back the old
+contribution of an entry before adding the new one.
+
+refresh() re-reads the rcsb_status rows of the depositions with a workflow instance update since the last
+watermark ( with an overlap for clock skew, re-reading an entry is harmless ), refreshEntries() the rows of a
+given ID list. rcsb_status changes without a workflow instance update are not seen by refresh(), so a snapshot
+built more than maxBuildAge seconds ago is rebuilt instead of refreshed. rebuild() recomputes the snapshot from scratch and verify() compares the stored counts with a
+fresh computation. See utils/StatsSnapshotCli.py for the command line interface.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2026 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import sys
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+from wwpdb.apps.workmanager.db_access.ContentDbApi import ContentDbApi
+from wwpdb.apps.workmanager.db_access.SnapshotFileStore import SnapshotFileStore, getSnapshotPath
+from wwpdb.apps.workmanager.db_access.StatusDbApi import StatusDbApi
+
+DONE_EXCLUDED_STATUS = ('PROC', 'WAIT', 'POLC', 'AUCO')
+IN_PROCESS_STATUS = ('WAIT', 'PROC', 'AUTH', 'POLC', 'REPL')
+
+
+class StatsSnapshot(object):
+    """
+    """
+    __bucketFile = 'stats_buckets.pickle'
+    __entryFile = 'stats_entries.pickle'
+    __lockFile = 'stats.lock'
+    __version = 2
+
+    def __init__(self, siteId=None, snapshotPath=None, statusDB=None, contentDB=None, retentionDays=60, maxBuildAge=86400, verbose=False,
+                 log=sys.stderr):
+        """
+        """
+        self.__siteId = siteId
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__statusDB = statusDB
+        self.__contentDB = contentDB
+        self.__retentionDays = retentionDays
+        # seconds after which refresh() rebuilds the snapshot from scratch ( None: never )
+        self.__maxBuildAge = maxBuildAge
+        # seconds re-read before the watermark
+        self.__overlap = 600
+        #
+        if not snapshotPath:
+            snapshotPath = getSnapshotPath(self.__siteId)
+        #
+        self.__store = SnapshotFileStore(snapshotPath=snapshotPath, lockFile=self.__lockFile, log=self.__lfh)
+        self.__buckets = None
+
+    def getDailyCounts(self, startdate=None, enddate=None):
+        """ Returns { date : Counter( rcsb_annotator ) } like ContentDbApi.getDailyStatsCounts()
+        """
+        return_dir = {}
+        if (not startdate) or (not enddate) or (not self.__buckets):
+            return return_dir
+        #
+        start = str(startdate)
+        end = str(enddate)
+        for (day, annotator), num in self.__buckets['done'].items():
+            if start <= day <= end:
+                dayDate = datetime.strptime(day, '%Y-%m-%d').date()
+                if dayDate not in return_dir:
+                    return_dir[dayDate] = Counter()
+                #
+                return_dir[dayDate][annotator] += num
+            #
+        #
+        return return_dir
+
+    def getInProcessCounts(self):
+        """ Returns { status_code : Counter( rcsb_annotator ) } like ContentDbApi.getInProcessStatsCounts()
+        """
+        return_dir = {}
+        if not self.__buckets:
+            return return_dir
+        #
+        for (status, annotator), num in self.__buckets['inprocess'].items():
+            if status not in return_dir:
+                return_dir[status] = Counter()
+            #
+            return_dir[status][annotator] += num
+        #
+        return return_dir
+
+    def covers(self, startdate):
+        """ Whether the daily counts from startdate on are kept in the snapshot
+        """
+        return bool(self.__buckets) and (str(startdate) >= self.__buckets['window_start'])
+
+    def getInfo(self):
+        """ Returns watermark, build and refresh time, window start and number of buckets of the loaded snapshot
+        """
+        if not self.__buckets:
+            return {}
+        #
+        return {'watermark': self.__buckets['watermark'], 'built_at': self.__buckets.get('built_at', 0), 'refresh_time': self.__buckets['refresh_time'],
+                'window_start': self.__buckets['window_start'], 'done_buckets': len(self.__buckets['done']),
+                'inprocess_buckets': len(self.__buckets['inprocess'])}
+
+    def load(self):
+        """ Load the counts, returns 'OK' if a snapshot exists
+        """
+        data = self.__store.read(self.__bucketFile)
+        if (not data) or (data.get('version') != self.__version):
+            self.__buckets = None
+            return None
+        #
+        self.__buckets = data
+        return 'OK'
+
+    def refresh(self, maxAge=None):
+        """ Bring the snapshot up to date, it is (re)built if missing or older than maxBuildAge. With maxAge, a
+            snapshot refreshed less than maxAge seconds ago is used as is. Returns 'OK' if the loaded counts can be used.
+        """
+        if (self.load() == 'OK') and maxAge and ((time.time() - self.__buckets['refresh_time']) < maxAge):
+            return 'OK'
+        #
+        return self.__store.locked(self.__refresh, maxAge)
+
+    def refreshEntries(self, idList):
+        """ Re-read the given entries into an existing snapshot
+        """
+        if not idList:
+            return 'OK'
+        #
+        return self.__store.locked(self.__refreshEntries, idList)
+
+    def rebuild(self):
+        """ Recompute the snapshot from scratch
+        """
+        return self.__store.locked(self.__rebuild)
+
+    def verify(self):
+        """ Compare the stored counts with a fresh computation. Returns the list of differences, None on failure.
+        """
+        if self.load() != 'OK':
+            self.__lfh.write("+StatsSnapshot.verify() no snapshot in %s\n" % self.__store.getPath())
+            return None
+        #
+        windowStart = self.__buckets['window_start']
+        state = self.__computeState(windowStart)
+        if state is None:
+            return None
+        #
+        _entries, expected = state
+        diffList = []
+        for family in ('done', 'inprocess'):
+            stored = self.__buckets[family]
+            for key in sorted(set(stored.keys()) | set(expected[family].keys()), key=str):
+                if stored.get(key, 0) != expected[family].get(key, 0):
+                    diffList.append("%s %r: snapshot %d, database %d" % (family, key, stored.get(key, 0), expected[family].get(key, 0)))
+                #
+            #
+        #
+        return diffList
+
+    def __refresh(self, maxAge):
+        """ Runs with the lock held
+        """
+        if self.load() != 'OK':
+            return self.__rebuild()
+        #
+        # another process may have refreshed while waiting for the lock
+        if maxAge and ((time.time() - self.__buckets['refresh_time']) < maxAge):
+            return 'OK'
+        #
+        if self.__maxBuildAge and ((time.time() - self.__buckets.get('built_at', 0)) >= self.__maxBuildAge):
+            return self.__rebuild()
+        #
+        startTime = time.time()
+        idList = self.__getStatusDB().getChangedDepositionIds(self.__buckets['watermark'] - self.__overlap)
+        if idList is None:
+            return None
+        #
+        return self.__apply(idList, startTime)
+
+    def __refreshEntries(self, idList):
+        """ Runs with the lock held
+        """
+        if self.load() != 'OK':
+            return None
+        #
+        return self.__apply(idList, None)
+
+    def __apply(self, idList, watermark):
+        """ Replace the contribution of the entries of idList by their current rcsb_status rows
+        """
+        entries = self.__store.read(self.__entryFile)
+        if entries is None:
+            return self.__rebuild()
+        #
+        windowStart = self.__getWindowStart()
+        buckets = self.__buckets
+        self.__prune(entries, buckets, windowStart)
+        #
+        idSet = set([entryId for entryId in idList if entryId])
+        rowMap = {}
+        if idSet:
+            rows = self.__getContentDB().getStatsEntryInfo(list(idSet))
+            if rows is None:
+                return None
+            #
+            for row in rows:
+                rowMap[row[0]] = row[1:]
+            #
+        #
+        for entryId in idSet:
+            for family, key in self.__getContribution(entries.get(entryId), windowStart):
+                num = buckets[family].pop(key, 0) - 1
+                if num > 0:
+                    buckets[family][key] = num
+                #
+            #
+            newState = rowMap.get(entryId)
+            contributionList = self.__getContribution(newState, windowStart)
+            for family, key in contributionList:
+                buckets[family][key] = buckets[family].get(key, 0) + 1
+            #
+            if contributionList:
+                entries[entryId] = newState
+            elif entryId in entries:
+                del entries[entryId]
+            #
+        #
+        if watermark is not None:
+            buckets['watermark'] = watermark
+            buckets['refresh_time'] = time.time()
+        #
+        return self.__save(entries, buckets)
+
+    def __rebuild(self):
+        """ Runs with the lock held
+        """
+        startTime = time.time()
+        windowStart = self.__getWindowStart()
+        state = self.__computeState(windowStart)
+        if state is None:
+            return None
+        #
+        entries, buckets = state
+        buckets['watermark'] = startTime
+        buckets['built_at'] = startTime
+        buckets['refresh_time'] = time.time()
+        return self.__save(entries, buckets)
+
+    def __computeState(self, windowStart):
+        """ Returns ( entries, buckets ) computed from all rcsb_status rows which may contribute
+        """
+        rows = self.__getContentDB().getAllStatsEntryInfo(windowStart)
+        if rows is None:
+            return None
+        #
+        entries = {}
+        buckets = {'version': self.__version, 'window_start': windowStart, 'watermark': 0, 'built_at': 0, 'refresh_time': 0, 'done': {}, 'inprocess': {}}
+        for row in rows:
+            contributionList = self.__getContribution(row[1:], windowStart)
+            if not contributionList:
+                continue
+            #
+            entries[row[0]] = row[1:]
+            for family, key in contributionList:
+                buckets[family][key] = buckets[family].get(key, 0) + 1
+            #
+        #
+        return entries, buckets
+
+    def __prune(self, entries, buckets, windowStart):
+        """ Drop the daily counts and entries which fell out of the retention window
+        """
+        if windowStart == buckets['window_start']:
+            return
+        #
+        for key in [key for key in buckets['done'] if key[0] < windowStart]:
+            del buckets['done'][key]
+        #
+        for entryId in [entryId for entryId, state in entries.items() if not self.__getContribution(state, windowStart)]:
+            del entries[entryId]
+        #
+        buckets['window_start'] = windowStart
+
+    def __getContribution(self, state, windowStart):
+        """ Returns the list of ( family, bucket ) an entry with state ( status_code, rcsb_annotator, date_begin_processing )
+            is counted in, with the status code comparison of the statistics queries
+        """
+        contributionList = []
+        if not state:
+            return contributionList
+        #
+        status, annotator, day = state
+        # status_code is compared case-insensitively and without trailing spaces. "status_code not in ( ... )" is
+        # false for a NULL status code only, an empty one is counted as done.
+        if status is not None:
+            status = str(status).rstrip(' ').upper()
+        #
+        if (status is not None) and (status not in DONE_EXCLUDED_STATUS) and day and (day >= windowStart):
+            contributionList.append(('done', (day, annotator)))
+        #
+        if status in IN_PROCESS_STATUS:
+            contributionList.append(('inprocess', (status, annotator)))
+        #
+        return contributionList
+
+    def __getWindowStart(self):
+        return str(date.today() - timedelta(self.__retentionDays))
+
+    def __getStatusDB(self):
+        if self.__statusDB is None:
+            self.__statusDB = StatusDbApi(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        #
+        return self.__statusDB
+
+    def __getContentDB(self):
+        if self.__contentDB is None:
+            self.__contentDB = ContentDbApi(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        #
+        return self.__contentDB
+
+    def __save(self, entries, buckets):
+        """ The entry file is written first, a reader never sees counts without their entries
+        """
+        self.__store.write(self.__entryFile, entries)
+        self.__store.write(self.__bucketFile, buckets)
+        self.__buckets = buckets
+        return 'OK'
@@ -2,6 +2,9 @@
 # File:  StatsUtil.py
 # Date:  17-July-2015
 # Updates:
+#  18-Oct-2026  zf   count annotators while streaming the statistics queries
+#  18-Oct-2026  zf   get weekly/monthly/in process statistics from one grouped query each
+#  18-Oct-2026  zf   read the counts from the incrementally refreshed StatsSnapshot
 ##
 """
 
@@ -21,9 +24,11 @@ __license__ = "Creative Commons Attribution 3.0 Unported"
 __version__ = "V0.07"
 
 import sys
+from collections import Counter
 from datetime import date, timedelta
 
 from wwpdb.apps.workmanager.db_access.ContentDbApi import ContentDbApi
+from wwpdb.apps.workmanager.db_access.StatsSnapshot import StatsSnapshot
 from wwpdb.apps.workmanager.db_access.StatusDbApi import StatusDbApi
 from wwpdb.apps.workmanager.workflow_access.OrderedDict import OrderedDict
 
@@ -44,6 +49,11 @@ class StatsUtil(object):
         self.__week_day = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
         self.__today = date.today()
         self.__annoList = self.__statusDB.getActiveAnnoList()
+        #
+        self.__snapshot = StatsSnapshot(siteId=self.__siteId, statusDB=self.__statusDB, contentDB=self.__contentDB, verbose=self.__verbose, log=self.__lfh)
+        # seconds a snapshot is used before it is refreshed
+        self.__snapshotMaxAge = 300
+        self.__snapshotStatus = None
 
     def getWeeklyStatus(self):
         """
@@ -53,9 +63,10 @@ class StatsUtil(object):
         #
         one_day = timedelta(1)
         start_date = self.__today - timedelta(6)
+        # all seven days from one grouped query
+        day_dir = self.__getDailyCounts(start_date, self.__today)
         for _i in range(7):
-            plist = self.__contentDB.getDailyStatsList(date=start_date)
-            TableData, total_dir = self.__getProcessCount(plist, TableData, total_dir, index)
+            TableData, total_dir = self.__getProcessCount(day_dir.get(start_date), TableData, total_dir, index)
             date_string = self.__week_day[start_date.weekday()] + ' (' + str(start_date)[5:].replace('-', '/') + ')'
             TableColumn.insert(index, str(index), {'label' : date_string, 'data-field': str(index)})
             start_date += one_day
@@ -87,9 +98,16 @@ class StatsUtil(object):
         index, TableColumn, TableData = self.__getInitialTableDef()
         total_dir = {}
         #
+        # the four weeks are contiguous, count them from the daily buckets of one grouped query
+        day_dir = self.__getDailyCounts(dates_list[0][0], self.__today)
         for dates in dates_list:
-            slist = self.__contentDB.getRangeStatsList(startdate=dates[0], enddate=dates[1])
-            TableData, total_dir = self.__getProcessCount(slist, TableData, total_dir, index)
+            week_count = Counter()
+            for day, count in day_dir.items():
+                if dates[0] <= day <= dates[1]:
+                    week_count.update(count)
+                #
+            #
+            TableData, total_dir = self.__getProcessCount(week_count, TableData, total_dir, index)
             date_string = self.__week_day[dates[0].weekday()] + '(' + str(dates[0])[5:].replace('-', '/') + ') - ' \
                 + self.__week_day[dates[1].weekday()] + '(' + str(dates[1])[5:].replace('-', '/') + ')'
             TableColumn.insert(index, str(index), {'label' : date_string, 'data-field': str(index)})
@@ -105,24 +123,14 @@ class StatsUtil(object):
     def getProcessStats(self):
         """
         """
-        return_list = self.__contentDB.getInProcessStatsList()
-        return_dir = {}
-        for row in return_list:
-            if row['status_code'] in return_dir:
-                return_dir[row['status_code']].append(row['rcsb_annotator'])
-            else:
-                return_dir[row['status_code']] = [row['rcsb_annotator']]
-            #
+        # status_code -> Counter of rcsb_annotator
+        return_dir = self.__getInProcessCounts()
         #
         index, TableColumn, TableData = self.__getInitialTableDef()
         total_dir = {}
         #
         for status in ('WAIT', 'PROC', 'AUTH', 'POLC', 'REPL'):
-            found_list = []
-            if status in return_dir:
-                found_list = return_dir[status]
-            #
-            TableData, total_dir = self.__getProcessCount(found_list, TableData, total_dir, index)
+            TableData, total_dir = self.__getProcessCount(return_dir.get(status), TableData, total_dir, index)
             TableColumn.insert(index, str(index), {'label' : status, 'data-field': str(index)})
             index += 1
         #
@@ -130,6 +138,35 @@ class StatsUtil(object):
         TableColumn.insert(index, str(index), {'label' : 'Total', 'data-field': str(index)})
         return TableColumn.values(), TableData.values()
 
+    def __getSnapshot(self):
+        """ Returns the refreshed snapshot, None if it can not be used
+        """
+        if self.__snapshotStatus is None:
+            self.__snapshotStatus = self.__snapshot.refresh(maxAge=self.__snapshotMaxAge) or 'Failed'
+        #
+        if self.__snapshotStatus != 'OK':
+            return None
+        #
+        return self.__snapshot
+
+    def __getDailyCounts(self, startdate, enddate):
+        """ { date : Counter( rcsb_annotator ) } from the snapshot, or from the database if the snapshot is not available
+        """
+        snapshot = self.__getSnapshot()
+        if snapshot and snapshot.covers(startdate):
+            return snapshot.getDailyCounts(startdate=startdate, enddate=enddate)
+        #
+        return self.__contentDB.getDailyStatsCounts(startdate=startdate, enddate=enddate)
+
+    def __getInProcessCounts(self):
+        """ { status_code : Counter( rcsb_annotator ) } from the snapshot, or from the database if the snapshot is not available
+        """
+        snapshot = self.__getSnapshot()
+        if snapshot:
+            return snapshot.getInProcessCounts()
+        #
+        return self.__contentDB.getInProcessStatsCounts()
+
     def __getInitialTableDef(self):
         """
         """
@@ -146,21 +183,21 @@ class StatsUtil(object):
         index += 1
         return index, TableColumn, TableData
 
-    def __getProcessCount(self, found_list, TableData, total_dir, index):
-        """
+    def __getProcessCount(self, found_count, TableData, total_dir, index):
+        """ found_count is a Counter ( or dictionary ) of annotator initials -> number of entries
         """
         dir = {}  # pylint: disable=redefined-builtin
         for anno in self.__annoList:
             dir[anno['initials']] = 0
         #
         total = 0
-        if found_list:
-            for ai in found_list:
+        if found_count:
+            for ai, num in found_count.items():
                 if ai not in dir:
                     continue
                 #
-                dir[ai] += 1
-                total += 1
+                dir[ai] += num
+                total += num
             #
         #
         dir['total'] = total
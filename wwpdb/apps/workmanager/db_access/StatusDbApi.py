@@ -2,6 +2,20 @@
 # File:  StatusDbApi.py
 # Date:  04-May-2015
 # Updates:
+#  18-Oct-2026  zf   pass schema map parameters as bound values/lists instead of pre-formatted SQL
+#  18-Oct-2026  zf   run IN list selections in chunks through selectDataInChunks()
+#  18-Oct-2026  zf   serve user/group/site/workflow class lookups from the ReferenceDataCache
+#  18-Oct-2026  zf   add runBulkUpsert()
+#  18-Oct-2026  zf   updateAnnotatorAssignment() updates both tables set-based in one transaction
+#  18-Oct-2026  zf   add iterSelectSQL()
+#  18-Oct-2026  zf   add getQueryStats(), runSelectSQL()/iterSelectSQL() accept the statistics key
+#  18-Oct-2026  zf   add ContactAuthorPIOrValid()
+#  18-Oct-2026  zf   add getLastWFInstances()
+#  18-Oct-2026  zf   add getChangedDepositionIds()
+#  18-Oct-2026  zf   getRetiredAnnotatorInitials() runs one anti-join query, cached in the ReferenceDataCache
+#  18-Oct-2026  zf   getEntryIdListFromInputIdString() resolves each ID type with its own IN list, combined with union all
+#  18-Oct-2026  zf   runSelectSQL() passes strict on
+#  18-Oct-2026  zf   SELECT_RETIRED_ANNOTATOR compares the initials without upper(), left join against the active accounts
 ##
 """
 Providing addintaional APIs for WFE to get info from status database.
@@ -24,9 +38,11 @@ __version__ = "V0.07"
 
 import sys
 
+import MySQLdb
 from wwpdb.utils.config.ConfigInfo import ConfigInfo
 from wwpdb.utils.wf.dbapi.WFEtime import getTimeNow
 from wwpdb.apps.workmanager.db_access.DbApiUtil import DbApiUtil
+from wwpdb.apps.workmanager.db_access.ReferenceDataCache import getReferenceDataCache
 
 
 class StatusDbApi(object):
@@ -83,6 +99,9 @@ class StatusDbApi(object):
                                     "dep_last_instance where dep_set_id = '%s'", 
         "SELECT_WF_LAST_INSTANCE" : "select ordinal, wf_inst_id, wf_class_id, dep_set_id, owner, inst_status, status_timestamp from wf_instance " +
                                     "where dep_set_id = '%s' and wf_class_id = '%s' order by status_timestamp desc limit 1",
+       "SELECT_WF_LAST_INSTANCES" : "select ordinal, wf_inst_id, wf_class_id, dep_set_id, owner, inst_status, status_timestamp from wf_instance " +
+                                    "where dep_set_id = '%s' and wf_class_id in ( '%s' ) order by status_timestamp desc",
+     "SELECT_CHANGED_DEPOSITIONS" : "select distinct dep_set_id from wf_instance where status_timestamp > '%s'",
          "SELECT_WF_ALL_INSTANCE" : "select wf_inst_id, wf_class_id, dep_set_id, inst_status, status_timestamp from wf_instance " +
                                     "where dep_set_id = '%s' and wf_class_id not in ( 'Annotate', 'depUpload' ) order by wf_inst_id",
            "SELECT_COMMUNICATION" : "select ordinal, sender, receiver, dep_set_id, wf_class_id, wf_inst_id, wf_class_file, command, status, actual_timestamp, " +
@@ -92,17 +111,26 @@ class StatusDbApi(object):
                   "GET_REAL_FLOW" : "select wf_task_id, task_status, status_timestamp, task_type from wf_task where dep_set_id = '%s' and wf_inst_id = '%s' " +
                                     "and wf_class_id = '%s' order by status_timestamp asc",
            "CONTACT_AUTHOR_PI"    : "select dep_set_id as id, email, last_name, role, country from user_data where dep_set_id in ( '%s' ) and role = '%s'",
+     "CONTACT_AUTHOR_PI_OR_VALID" : "select dep_set_id as id, email, last_name, role, country from user_data where dep_set_id in ( '%s' ) " +
+                                    "and role in ( 'principa', 'valid' )",
            "CHECK_TABLE_EXIST"    : "select distinct table_name from  information_schema.tables where table_schema = '%s' and table_name = '%s'",
                           "COUNT" : "select count(*) from %s",
                  "GET_ENTRY_LIST" : "select dep_set_id,pdb_id,emdb_id,bmrb_id from deposition where %s",
+           "GET_ENTRY_LIST_BY_ID" : "select dep_set_id,pdb_id,emdb_id,bmrb_id from deposition where %s in ( '%s' )",
       "GET_ENTRY_LIST_FROM_GROUP" : "select group_id, dep_set_id from group_deposition_information where group_id in ( '%s' ) order by dep_set_id",
                 "SELECT_GROUP_ID" : "select dep_set_id, group_id from group_deposition_information where dep_set_id in ( '%s' )",
                  "GET_ENTRY_INFO" : "select dep_set_id, initial_deposition_date, annotator_initials, status_code from deposition where dep_set_id in ( '%s' ) " +
                                     "order by dep_set_id",
+       "SELECT_RETIRED_ANNOTATOR" : "select d.initials from ( select distinct annotator_initials as initials from deposition ) as d " +
+                                    "left join da_users as u on u.initials = d.initials and u.active = 0 " +
+                                    "where u.initials is null and d.initials != '' and d.initials not in ( 'UNKNOWN', 'UNASSIGN' )",
                    }
     #
     __comm_items = ['sender', 'receiver', 'dep_set_id', 'wf_class_id', 'wf_inst_id', 'wf_class_file', 'command', 'status', 'actual_timestamp',
                     'parent_dep_set_id', 'parent_wf_class_id', 'parent_wf_inst_id', 'data_version']
+    # reference data cache categories depending on da_users / da_group
+    __userCategories = ('active_anno', 'ann_user', 'user_initial', 'retired_anno')
+    __siteCategories = ('sites', 'site_group', 'active_anno', 'ann_user', 'user_initial', 'retired_anno')
     """
     """
     def __init__(self, siteId=None, verbose=False, log=sys.stderr):
@@ -123,6 +151,34 @@ class StatusDbApi(object):
         self.__dbApi = DbApiUtil(dbServer=self.__dbServer, dbHost=self.__dbHost, dbName=self.__dbName, dbUser=self.__dbUser, dbPw=self.__dbPw,
                                  dbSocket=self.__dbSocket, dbPort=self.__dbPort, verbose=self.__verbose, log=self.__lfh)
         self.__dbApi.setSchemaMap(self.__schemaMap)
+        #
+        self.__cache = getReferenceDataCache()
+        self.__cacheScope = (self.__dbHost, self.__dbPort, self.__dbSocket, self.__dbName)
+
+    def __getCached(self, category, args, loader):
+        return self.__cache.get(self.__cacheScope, category, args, loader)
+
+    def warmUpReferenceCache(self):
+        """ Pre-load sites, site groups and annotator lists once per process
+        """
+        if self.__cache.isWarm(self.__cacheScope):
+            return
+        #
+        self.getActiveAnnoList()
+        sites = self.getSites()
+        if sites:
+            for site in sorted(set([s['site'] for s in sites if s['site']])):
+                self.getSiteGroup(site)
+                self.getAnnUser(site)
+            #
+        #
+        self.__cache.setWarm(self.__cacheScope)
+
+    def invalidateReferenceCache(self, categories=None):
+        self.__cache.invalidate(scope=self.__cacheScope, categories=categories)
+
+    def getReferenceCacheStats(self):
+        return self.__cache.getStats()
 
     def __getDataDir(self, key, parameter, idx):
         dlist = self.__dbApi.selectData(key=key, parameter=parameter)
@@ -144,7 +200,7 @@ class StatusDbApi(object):
         return self.__getDataDir("SELECT_USER", (username), 0)
 
     def getActiveAnnoList(self):
-        return self.__dbApi.selectData(key="SELECT_ACTIVE_USER", parameter=())
+        return self.__getCached("active_anno", (), lambda: self.__dbApi.selectData(key="SELECT_ACTIVE_USER", parameter=()))
 
     def getUserByEmail(self, email=None):
         if not email:
@@ -156,14 +212,14 @@ class StatusDbApi(object):
         if not initial:
             return None
         #
-        return self.__getDataDir("SELECT_USER_INITIAL", (initial), 0)
+        return self.__getCached("user_initial", (initial,), lambda: self.__getDataDir("SELECT_USER_INITIAL", (initial), 0))
 
     def updateUser(self, password=None, email=None, first_name=None, last_name=None, user_name=None):
         if not password or not email or not first_name or not last_name or not user_name:
             return 'Update user information failed.'
         #
-        sql = self.__schemaMap['UPDATE_USER'] % (password, email, first_name, last_name, user_name)
-        ret = self.__dbApi.runUpdateSQL(sql)
+        ret = self.__dbApi.runUpdateSQLwithKey(key="UPDATE_USER", parameter=(password, email, first_name, last_name, user_name))
+        self.invalidateReferenceCache(self.__userCategories)
         if ret != 'OK':
             return 'Update user information failed.'
         else:
@@ -174,7 +230,7 @@ class StatusDbApi(object):
         if not site:
             return None
         #
-        return self.__dbApi.selectData(key="SELECT_SITE_ANN", parameter=('ANN', site))
+        return self.__getCached("ann_user", (site,), lambda: self.__dbApi.selectData(key="SELECT_SITE_ANN", parameter=('ANN', site)))
 
     def getAnnLeader(self, site=None):
         if not site:
@@ -190,13 +246,13 @@ class StatusDbApi(object):
 
     def getSites(self):
         """Returns list of sites in WFM user table"""
-        return self.__dbApi.selectData(key="SELECT_SITES", parameter=())
+        return self.__getCached("sites", (), lambda: self.__dbApi.selectData(key="SELECT_SITES", parameter=()))
 
     def getSiteGroup(self, site=None):
         if not site:
             return None
         #
-        return self.__dbApi.selectData(key="SELECT_SITE_GROUP", parameter=(site))
+        return self.__getCached("site_group", (site,), lambda: self.__dbApi.selectData(key="SELECT_SITE_GROUP", parameter=(site)))
 
     def getSiteGroupWithCode(self, site=None, code=None):
         if not site or not code:
@@ -231,8 +287,14 @@ class StatusDbApi(object):
         #
         return self.__getDataDir("SELECT_LAST_INSTANCE", (depositionid), 0)
 
-    def runSelectSQL(self, sql):
-        return self.__dbApi.runSelectSQL(sql)
+    def runSelectSQL(self, sql, key=None, strict=False):
+        return self.__dbApi.runSelectSQL(sql, key=key, strict=strict)
+
+    def iterSelectSQL(self, sql, fetchSize=None, key=None):
+        return self.__dbApi.iterSelectSQL(sql, fetchSize=fetchSize, key=key)
+
+    def getQueryStats(self):
+        return self.__dbApi.getQueryStats()
 
     def killWorkFlow(self, depositionid=None):
         if not depositionid:
@@ -277,7 +339,7 @@ class StatusDbApi(object):
         if not classID:
             return None
         #
-        return self.__getDataDir("GET_CLASS_BY_ID", (classID), 0)
+        return self.__getCached("wf_class", (classID,), lambda: self.__getDataDir("GET_CLASS_BY_ID", (classID), 0))
 
     def getSimpleEntryInfo(self, depositionids=None):
         return self.__getSelectionResult(depositionids, 'GET_ENTRY_INFO')
@@ -317,22 +379,68 @@ class StatusDbApi(object):
         sql = 'insert into remind_message_track ( ' + ', '.join(key) + ' ) values ( ' + ', '.join(values) + ' ) '
         self.__dbApi.runUpdateSQL(sql)
 
-    def updateAnnotatorAssignment(self, assignList=None):
-        """
+    def updateAnnotatorAssignment(self, assignList=None, chunkSize=500):
+        """ Set annotator_initials of deposition and dep_last_instance for a list of [ dep_set_id, initials ] pairs.
+            Both tables are updated with one "case" update per chunk of entries inside a single transaction, so they
+            can not end up out of step. Returns { dep_set_id : outcome } where outcome is one of 'OK', 'not found',
+            'not found in dep_last_instance', 'invalid' or 'failed'.
         """
+        outcomeMap = {}
         if not assignList:
-            return
+            return outcomeMap
         #
+        # later pairs for the same entry win, as with the former one-by-one updates
+        assignMap = {}
         for alist in assignList:
-            sql = self.__schemaMap['UPDATE_ANN_DEPOSITION'] % (alist[1], alist[0])
-            _ret = self.__dbApi.runUpdateSQL(sql)  # noqa: F841
-            # if rows < 1:
-            #   catch error
-            sql = self.__schemaMap['UPDATE_ANN_LAST_INST'] % (alist[1], alist[0])
-            _ret = self.__dbApi.runUpdateSQL(sql)  # noqa: F841
-            # if rows < 1:
-            #   catch error
+            if (len(alist) != 2) or (not alist[0]) or (not alist[1]):
+                outcomeMap[':'.join(alist)] = 'invalid'
+                continue
+            #
+            assignMap[alist[0]] = alist[1]
+        #
+        depIdList = sorted(assignMap.keys())
+        if not depIdList:
+            return outcomeMap
+        #
+        foundMap = {'deposition': set(), 'dep_last_instance': set()}
+        try:
+            with self.__dbApi.transaction() as curs:
+                for i in range(0, len(depIdList), chunkSize):
+                    chunk = depIdList[i:i + chunkSize]
+                    inClause = '( ' + ', '.join(['%s'] * len(chunk)) + ' )'
+                    caseClause = 'case dep_set_id ' + ' '.join(['when %s then %s'] * len(chunk)) + ' end'
+                    caseArgs = []
+                    for depId in chunk:
+                        caseArgs.extend([depId, assignMap[depId]])
+                    #
+                    for table in ('deposition', 'dep_last_instance'):
+                        curs.execute('select dep_set_id from ' + table + ' where dep_set_id in ' + inClause + ' for update', tuple(chunk))
+                        for row in curs.fetchall():
+                            foundMap[table].add(row[0])
+                        #
+                        curs.execute('update ' + table + ' set annotator_initials = ' + caseClause + ' where dep_set_id in ' + inClause,
+                                     tuple(caseArgs + chunk))
+                    #
+                #
+            #
+        except MySQLdb.Error as e:
+            self.__lfh.write("+StatusDbApi.updateAnnotatorAssignment() database error %d: %s\n" % (e.args[0], e.args[1]))
+            for depId in depIdList:
+                outcomeMap[depId] = 'failed'
+            #
+            return outcomeMap
+        #
+        for depId in depIdList:
+            if depId not in foundMap['deposition']:
+                outcomeMap[depId] = 'not found'
+            elif depId not in foundMap['dep_last_instance']:
+                outcomeMap[depId] = 'not found in dep_last_instance'
+            else:
+                outcomeMap[depId] = 'OK'
+            #
         #
+        self.invalidateReferenceCache(('retired_anno',))
+        return outcomeMap
 
     def getLastWFInstance(self, depositionid=None, classid=None):
         if not depositionid or not classid:
@@ -340,6 +448,48 @@ class StatusDbApi(object):
         #
         return self.__getDataDir("SELECT_WF_LAST_INSTANCE", (depositionid, classid), -1)
 
+    def getLastWFInstances(self, depositionid=None, classids=None):
+        """ Return { classid : latest wf_instance row } for all classids of depositionid with one query
+        """
+        if not depositionid or not classids:
+            return {}
+        #
+        classIdList = sorted(set(classids))
+        rows = self.__dbApi.selectData(key="SELECT_WF_LAST_INSTANCES", parameter=(depositionid, classIdList))
+        # rows come newest first, keep the first one of each class (class IDs compare case-insensitively in the database)
+        latestMap = {}
+        if rows:
+            for row in rows:
+                if ('wf_class_id' not in row) or (not row['wf_class_id']):
+                    continue
+                #
+                classKey = str(row['wf_class_id']).upper()
+                if classKey not in latestMap:
+                    latestMap[classKey] = row
+                #
+            #
+        #
+        instanceMap = {}
+        for classid in classIdList:
+            if str(classid).upper() in latestMap:
+                instanceMap[classid] = latestMap[str(classid).upper()]
+            #
+        #
+        return instanceMap
+
+    def getChangedDepositionIds(self, timestamp=None):
+        """ Return the list of depositions with a workflow instance update after timestamp ( seconds since the epoch ),
+            None on failure
+        """
+        if timestamp is None:
+            return None
+        #
+        rows = self.__dbApi.selectData(key="SELECT_CHANGED_DEPOSITIONS", parameter=(timestamp,))
+        if rows is None:
+            return None
+        #
+        return [row['dep_set_id'] for row in rows if row['dep_set_id']]
+
     def getAllWFInstances(self, depositionid=None):
         if not depositionid:
             return None
@@ -373,7 +523,15 @@ class StatusDbApi(object):
         if not depositionid:
             return None
         #
-        return self.__dbApi.selectData(key="CONTACT_AUTHOR_PI", parameter=("', '".join(depositionid), 'principa'))
+        return self.__dbApi.selectDataInChunks(key="CONTACT_AUTHOR_PI", idList=depositionid, parameter=('principa',))
+
+    def ContactAuthorPIOrValid(self, depositionids=None):
+        """ Return the 'principa' and 'valid' contact author rows of all depositionids in one (chunked) query
+        """
+        if not depositionids:
+            return None
+        #
+        return self.__dbApi.selectDataInChunks(key="CONTACT_AUTHOR_PI_OR_VALID", idList=depositionids)
 
     def ValidContactAuthor(self, depositionid=None):
         if not depositionid:
@@ -457,7 +615,22 @@ class StatusDbApi(object):
         #
 
     def runUpdate(self, table=None, where=None, data=None):
-        return self.__dbApi.runUpdate(table=table, where=where, data=data)
+        ret = self.__dbApi.runUpdate(table=table, where=where, data=data)
+        if table == 'da_users':
+            self.invalidateReferenceCache(self.__userCategories)
+        elif table == 'da_group':
+            self.invalidateReferenceCache(self.__siteCategories)
+        #
+        return ret
+
+    def runBulkUpsert(self, table=None, key_columns=None, rows=None):
+        ret = self.__dbApi.runBulkUpsert(table=table, key_columns=key_columns, rows=rows)
+        if table == 'da_users':
+            self.invalidateReferenceCache(self.__userCategories)
+        elif table == 'da_group':
+            self.invalidateReferenceCache(self.__siteCategories)
+        #
+        return ret
 
     def isTableExist(self, table=None):
         if not table:
@@ -505,10 +678,7 @@ class StatusDbApi(object):
         if not depositionids:
             return None
         #
-        ids = "', '".join(depositionids)
-        sql = self.__schemaMap[schema_key] % (ids)
-        #
-        return self.__dbApi.runSelectSQL(sql)
+        return self.__dbApi.selectDataInChunks(key=schema_key, idList=depositionids)
 
     def getDistinctAnnotatorInitials(self):
         aiList = []
@@ -531,16 +701,20 @@ class StatusDbApi(object):
         return aaiList
 
     def getRetiredAnnotatorInitials(self):
-        rtList = []
-        distinctList = self.getDistinctAnnotatorInitials()
-        activeList = self.getActiveAnnotatorInitials()
-        for ai in distinctList:
-            if (ai == 'UNKNOWN') or (ai == 'UNASSIGN') or (ai in activeList):
-                continue
-            #
-            rtList.append(ai)
+        """ Upper case annotator initials of deposition without an active da_users account ( UNKNOWN and UNASSIGN excluded ).
+            The list is cached and dropped on da_users / da_group updates and annotator re-assignments.
+        """
+        return self.__getCached("retired_anno", (), self.__selectRetiredAnnotatorInitials)
+
+    def __selectRetiredAnnotatorInitials(self):
+        """ Initials are compared as they are stored, the case-insensitive collation matches 'ab' and 'AB' and lets the
+            index on the columns be used. The case of the distinct values is not defined, they are upper-cased here.
+        """
+        rows = self.__dbApi.selectData(key="SELECT_RETIRED_ANNOTATOR", parameter=())
+        if rows is None:
+            return None
         #
-        return rtList
+        return sorted(set([row['initials'].upper() for row in rows if row['initials']]))
 
     def getEntryIdListFromInputIdString(self, entry_id_string):
         group_ids = []
@@ -629,7 +803,8 @@ class StatusDbApi(object):
         if not id_type_map:
             return '', []
         #
-        parameter = ''
+        # one "<id_type> in ( ... )" selection per ID type, so that each can use the index of its column
+        parameterList = []
         input_id_list = []
         id_type_list = []
         for id_type in ('dep_set_id', 'pdb_id', 'bmrb_id', 'emdb_id'):
@@ -639,15 +814,13 @@ class StatusDbApi(object):
             id_type_map[id_type] = sorted(set(id_type_map[id_type]))
             input_id_list.extend(id_type_map[id_type])
             id_type_list.append(id_type)
-            if parameter:
-                parameter += " or "
-            #
-            parameter += " " + id_type + " in ( '" + "', '".join(id_type_map[id_type]) + "' ) "
+            parameterList.append((id_type, id_type_map[id_type]))
         #
-        if not parameter:
+        if not parameterList:
             return '', []
         #
-        return self.__processGetEntryListResult(self.__dbApi.selectData(key='GET_ENTRY_LIST', parameter=(parameter)), input_id_list, id_type_list)
+        return self.__processGetEntryListResult(self.__dbApi.selectDataUnionAll(key='GET_ENTRY_LIST_BY_ID', parameterList=parameterList),
+                                                input_id_list, id_type_list)
 
     def __processGetEntryListResult(self, return_list, input_id_list, id_type_list):
         return_id_list = []
@@ -692,6 +865,7 @@ class StatusDbApi(object):
             if ret != 'OK':
                 status = ret
 
+        self.invalidateReferenceCache(self.__siteCategories)
         return status
 
     def addSite(self, site, lead, email, first, last):  # pylint: disable=unused-argument
@@ -728,6 +902,7 @@ class StatusDbApi(object):
         if ret != 'OK':
             status = ret
 
+        self.invalidateReferenceCache(self.__siteCategories)
         return status
 
 
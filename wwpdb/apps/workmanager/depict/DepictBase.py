@@ -4,6 +4,8 @@
 #
 # Updates:
 #  09-Dec-2024  zf   add _getPdbExtIdMap() method and 'ext_pdb_id'
+#  18-Oct-2026  zf   read template files through the process-wide TemplateCache
+#  18-Oct-2026  zf   compile the page_template_parameter lists into getters once per page
 #
 ##
 """
@@ -35,6 +37,7 @@ from wwpdb.utils.config.ConfigInfo import ConfigInfo
 from wwpdb.apps.workmanager.db_access.ContentDbApi import ContentDbApi
 from wwpdb.apps.workmanager.db_access.StatsUtil import StatsUtil
 from wwpdb.apps.workmanager.db_access.StatusDbApi import StatusDbApi
+from wwpdb.apps.workmanager.depict.TemplateCache import getTemplateCache
 
 
 class DepictBase(object):
@@ -57,6 +60,8 @@ class DepictBase(object):
         self._uInfoFlag = False
         self._statusDB = statusDB
         self._contentDB = None
+        # ( page_id, alias_page_id, id( paraList ) ) -> ( paraList, [ ( variable, getter ) ] ), see __getParameterPlan()
+        self.__parameterPlanMap = {}
         self.__getUrlMap()
 
     def getPageText(self, page_id='', paraD=None):
@@ -365,62 +370,84 @@ class DepictBase(object):
         if not paraList:
             return myD
         #
-        for paraMap in paraList:
-            myD[paraMap['variable']] = ''
-            if paraMap['type'] == 'page_template':
-                myD[paraMap['variable']] = self.getPageText(page_id=paraMap['value'])
-            elif paraMap['type'] == 'function':
-                myD[paraMap['variable']] = self.__callFunc(alias_page_id, paraMap['variable'], paraMap['value'], myD)
-            elif paraMap['type'] == 'sessionInfo':
-                myD[paraMap['variable']] = self._reqObj.getValue(paraMap['value'])
-            elif paraMap['type'] == 'userInfo':
-                myD[paraMap['variable']] = self._getUserInfo(paraMap['value'])
-            elif paraMap['type'] == 'dataInfo':
-                if (page_id in self._dataInfo) and self._dataInfo[page_id]:
-                    if paraMap['value'] in self._dataInfo[page_id][0]:
-                        myD[paraMap['variable']] = self._dataInfo[page_id][0][paraMap['value']]
-                    #
-                elif ('data_for_all' in self._dataInfo) and self._dataInfo['data_for_all']:
-                    if paraMap['value'] in self._dataInfo['data_for_all'][0]:
-                        myD[paraMap['variable']] = self._dataInfo['data_for_all'][0][paraMap['value']]
-                    #
-                #
-            elif paraMap['type'] == 'constant':
-                myD[paraMap['variable']] = paraMap['value']
-            #
+        for variable, getter in self.__getParameterPlan(page_id, alias_page_id, paraList):
+            myD[variable] = getter()
         #
         return myD
 
-    def __callFunc(self, page_id, variable, funcDef, myD):
+    def __getParameterPlan(self, page_id, alias_page_id, paraList):
+        """ Returns [ ( variable, getter ) ] for paraList, compiled once per page. getter() returns the current
+            value of the parameter.
+        """
+        key = (page_id, alias_page_id, id(paraList))
+        entry = self.__parameterPlanMap.get(key)
+        if (entry is None) or (entry[0] is not paraList):
+            entry = (paraList, [(paraMap['variable'], self.__getParameterGetter(page_id, alias_page_id, paraMap)) for paraMap in paraList])
+            self.__parameterPlanMap[key] = entry
+        #
+        return entry[1]
+
+    def __getParameterGetter(self, page_id, alias_page_id, paraMap):
         """
         """
-        val = ''
+        value = paraMap.get('value')
+        if paraMap['type'] == 'page_template':
+            return lambda: self.getPageText(page_id=value)
+        elif paraMap['type'] == 'function':
+            return self.__getFuncCaller(alias_page_id, paraMap['variable'], value)
+        elif paraMap['type'] == 'sessionInfo':
+            return lambda: self._reqObj.getValue(value)
+        elif paraMap['type'] == 'userInfo':
+            return lambda: self._getUserInfo(value)
+        elif paraMap['type'] == 'dataInfo':
+            return lambda: self.__getDataInfoValue(page_id, value)
+        elif paraMap['type'] == 'constant':
+            return lambda: value
+        #
+        return lambda: ''
+
+    def __getDataInfoValue(self, page_id, item):
+        """
+        """
+        if (page_id in self._dataInfo) and self._dataInfo[page_id]:
+            if item in self._dataInfo[page_id][0]:
+                return self._dataInfo[page_id][0][item]
+            #
+        elif ('data_for_all' in self._dataInfo) and self._dataInfo['data_for_all']:
+            if item in self._dataInfo['data_for_all'][0]:
+                return self._dataInfo['data_for_all'][0][item]
+            #
+        #
+        return ''
+
+    def __getFuncCaller(self, page_id, variable, funcDef):
+        """ Returns a callable running funcDef ( "self,method" or "<binding class>,method" ) with its function_parameter values
+        """
         funcDef = funcDef.replace(' ', '')
-        paraD = self.__getFuncParameter(page_id, variable, myD)
+        paraD = self.__getFuncParameter(page_id, variable)
         if not paraD:
-            paraD = self.__getFuncParameter(page_id, funcDef, myD)
+            paraD = self.__getFuncParameter(page_id, funcDef)
         #
         if not paraD:
-            paraD = self.__getFuncParameter(variable, funcDef, myD)
+            paraD = self.__getFuncParameter(variable, funcDef)
         #
         spList = funcDef.split(',')
         #
         if spList[0] == "self":
-            if paraD:
-                val = getattr(self, "%s" % spList[1])(**paraD)
-            else:
-                val = getattr(self, "%s" % spList[1])()
-            #
-        elif spList[0] in self._UtilClass:
-            if paraD:
-                val = getattr(self._UtilClass[spList[0]], "%s" % spList[1])(**paraD)
-            else:
-                val = getattr(self._UtilClass[spList[0]], "%s" % spList[1])()
-            #
+            method = getattr(self, "%s" % spList[1])
+            return lambda: method(**paraD)
         #
-        return val
 
-    def __getFuncParameter(self, page_id, funcDef, myD):  # pylint: disable=unused-argument
+        def callUtilClass():
+            # binding classes are created on demand, look them up at call time
+            if spList[0] in self._UtilClass:
+                return getattr(self._UtilClass[spList[0]], "%s" % spList[1])(**paraD)
+            #
+            return ''
+
+        return callUtilClass
+
+    def __getFuncParameter(self, page_id, funcDef):
         """
         """
         paraD = {}
@@ -441,11 +468,7 @@ class DepictBase(object):
     def __readTemplate(self, template_file):
         """
         """
-        fPath = os.path.join(self._topPath, template_file)
-        ifh = open(fPath, 'r')
-        sIn = ifh.read()
-        ifh.close()
-        return sIn
+        return getTemplateCache().get(os.path.join(self._topPath, template_file)).getText()
 
     def __writeDirValue(self, obj, delimiter, stringFlag):
         """
@@ -4,6 +4,18 @@
 #
 # Updates:
 #  09-Dec-2024  zf   call _getPdbExtIdMap() method to get 'ext_pdb_id'
+#  18-Oct-2026  zf   pass ID lists to the chunked enrichment lookups
+#  18-Oct-2026  zf   stream table rows in batches through iterSelectSQL() unless a sort function needs all rows
+#  18-Oct-2026  zf   report table queries in the query statistics under their sql_selection_definition id
+#  18-Oct-2026  zf   run the enrichment lookups of each batch concurrently through ConcurrentQueryExecutor
+#  18-Oct-2026  zf   __getPIInfo() resolves the status DB PI / valid contact author fallback with one query
+#  18-Oct-2026  zf   submit_group: read the entry info of all group members in one chunked pass
+#  18-Oct-2026  zf   render rows through a per-table column plan, look up abbrv_method in a map
+#  18-Oct-2026  zf   write the table contents through TableStore.dumpTableFile()
+#  18-Oct-2026  zf   delta refresh: patch the stored table with the rows of the depositions changed since the last refresh
+#  18-Oct-2026  zf   a table refresh holds at most maxLookupWorkers pooled connections, the open stream included
+#  18-Oct-2026  zf   delta refresh: a failed query of the changed depositions falls back to a full refresh
+#  18-Oct-2026  zf   a failed stream is read again in one query, a failed table query keeps the previous table file
 #
 ##
 """
@@ -24,14 +36,78 @@ __license__ = "Creative Commons Attribution 3.0 Unported"
 __version__ = "V0.07"
 
 
+import os
+import re
 import sys
+import time
+from functools import cmp_to_key
+import MySQLdb
 try:
     from urllib.parse import quote as u_quote
 except ImportError:
     from urllib import quote as u_quote
 
+from wwpdb.apps.workmanager.db_access.ConcurrentQueryExecutor import ConcurrentQueryExecutor
 from wwpdb.apps.workmanager.depict.DepictBase import DepictBase, processPublicIDs
 from wwpdb.apps.workmanager.depict.ReadConFigFile import dumpPickleFile, loadPickleFile
+from wwpdb.apps.workmanager.depict.TableStore import dumpTableFile, loadTableFile
+
+try:
+    _textTypes = (basestring,)  # noqa: F821 pylint: disable=undefined-variable
+except NameError:
+    _textTypes = (str,)
+#
+# ORDER BY clause made of plain columns at the end of a table query, see DepictContent.__getDeltaOrderBy()
+_orderByPattern = re.compile(r"\sorder\s+by\s+([\w.]+(?:\s+(?:asc|desc))?(?:\s*,\s*[\w.]+(?:\s+(?:asc|desc))?)*)\s*;?\s*$", re.IGNORECASE)
+_limitPattern = re.compile(r"\blimit\b", re.IGNORECASE)
+_depIdPattern = re.compile(r"^\w+$")
+
+# upper case _exptl.method -> abbrv_method, other methods are shown as they are
+_abbrvMethodMap = {
+    'X-RAY DIFFRACTION': 'X-RAY',
+    'NEUTRON DIFFRACTION': 'NEUTRON',
+    'FIBER DIFFRACTION': 'FIBER',
+    'FIBRE DIFFRACTION': 'FIBER',
+    'CRYO-ELECTRON MICROSCOPY': 'EM',
+    'ELECTRON MICROSCOPY': 'EM',
+    'ELECTRON TOMOGRAPHY': 'EM',
+    'ELECTRON CRYSTALLOGRAPHY': 'EL. CRYS.',
+    'SOLUTION NMR': 'NMR',
+    'SOLID-STATE NMR': 'SS NMR',
+    'SOLID STATE NMR': 'SS NMR',
+}
+
+
+def _compareValues(a, b):
+    """ Compare two column values the way MySQL orders them: NULL first, text ignoring case and trailing blanks
+    """
+    if (a is None) or (b is None):
+        return (a is not None) - (b is not None)
+    #
+    if isinstance(a, _textTypes) and isinstance(b, _textTypes):
+        a = a.lower().rstrip()
+        b = b.lower().rstrip()
+    else:
+        try:
+            return (a > b) - (a < b)
+        except TypeError:
+            a = str(a)
+            b = str(b)
+        #
+    #
+    return (a > b) - (a < b)
+
+
+def _compareSortKeys(keyA, keyB, orderByList):
+    """ Compare the ORDER BY values of two rows, orderByList is [ ( column, descending ) ]
+    """
+    for valueA, valueB, (_column, descending) in zip(keyA, keyB, orderByList):
+        result = _compareValues(valueA, valueB)
+        if result:
+            return -result if descending else result
+        #
+    #
+    return 0
 
 
 class DepictContent(DepictBase):
@@ -55,22 +131,34 @@ class DepictContent(DepictBase):
         self.__sObj = self._reqObj.newSessionObj()
         self.__sessionId = self.__sObj.getId()
         self.__sessionPath = self.__sObj.getPath()
+        # number of rows streamed and enriched together
+        self.__batchSize = 2000
+        # pooled connections a table refresh holds at most: the enrichment lookups run at the same time hold one
+        # each, while rows are streamed the open table query holds one of them
+        self.__maxLookupWorkers = 4
+        # table pkl -> column plan, see __getRowPlan()
+        self.__rowPlanMap = {}
+        # delta refresh: tables are refreshed in full at least that often ( seconds ), changes are re-read with that
+        # overlap for clock skew and more changed depositions than deltaMaxEntries trigger a full refresh
+        self.__deltaFullRefreshInterval = 300
+        self.__deltaOverlap = 60
+        self.__deltaMaxEntries = 1000
 
-    def depictTableContent(self, index):
-        """
+    def depictTableContent(self, index, delta=False):
+        """ delta: only re-read the depositions changed since the last refresh where the table allows it
         """
         self.__returnMap = {}
         tableContentMap = loadPickleFile(self.__sessionPath, 'TableContentMap.pkl')
         if index == 'all':
             for tableMap in tableContentMap.values():
-                self._depictTableContent(tableMap)
+                self._depictTableContent(tableMap, delta=delta)
             #
         elif index in tableContentMap:
-            self._depictTableContent(tableContentMap[index])
+            self._depictTableContent(tableContentMap[index], delta=delta)
         #
         return self.__returnMap
 
-    def _depictTableContent(self, tableMap):
+    def _depictTableContent(self, tableMap, delta=False):
         """
         """
         if (not tableMap) or ('pkl' not in tableMap):
@@ -84,223 +172,482 @@ class DepictContent(DepictBase):
             else:
                 _columnDef, contentResults = getattr(self, '%s' % tableMap['binding_function'])()
             #
-            dumpPickleFile(self.__sessionPath, tableMap['pkl'], contentResults)
+            dumpTableFile(self.__sessionPath, tableMap['pkl'], contentResults)
             return
         #
         if ('sql' not in tableMap) or ('data-field' not in tableMap):
             return
         #
+        if delta and self.__refreshTableDelta(tableMap):
+            return
+        #
+        startTime = time.time()
+        orderByList = self.__getDeltaOrderBy(tableMap)
+        rowState = [] if orderByList is not None else None
         count_map = self.__initializeStatusCount(tableMap)
         contentResults = []
-        rows = self._statusDB.runSelectSQL(tableMap['sql'])
-        if rows and ('sort_function' in tableMap):
-            rows = getattr(self, '%s' % tableMap['sort_function'])(rows)
-        #
-        if rows:
-            pdbExtIdMap = {}
-            if ('pdb_ids' in tableMap['data-field']) or ('user_pdb_id' in tableMap['data-field']):
-                pdbExtIdMap = self._getPdbExtIdMap(rows)
-            #
-            groupIdMap = {}
-            idList = self.__getEntryIDList(rows, 'D_')
-            if idList:
-                return_list = self._statusDB.getGroupIds(depositionids=idList)
-                if return_list:
-                    for rD in return_list:
-                        if ('group_id' in rD) and rD['group_id'] and ('dep_set_id' in rD) and rD['dep_set_id']:
-                            groupIdMap[rD['dep_set_id']] = rD['group_id']
-                        #
-                    #
-                #
-                foundCombDateItem = False
-                for field_item in tableMap['data-field']:
-                    if field_item not in self.__dataFieldMap:
-                        continue
-                    #
-                    value = self.__dataFieldMap[field_item]['value']
-                    if value == 'deposition_release_dates':
-                        foundCombDateItem = True
-                        break
-                    #
+        num_rows = 0
+        streamed = False
+        if self.__isStreamable(tableMap):
+            try:
+                for rows in self.__iterRowBatches(tableMap['sql'], self.__getQueryKey(tableMap)):
+                    rowState = self.__addRowState(tableMap, orderByList, rows, rowState)
+                    self.__processRows(tableMap, rows, num_rows, None, count_map, contentResults, workers=self.__maxLookupWorkers - 1)
+                    num_rows += len(rows)
                 #
-                if foundCombDateItem:
-                    self._connectContentDB()
-                    releaseDateMap = self._contentDB.getReleaseDate("', '".join(sorted(set(idList))))
-                    for dataD in rows:
-                        dataD['deposition_release_dates'] = ''
-                        if ('dep_set_id' not in dataD) or (not dataD['dep_set_id']):
-                            continue
-                        #
-                        if ('dep_initial_deposition_date' in dataD) and dataD['dep_initial_deposition_date']:
-                            dataD['deposition_release_dates'] = str(dataD['dep_initial_deposition_date']) + ' /<br /> '
-                            if (dataD['dep_set_id'] in releaseDateMap) and releaseDateMap[dataD['dep_set_id']]:
-                                dataD['deposition_release_dates'] += releaseDateMap[dataD['dep_set_id']]
-                            else:
-                                dataD['deposition_release_dates'] += 'n.a.'
-                            #
-                        elif (dataD['dep_set_id'] in releaseDateMap) and releaseDateMap[dataD['dep_set_id']]:
-                            dataD['deposition_release_dates'] = 'n.a. /<br /> ' + releaseDateMap[dataD['dep_set_id']]
-                        #
+                streamed = True
+            except MySQLdb.Error as e:
+                # the rows read so far are not the table, start over with one query
+                self._lfh.write("+DepictContent._depictTableContent() streaming %s failed, reading it in one query: %s\n" % (tableMap['pkl'], str(e)))
+                rowState = [] if orderByList is not None else None
+                count_map = self.__initializeStatusCount(tableMap)
+                contentResults = []
+                num_rows = 0
+            #
+        #
+        if not streamed:
+            rows = self._statusDB.runSelectSQL(tableMap['sql'], key=self.__getQueryKey(tableMap), strict=True)
+            if rows is None:
+                # a failed query is not an empty table: keep the table of the last refresh
+                self._lfh.write("+DepictContent._depictTableContent() query of %s failed, table not refreshed\n" % tableMap['pkl'])
+                return
+            #
+            if rows and ('sort_function' in tableMap):
+                rows = getattr(self, '%s' % tableMap['sort_function'])(rows)
+            #
+            if rows:
+                num_rows = len(rows)
+                rowState = self.__addRowState(tableMap, orderByList, rows, rowState)
+                self.__processRows(tableMap, rows, 0, num_rows, count_map, contentResults)
+            #
+        #
+        dumpTableFile(self.__sessionPath, tableMap['pkl'], contentResults)
+        self.__saveDeltaState(tableMap, orderByList, rowState, startTime)
+        self.__addEntryCounts(tableMap, num_rows, count_map)
+
+    def __addEntryCounts(self, tableMap, num_rows, count_map):
+        """
+        """
+        if 'entry_count' in tableMap:
+            for t_type, ilist in tableMap['entry_count'].items():
+                for item in ilist:
+                    count = 0
+                    if item == 'num_entries':
+                        count = num_rows
+                    elif item in count_map:
+                        count = count_map[item]
                     #
+                    self.__returnMap[t_type + '_' + item + '_' + tableMap['tab_count_id']] = count
                 #
             #
-            annSelectMap = {}
-            reminderSentMap = {}
-            PIInfoMap = {}
-            # if ('add_list' in tableMap['data-field']) or ('major_issue' in tableMap['data-field']) or \
-            #        ('pi_name' in tableMap['data-field']) or ('country' in tableMap['data-field']) or \
-            #        ('pi_name_only' in tableMap['data-field']) or ('pi_country_only' in tableMap['data-field']):
-
-            if (  # pylint: disable=using-constant-test
-                    x for x in tableMap['data-field'] if x in ('add_list',
-                                                               'major_issue',
-                                                               'pi_name',
-                                                               'country',
-                                                               'pi_name_only',
-                                                               'pi_country_only',
-                                                               'received_date')
-            ):
-                if idList and ('add_list' in tableMap['data-field']):
-                    return_list = self._statusDB.getAnnoSelection(depositionids=idList)
-                    annSelectMap = self.__convertListIntoMap(return_list)
-                #
-                if idList and (x for x in tableMap['data-field'] if x in ('major_issue',
-                                                                          'received_date')
-                               ):
-                    return_list = self._statusDB.getRemindMessageTrack(depositionids=idList)
-                    reminderSentMap = self.__convertListIntoMap(return_list)
-                #
-                if idList and (x for x in tableMap['data-field'] if x in ('pi_name',
-                                                                          'country',
-                                                                          'pi_name_only',
-                                                                          'pi_country_only')
-                               ):
-                    PIInfoMap = self.__getPIInfo(idList)
-                #
+        #
+
+    def __getDeltaStateFile(self, tableMap):
+        """
+        """
+        return os.path.splitext(tableMap['pkl'])[0] + '_delta.pkl'
+
+    def __getDeltaOrderBy(self, tableMap):
+        """ Returns the [ ( column, descending ) ] of the ORDER BY clause of the table query, None if the rows of
+            the changed depositions can not be merged into the stored table: no ORDER BY made of plain columns,
+            a LIMIT, a sort function or a 'default_order' column which is not rendered from the row position
+        """
+        if ('sort_function' in tableMap) or _limitPattern.search(tableMap['sql']):
+            return None
+        #
+        if ('default_order' in tableMap['data-field']) and ('default_order' in self.__dataFieldMap) and \
+           ((self.__dataFieldMap['default_order']['type'] != 'dataInfo') or (self.__dataFieldMap['default_order']['value'] != 'default_order')):
+            return None
+        #
+        match = _orderByPattern.search(tableMap['sql'])
+        if not match:
+            return None
+        #
+        orderByList = []
+        for item in match.group(1).split(','):
+            tokens = item.split()
+            orderByList.append((tokens[0].split('.')[-1], (len(tokens) > 1) and (tokens[1].lower() == 'desc')))
+        #
+        return orderByList
+
+    def __getDeltaSql(self, tableMap, idList):
+        """ The table query restricted to the depositions of idList
+        """
+        sql = tableMap['sql'][:_orderByPattern.search(tableMap['sql']).start()]
+        return "select * from ( " + sql + " ) as delta_table where delta_table.dep_set_id in ( '" + "', '".join(sorted(idList)) + "' )"
+
+    def __addRowState(self, tableMap, orderByList, rows, rowState):
+        """ Append ( dep_set_id, ORDER BY values, order_condition rank, dep_status_code ) of the raw rows to rowState.
+            Returns None if rowState is None or the rows do not hold all ORDER BY columns.
+        """
+        if rowState is None:
+            return None
+        #
+        order_condition = tableMap.get('order_condition', '')
+        for dataD in rows:
+            if ('dep_set_id' not in dataD) or [column for column, _descending in orderByList if column not in dataD]:
+                return None
             #
-            if 'assign_annotator' in tableMap['data-field']:
-                self.__assign_annotator_tmplt = self._getPageTemplate('assign_annotator_tmplt')
-                self.__AnnotatorSelection = self._getAnnotatorSelection()
+            rowState.append((dataD['dep_set_id'], tuple([dataD[column] for column, _descending in orderByList]),
+                             self.__getOrderRank(order_condition, dataD) if order_condition else 0,
+                             str(dataD['dep_status_code']) if ('dep_status_code' in dataD) and dataD['dep_status_code'] else ''))
+        #
+        return rowState
+
+    def __saveDeltaState(self, tableMap, orderByList, rowState, startTime):
+        """ Keep what a delta refresh needs to patch the table written by a full refresh started at startTime. The
+            restricted query is tried with the first entry when the table query is new, a table whose query can not
+            be restricted is always refreshed in full.
+        """
+        stateFile = self.__getDeltaStateFile(tableMap)
+        if rowState:
+            verified = False
+            previousState = loadPickleFile(self.__sessionPath, stateFile)
+            if previousState and (previousState['sql'] == tableMap['sql']):
+                verified = True
+            elif rowState[0][0] and _depIdPattern.match(rowState[0][0]):
+                rows = self._statusDB.runSelectSQL(self.__getDeltaSql(tableMap, [rowState[0][0]]), key=self.__getQueryKey(tableMap) + ':delta')
+                verified = bool(rows) and bool([dataD for dataD in rows if dataD.get('dep_set_id') == rowState[0][0]])
             #
-            order = 0
-            for dataD in rows:
-                dataD['display_ids'] = dataD['dep_set_id']
-                dataD['group_info'] = ''
-                if (dataD['dep_set_id'] in groupIdMap) and groupIdMap[dataD['dep_set_id']]:
-                    dataD['display_ids'] = dataD['dep_set_id'] + '/' + groupIdMap[dataD['dep_set_id']]
-                    dataD['group_info'] = '&group_id=' + groupIdMap[dataD['dep_set_id']]
-                #
-                if 'default_order' in tableMap['data-field']:
-                    order_condition = ''
-                    if 'order_condition' in tableMap:
-                        order_condition = tableMap['order_condition']
+            if verified:
+                dumpPickleFile(self.__sessionPath, stateFile, {'sql': tableMap['sql'], 'data-field': tableMap['data-field'], 'order_by': orderByList,
+                                                               'full_time': startTime, 'watermark': startTime, 'rows': rowState})
+                return
+            #
+        #
+        if os.access(os.path.join(self.__sessionPath, stateFile), os.F_OK):
+            os.remove(os.path.join(self.__sessionPath, stateFile))
+        #
+
+    def __refreshTableDelta(self, tableMap):
+        """ Patch the stored table with the rows of the depositions whose workflow status changed since the last
+            refresh: their rows are removed, re-read with the table query and merged back in ORDER BY order, so rows
+            which no longer match the query drop out. Returns False if the table has to be refreshed in full.
+        """
+        orderByList = self.__getDeltaOrderBy(tableMap)
+        state = loadPickleFile(self.__sessionPath, self.__getDeltaStateFile(tableMap))
+        if (orderByList is None) or (not state) or (state['sql'] != tableMap['sql']) or (state['data-field'] != tableMap['data-field']) or \
+           (state['order_by'] != orderByList) or ((time.time() - state['full_time']) > self.__deltaFullRefreshInterval):
+            return False
+        #
+        contentResults = loadTableFile(self.__sessionPath, tableMap['pkl'])
+        rowState = state['rows']
+        if (contentResults is None) or (len(contentResults) != len(rowState)):
+            return False
+        #
+        startTime = time.time()
+        idList = self._statusDB.getChangedDepositionIds(state['watermark'] - self.__deltaOverlap)
+        if idList is None:
+            return False
+        #
+        idSet = set(idList)
+        if (len(idSet) > self.__deltaMaxEntries) or [depId for depId in idSet if not _depIdPattern.match(depId)]:
+            return False
+        #
+        if idSet:
+            # strict: an SQL error must not be taken for depositions which no longer match the query
+            rows = self._statusDB.runSelectSQL(self.__getDeltaSql(tableMap, idSet), key=self.__getQueryKey(tableMap) + ':delta', strict=True)
+            if rows is None:
+                return False
+            #
+            rows = list(rows)
+            newState = self.__addRowState(tableMap, orderByList, rows, [])
+            if newState is None:
+                return False
+            #
+            newResults = []
+            if rows:
+                self.__processRows(tableMap, rows, 0, len(rows), {}, newResults)
+            #
+            keepList = [i for i, rState in enumerate(rowState) if rState[0] not in idSet]
+            rowState = [rowState[i] for i in keepList]
+            contentResults = [contentResults[i] for i in keepList]
+            for rState, resultD in sorted(zip(newState, newResults), key=cmp_to_key(lambda a, b: _compareSortKeys(a[0][1], b[0][1], orderByList))):
+                # after the rows with the same ORDER BY values
+                low = 0
+                high = len(rowState)
+                while low < high:
+                    middle = (low + high) // 2
+                    if _compareSortKeys(rState[1], rowState[middle][1], orderByList) < 0:
+                        high = middle
+                    else:
+                        low = middle + 1
                     #
-                    dataD['default_order'] = self.__getOrder(order, len(rows), order_condition, dataD)
                 #
-                if count_map and ('dep_status_code' in dataD) and dataD['dep_status_code']:
-                    status = str(dataD['dep_status_code'])
-                    if status:
-                        if status in count_map:
-                            count_map[status] += 1
-                        else:
-                            count_map[status] = 1
-                        #
-                    #
+                rowState.insert(low, rState)
+                contentResults.insert(low, resultD)
+            #
+            self.__updateDefaultOrder(tableMap, rowState, contentResults)
+            dumpTableFile(self.__sessionPath, tableMap['pkl'], contentResults)
+        #
+        state['rows'] = rowState
+        state['watermark'] = startTime
+        dumpPickleFile(self.__sessionPath, self.__getDeltaStateFile(tableMap), state)
+        #
+        count_map = self.__initializeStatusCount(tableMap)
+        if count_map:
+            for rState in rowState:
+                if rState[3]:
+                    count_map[rState[3]] = count_map.get(rState[3], 0) + 1
                 #
-                dataD['locklabel'] = self.__processLockLabelForCommunication(dataD)
-                if (dataD['dep_set_id'] in reminderSentMap) and reminderSentMap[dataD['dep_set_id']]:
-                    dataD.update(reminderSentMap[dataD['dep_set_id']])
+            #
+        #
+        self.__addEntryCounts(tableMap, len(rowState), count_map)
+        return True
+
+    def __updateDefaultOrder(self, tableMap, rowState, contentResults):
+        """ Re-render the 'default_order' column, it depends on the row position and the number of rows
+        """
+        if ('default_order' not in tableMap['data-field']) or ('default_order' not in self.__dataFieldMap):
+            return
+        #
+        num_rows = len(rowState)
+        order_condition = tableMap.get('order_condition', '')
+        for order, (rState, resultD) in enumerate(zip(rowState, contentResults)):
+            resultD['default_order'] = str(rState[2] * num_rows + order) if order_condition else str(order)
+        #
+
+    def __isStreamable(self, tableMap):
+        """ Rows can be processed batch by batch unless they are re-sorted in memory or their 'default_order'
+            depends on the total number of rows
+        """
+        if 'sort_function' in tableMap:
+            return False
+        #
+        if ('default_order' in tableMap['data-field']) and ('order_condition' in tableMap) and tableMap['order_condition']:
+            return False
+        #
+        return True
+
+    def __getQueryKey(self, tableMap):
+        """ Name of the table query in the query statistics: its sql_selection_definition id
+        """
+        if 'sql_selection_id' in tableMap:
+            return 'sql_selection:' + tableMap['sql_selection_id']
+        #
+        return 'table:' + tableMap.get('table_id', tableMap['pkl'])
+
+    def __iterRowBatches(self, sql, key=None):
+        """ Stream the rows of sql in lists of at most self.__batchSize rows. The query keeps one of the pool's stream
+            connections until the last batch is processed, the lookups of a batch have one connection less. Raises
+            MySQLdb.Error if the stream fails.
+        """
+        rows = []
+        for dataD in self._statusDB.iterSelectSQL(sql, fetchSize=self.__batchSize, key=key):
+            rows.append(dataD)
+            if len(rows) >= self.__batchSize:
+                yield rows
+                rows = []
+            #
+        #
+        if rows:
+            yield rows
+        #
+
+    def __processRows(self, tableMap, rows, order, num_rows, count_map, contentResults, workers=None):
+        """ Enrich and render one batch of rows. order is the position of the first row in the table,
+            num_rows the total number of rows (only used for 'order_condition'). workers is the number of
+            lookups run at the same time (default self.__maxLookupWorkers).
+        """
+        idList = self.__getEntryIDList(rows, 'D_')
+        foundCombDateItem = False
+        for field_item in tableMap['data-field']:
+            if field_item not in self.__dataFieldMap:
+                continue
+            #
+            value = self.__dataFieldMap[field_item]['value']
+            if value == 'deposition_release_dates':
+                foundCombDateItem = True
+                break
+            #
+        #
+        # The enrichment lookups are independent, they run concurrently and are joined before the row transforms
+        self._connectContentDB()
+        executor = ConcurrentQueryExecutor(maxWorkers=workers if workers else self.__maxLookupWorkers, log=self._lfh)
+        if ('pdb_ids' in tableMap['data-field']) or ('user_pdb_id' in tableMap['data-field']):
+            executor.submit('pdb_ext_id', self._getPdbExtIdMap, rows)
+        #
+        if idList:
+            executor.submit('group_id', self._statusDB.getGroupIds, depositionids=idList)
+            if foundCombDateItem:
+                executor.submit('release_date', self._contentDB.getReleaseDate, idList)
+            #
+        #
+        # if ('add_list' in tableMap['data-field']) or ('major_issue' in tableMap['data-field']) or \
+        #        ('pi_name' in tableMap['data-field']) or ('country' in tableMap['data-field']) or \
+        #        ('pi_name_only' in tableMap['data-field']) or ('pi_country_only' in tableMap['data-field']):
+
+        if (  # pylint: disable=using-constant-test
+                x for x in tableMap['data-field'] if x in ('add_list',
+                                                           'major_issue',
+                                                           'pi_name',
+                                                           'country',
+                                                           'pi_name_only',
+                                                           'pi_country_only',
+                                                           'received_date')
+        ):
+            if idList and ('add_list' in tableMap['data-field']):
+                executor.submit('anno_selection', self._statusDB.getAnnoSelection, depositionids=idList)
+            #
+            if idList and (x for x in tableMap['data-field'] if x in ('major_issue',
+                                                                      'received_date')
+                           ):
+                executor.submit('remind_message_track', self._statusDB.getRemindMessageTrack, depositionids=idList)
+            #
+            if idList and (x for x in tableMap['data-field'] if x in ('pi_name',
+                                                                      'country',
+                                                                      'pi_name_only',
+                                                                      'pi_country_only')
+                           ):
+                executor.submit('pi_info', self.__getPIInfo, idList)
+            #
+        #
+        lookupMap = executor.run()
+        if self._verbose:
+            for name, elapsed in sorted(executor.getTimings().items()):
+                self._lfh.write("+DepictContent.__processRows() lookup %s took %.3fs\n" % (name, elapsed))
+            #
+        #
+        pdbExtIdMap = lookupMap.get('pdb_ext_id') or {}
+        groupIdMap = {}
+        return_list = lookupMap.get('group_id')
+        if return_list:
+            for rD in return_list:
+                if ('group_id' in rD) and rD['group_id'] and ('dep_set_id' in rD) and rD['dep_set_id']:
+                    groupIdMap[rD['dep_set_id']] = rD['group_id']
                 #
-                if (dataD['dep_set_id'] in PIInfoMap) and PIInfoMap[dataD['dep_set_id']]:
-                    dataD.update(PIInfoMap[dataD['dep_set_id']])
+            #
+        #
+        if 'release_date' in lookupMap:
+            releaseDateMap = lookupMap['release_date']
+            for dataD in rows:
+                dataD['deposition_release_dates'] = ''
+                if ('dep_set_id' not in dataD) or (not dataD['dep_set_id']):
+                    continue
                 #
-                if 'add_list' in tableMap['data-field']:
-                    if (dataD['dep_set_id'] in annSelectMap) and annSelectMap[dataD['dep_set_id']]:
-                        dataD['add_list'] = annSelectMap[dataD['dep_set_id']]['annotator_initials']
+                if ('dep_initial_deposition_date' in dataD) and dataD['dep_initial_deposition_date']:
+                    dataD['deposition_release_dates'] = str(dataD['dep_initial_deposition_date']) + ' /<br /> '
+                    if (dataD['dep_set_id'] in releaseDateMap) and releaseDateMap[dataD['dep_set_id']]:
+                        dataD['deposition_release_dates'] += releaseDateMap[dataD['dep_set_id']]
                     else:
-                        dataD['add_list'] = 'Add'
+                        dataD['deposition_release_dates'] += 'n.a.'
                     #
+                elif (dataD['dep_set_id'] in releaseDateMap) and releaseDateMap[dataD['dep_set_id']]:
+                    dataD['deposition_release_dates'] = 'n.a. /<br /> ' + releaseDateMap[dataD['dep_set_id']]
                 #
-                dataD['base_url'] = ''
-                if ('class_id' in dataD) and dataD['class_id']:
-                    dataD['base_url'] = self._processBaseUrl(dataD['class_id'])
-                #
-                dataD['urlmethod'] = ''
-                dataD['abbrv_method'] = ''
-                if ('method' in dataD) and dataD['method']:
-                    dataD['urlmethod'] = u_quote(dataD['method'])
-                    if dataD['method'].upper() == 'X-RAY DIFFRACTION':
-                        dataD['abbrv_method'] = 'X-RAY'
-                    elif dataD['method'].upper() == 'NEUTRON DIFFRACTION':
-                        dataD['abbrv_method'] = 'NEUTRON'
-                    elif dataD['method'].upper() == 'FIBER DIFFRACTION' or dataD['method'].upper() == 'FIBRE DIFFRACTION':
-                        dataD['abbrv_method'] = 'FIBER'
-                    elif (
-                            dataD['method'].upper() == 'CRYO-ELECTRON MICROSCOPY'
-                            or dataD['method'].upper() == 'ELECTRON MICROSCOPY'
-                            or dataD['method'].upper() == 'ELECTRON TOMOGRAPHY'
-                    ):
-                        dataD['abbrv_method'] = 'EM'
-                    elif dataD['method'].upper() == 'ELECTRON CRYSTALLOGRAPHY':
-                        dataD['abbrv_method'] = 'EL. CRYS.'
-                    elif dataD['method'].upper() == 'SOLUTION NMR':
-                        dataD['abbrv_method'] = 'NMR'
-                    elif dataD['method'].upper() == 'SOLID-STATE NMR' or dataD['method'].upper() == 'SOLID STATE NMR':
-                        dataD['abbrv_method'] = 'SS NMR'
+            #
+        #
+        annSelectMap = {}
+        if 'anno_selection' in lookupMap:
+            annSelectMap = self.__convertListIntoMap(lookupMap['anno_selection'])
+        #
+        reminderSentMap = {}
+        if 'remind_message_track' in lookupMap:
+            reminderSentMap = self.__convertListIntoMap(lookupMap['remind_message_track'])
+        #
+        PIInfoMap = lookupMap.get('pi_info', {})
+        if ('assign_annotator' in tableMap['data-field']) and (order == 0):
+            self.__assign_annotator_tmplt = self._getPageTemplate('assign_annotator_tmplt')
+            self.__AnnotatorSelection = self._getAnnotatorSelection()
+        #
+        # per-table decisions, taken once for all rows
+        dataFieldList = tableMap['data-field']
+        hasDefaultOrder = 'default_order' in dataFieldList
+        order_condition = tableMap.get('order_condition', '')
+        hasAddList = 'add_list' in dataFieldList
+        hasPublicIds = ('pdb_ids' in dataFieldList) or ('user_pdb_id' in dataFieldList)
+        hasStatusCode = ('coor_status' in dataFieldList) or ('author_status' in dataFieldList)
+        rowPlan = self.__getRowPlan(tableMap)
+        for dataD in rows:
+            dataD['display_ids'] = dataD['dep_set_id']
+            dataD['group_info'] = ''
+            if (dataD['dep_set_id'] in groupIdMap) and groupIdMap[dataD['dep_set_id']]:
+                dataD['display_ids'] = dataD['dep_set_id'] + '/' + groupIdMap[dataD['dep_set_id']]
+                dataD['group_info'] = '&group_id=' + groupIdMap[dataD['dep_set_id']]
+            #
+            if hasDefaultOrder:
+                dataD['default_order'] = self.__getOrder(order, num_rows, order_condition, dataD)
+            #
+            if count_map and ('dep_status_code' in dataD) and dataD['dep_status_code']:
+                status = str(dataD['dep_status_code'])
+                if status:
+                    if status in count_map:
+                        count_map[status] += 1
                     else:
-                        dataD['abbrv_method'] = dataD['method']
+                        count_map[status] = 1
                     #
                 #
-                if ('pdb_ids' in tableMap['data-field']) or ('user_pdb_id' in tableMap['data-field']):
-                    dataD = processPublicIDs(dataD, pdbExtIdMap)
-                    if ('coor_status' in tableMap['data-field']) or ('author_status' in tableMap['data-field']):
-                        dataD['comb_status_code'], dataD['comb_author_release_status_code'], titleEM, authorListEM = self.__processStatusCode(dataD)
-                        if titleEM:
-                            dataD['dep_title'] = titleEM
-                        #
-                        if authorListEM:
-                            dataD['dep_author_list'] = authorListEM
-                        #
-                    #
+            #
+            dataD['locklabel'] = self.__processLockLabelForCommunication(dataD)
+            if (dataD['dep_set_id'] in reminderSentMap) and reminderSentMap[dataD['dep_set_id']]:
+                dataD.update(reminderSentMap[dataD['dep_set_id']])
+            #
+            if (dataD['dep_set_id'] in PIInfoMap) and PIInfoMap[dataD['dep_set_id']]:
+                dataD.update(PIInfoMap[dataD['dep_set_id']])
+            #
+            if hasAddList:
+                if (dataD['dep_set_id'] in annSelectMap) and annSelectMap[dataD['dep_set_id']]:
+                    dataD['add_list'] = annSelectMap[dataD['dep_set_id']]['annotator_initials']
+                else:
+                    dataD['add_list'] = 'Add'
                 #
-                self._dataInfo['data_for_all'] = [dataD]
-                resultD = {}
-                for field_item in tableMap['data-field']:
-                    resultD[field_item] = ''
-                    if field_item not in self.__dataFieldMap:
-                        continue
+            #
+            dataD['base_url'] = ''
+            if ('class_id' in dataD) and dataD['class_id']:
+                dataD['base_url'] = self._processBaseUrl(dataD['class_id'])
+            #
+            dataD['urlmethod'] = ''
+            dataD['abbrv_method'] = ''
+            if ('method' in dataD) and dataD['method']:
+                dataD['urlmethod'] = u_quote(dataD['method'])
+                dataD['abbrv_method'] = _abbrvMethodMap.get(dataD['method'].upper(), dataD['method'])
+            #
+            if hasPublicIds:
+                dataD = processPublicIDs(dataD, pdbExtIdMap)
+                if hasStatusCode:
+                    dataD['comb_status_code'], dataD['comb_author_release_status_code'], titleEM, authorListEM = self.__processStatusCode(dataD)
+                    if titleEM:
+                        dataD['dep_title'] = titleEM
                     #
-                    value = self.__dataFieldMap[field_item]['value']
-                    dtype = self.__dataFieldMap[field_item]['type']
-                    if dtype == 'page_template':
-                        resultD[field_item] = self.getPageText(page_id=value)
-                    elif dtype == 'dataInfo':
-                        if (value in dataD) and dataD[value]:
-                            resultD[field_item] = str(dataD[value])
-                        #
-                    elif dtype == 'function':
-                        resultD[field_item] = getattr(self, "%s" % value)(dataD)
+                    if authorListEM:
+                        dataD['dep_author_list'] = authorListEM
                     #
                 #
-                contentResults.append(resultD)
-                order += 1
             #
+            self._dataInfo['data_for_all'] = [dataD]
+            resultD = {}
+            for field_item, renderer in rowPlan:
+                resultD[field_item] = renderer(dataD) if renderer else ''
+            #
+            contentResults.append(resultD)
+            order += 1
         #
-        dumpPickleFile(self.__sessionPath, tableMap['pkl'], contentResults)
+
+    def __getRowPlan(self, tableMap):
+        """ Returns [ ( field_item, renderer ) ] for the columns of tableMap['data-field'], compiled once per table.
+            renderer( dataD ) returns the text of the column, None stands for an empty column.
+        """
+        if tableMap['pkl'] not in self.__rowPlanMap:
+            self.__rowPlanMap[tableMap['pkl']] = [(field_item, self.__getColumnRenderer(field_item)) for field_item in tableMap['data-field']]
         #
-        if 'entry_count' in tableMap:
-            for t_type, ilist in tableMap['entry_count'].items():
-                for item in ilist:
-                    count = 0
-                    if item == 'num_entries':
-                        count = len(rows)
-                    elif item in count_map:
-                        count = count_map[item]
-                    #
-                    self.__returnMap[t_type + '_' + item + '_' + tableMap['tab_count_id']] = count
-                #
-            #
+        return self.__rowPlanMap[tableMap['pkl']]
+
+    def __getColumnRenderer(self, field_item):
+        """ Bound renderer of a 'table_data_field_binding' item
+        """
+        if field_item not in self.__dataFieldMap:
+            return None
         #
+        value = self.__dataFieldMap[field_item]['value']
+        dtype = self.__dataFieldMap[field_item]['type']
+        if dtype == 'page_template':
+            return lambda dataD: self.getPageText(page_id=value)
+        elif dtype == 'dataInfo':
+            return lambda dataD: str(dataD[value]) if (value in dataD) and dataD[value] else ''
+        elif dtype == 'function':
+            return getattr(self, "%s" % value)
+        #
+        return None
 
     def _processWorkFlowStatus(self, dataD):
         """
@@ -427,12 +774,13 @@ class DepictContent(DepictBase):
                 groupIdMap[dataD['group_id']].append(dataD['dep_set_id'])
             else:
                 groupIdMap[dataD['group_id']] = [dataD['dep_set_id']]
-                entryIdList.append(dataD['dep_set_id'])
             #
+            entryIdList.append(dataD['dep_set_id'])
         #
         if not entryIdList:
             return []
         #
+        # entry info of the members of all groups, used for the first member checks and the group status codes
         info_rows = self._statusDB.getSimpleEntryInfo(depositionids=entryIdList)
         if not info_rows:
             return []
@@ -456,7 +804,7 @@ class DepictContent(DepictBase):
             if ('initial_deposition_date' in infoMap[entry_ids[0]]) and infoMap[entry_ids[0]]['initial_deposition_date']:
                 groupInfoMap[group_id]['initial_deposition_date'] = infoMap[entry_ids[0]]['initial_deposition_date']
             #
-            groupInfoMap[group_id]['status_code'] = self.__getGroupStatusCode(entry_ids)
+            groupInfoMap[group_id]['status_code'] = self.__getGroupStatusCode(entry_ids, infoMap)
         #
         group_rows = []
         for dataD in rows:
@@ -544,17 +892,12 @@ class DepictContent(DepictBase):
         """
         """
         Map = self.__getPIInfoFromCotentDB(rList)
-        foundMissing = False
-        for depId in rList:
-            if depId not in Map:
-                foundMissing = True
-                break
-            #
-        #
-        if not foundMissing:
+        missingList = [depId for depId in rList if depId not in Map]
+        if not missingList:
             return Map
         #
-        Map1 = self.__getPIInfoFromStatusDB(rList)
+        # Content DB PI, else status DB PI, else the first valid contact author: the last two come from one query
+        Map1, validContactAuthorMap = self.__getPIInfoFromStatusDB(missingList)
         for depId in rList:
             if depId in Map:
                 continue
@@ -562,7 +905,7 @@ class DepictContent(DepictBase):
             if depId in Map1:
                 Map[depId] = Map1[depId]
             else:
-                validContactAuthor = self._statusDB.ValidContactAuthor(depId)
+                validContactAuthor = validContactAuthorMap.get(depId)
                 if validContactAuthor:
                     tmpMap = {}
                     if ('last_name' in validContactAuthor) and validContactAuthor['last_name']:
@@ -586,9 +929,23 @@ class DepictContent(DepictBase):
         return self.__processPIInfo(self._contentDB.ContactAuthorPI(rList), ['name_first', 'name_mi', 'name_last'])
 
     def __getPIInfoFromStatusDB(self, rList):
+        """ Return ( PI info map, { dep_id : first valid contact author row } )
         """
-        """
-        return self.__processPIInfo(self._statusDB.ContactAuthorPI(rList), ['last_name'])
+        piRows = []
+        validContactAuthorMap = {}
+        rows = self._statusDB.ContactAuthorPIOrValid(rList)
+        if rows:
+            for dataD in rows:
+                # the database compares roles case-insensitively
+                role = str(dataD.get('role', '')).strip().lower()
+                if role == 'principa':
+                    piRows.append(dataD)
+                elif (role == 'valid') and ('id' in dataD) and dataD['id'] and (str(dataD['id']) not in validContactAuthorMap):
+                    validContactAuthorMap[str(dataD['id'])] = dataD
+                #
+            #
+        #
+        return self.__processPIInfo(piRows, ['last_name']), validContactAuthorMap
 
     def __processPIInfo(self, rows, name_items):
         """
@@ -642,6 +999,12 @@ class DepictContent(DepictBase):
         if not order_condition:
             return str(order)
         #
+        return str(self.__getOrderRank(order_condition, dataD) * num_rows + order)
+
+    def __getOrderRank(self, order_condition, dataD):
+        """ Position of the value of the order_condition column in its value list ( 'column:value1,value2,...' ), starting
+            at 1, the number of values + 1 if it is not in the list
+        """
         condition_list = order_condition.split(':')
         value_list = condition_list[1].split(',')
         num = len(value_list) + 1
@@ -660,7 +1023,7 @@ class DepictContent(DepictBase):
                 count += 1
             #
         #
-        return str(num * num_rows + order)
+        return num
 
     def __processLockLabelForCommunication(self, dataDict):
         """
@@ -731,10 +1094,13 @@ class DepictContent(DepictBase):
         #
         return statusCode, authorReleaseStatusCode, titleEM, authorListEM
 
-    def __getGroupStatusCode(self, entryIdList):
+    def __getGroupStatusCode(self, entryIdList, infoMap):
+        """ Most frequent status code of the group members. infoMap holds the entry info rows by dep_set_id; members are
+            visited once each in dep_set_id order, as returned by the 'GET_ENTRY_INFO' query, so ties resolve as before
+        """
         status_code = 'unknown'
         count = 0
-        info_rows = self._statusDB.getSimpleEntryInfo(depositionids=entryIdList)
+        info_rows = [infoMap[depId] for depId in sorted(set(entryIdList)) if depId in infoMap]
         if not info_rows:
             return status_code
         #
@@ -4,6 +4,8 @@
 #
 # Updates:
 #  09-Dec-2024  zf   call _getPdbExtIdMap() method to get 'ext_pdb_id'
+#  18-Oct-2026  zf   read the replacement counts from ReplaceCountSummary, optional startdate/enddate filters
+#  18-Oct-2026  zf   query the database for a startdate before the window of the summary
 #
 ##
 """
@@ -25,6 +27,7 @@ __version__ = "V0.07"
 
 
 import sys
+from datetime import date, timedelta
 try:
     from urllib.parse import quote as u_quote
 except ImportError:
@@ -32,6 +35,7 @@ except ImportError:
 
 from wwpdb.utils.wf.dbapi.WFEtime import getTimeFromEpoc
 from wwpdb.utils.session.FileUtils import FileUtils
+from wwpdb.apps.workmanager.db_access.ReplaceCountSummary import ReplaceCountSummary
 from wwpdb.apps.workmanager.depict.DepictBase import DepictBase, processPublicIDs
 from wwpdb.apps.workmanager.depict.DepictWorkFlow import DepictWorkFlow
 from wwpdb.apps.workmanager.file_access.LogFileUtil import LogFileUtil
@@ -47,6 +51,8 @@ class DepictOther(DepictBase):
         #
         self.__dataD = {}
         self.__lastInst = {}
+        # seconds the replacement count summary is used before it is refreshed
+        self.__replaceCountMaxAge = 3600
         self.__setup()
 
     def SummaryPage(self):
@@ -98,7 +104,16 @@ class DepictOther(DepictBase):
         """
         self._connectContentDB()
 
-        replace_counts = self._contentDB.GetReplaceCounts()
+        startdate = self._reqObj.getValue("startdate")
+        enddate = self._reqObj.getValue("enddate")
+        summary = ReplaceCountSummary(siteId=self._siteId, contentDB=self._contentDB, verbose=self._verbose, log=self._lfh)
+        if (summary.refresh(maxAge=self.__replaceCountMaxAge) == 'OK') and summary.covers(startdate):
+            replace_counts = summary.getReplaceCounts(startdate=startdate, enddate=enddate)
+        elif startdate or enddate:
+            replace_counts = self._contentDB.GetReplaceCountsInRange(startdate=startdate or (date.today() - timedelta(365)), enddate=enddate or '9999-12-31')
+        else:
+            replace_counts = self._contentDB.GetReplaceCounts()
+        #
         if replace_counts:
             replaceList = []
             for Dict in replace_counts:
@@ -2,6 +2,7 @@
 # File:  DepictWorkFlow.py
 # Date:  24-Mar-2016
 # Updates:
+#  18-Oct-2026  zf   fetch the last instance of all Level 2 modules with one query, memoize the model file checks
 ##
 """
 
@@ -49,6 +50,9 @@ class DepictWorkFlow(DepictBase):
         self.__sessionPath = self.__sObj.getPath()
         self.__MaxBox = 7
         self.__MaxBoxTask = 4
+        # PathInfo object and ( identifier, instance ) -> model file exists, shared by all modules of this request
+        self.__pathInfo = None
+        self.__modelFileMap = {}
         #
         self.__setup()
 
@@ -110,6 +114,8 @@ class DepictWorkFlow(DepictBase):
         work_module = '<tr>\n'
         single_module = '<tr>\n'
         count = 0
+        lastWFInstanceMap = self._statusDB.getLastWFInstances(depositionid=self._reqObj.getValue('identifier'),
+                                                              classids=[wf['classID'] for wf in self.__wfFlow[1:-1] if 'classID' in wf])
         for wf in self.__wfFlow[1:-1]:
             if 'classID' not in wf:
                 continue
@@ -123,7 +129,7 @@ class DepictWorkFlow(DepictBase):
             myD = self.__expandMyD(myD, wf, ('classID', 'taskID', 'name'))
             myD['inst_status'] = 'notdone'
             myD['instance'] = ''
-            lastWFInstance = self._statusDB.getLastWFInstance(depositionid=self._reqObj.getValue('identifier'), classid=wf['classID'])
+            lastWFInstance = lastWFInstanceMap.get(wf['classID'])
             myD = self.__expandMyD(myD, lastWFInstance, ('inst_status', 'wf_inst_id'))
             if not myD['inst_status']:
                 myD['inst_status'] = 'notdone'
@@ -266,18 +272,34 @@ class DepictWorkFlow(DepictBase):
     def __processDownLoadCifFile(self, myD, delimiter):
         """
         """
+        if self.__hasModelFile(myD['identifier'], myD['instance']):
+            return delimiter + self.__download_tmplt % myD
+        #
+        return ''
+
+    def __hasModelFile(self, identifier, instance):
+        """ Check once per request whether the latest model file of a workflow instance exists
+        """
+        key = (identifier, instance)
+        if key in self.__modelFileMap:
+            return self.__modelFileMap[key]
+        #
+        found = False
         try:
-            pI = PathInfo(siteId=self._siteId, sessionPath=self.__sessionPath, verbose=self._verbose, log=self._lfh)
-            filePath = pI.getFilePath(dataSetId=myD['identifier'], wfInstanceId=myD['instance'], contentType='model',
-                                      formatType='pdbx', fileSource='wf-instance', versionId='latest', partNumber='1')
+            if self.__pathInfo is None:
+                self.__pathInfo = PathInfo(siteId=self._siteId, sessionPath=self.__sessionPath, verbose=self._verbose, log=self._lfh)
+            #
+            filePath = self.__pathInfo.getFilePath(dataSetId=identifier, wfInstanceId=instance, contentType='model',
+                                                   formatType='pdbx', fileSource='wf-instance', versionId='latest', partNumber='1')
 
             if filePath and os.access(filePath, os.F_OK):
-                return delimiter + self.__download_tmplt % myD
+                found = True
             #
         except:  # noqa: E722 pylint: disable=bare-except
             traceback.print_exc(file=self._lfh)
         #
-        return ''
+        self.__modelFileMap[key] = found
+        return found
 
     def __getTaskLogFile(self, log_tmplt, myD):
         """
@@ -2,6 +2,7 @@
 # File:  Level1Util.py
 # Date:  18-Mar-2016
 # Updates:
+#  18-Oct-2026  zf   table contents are written in the columnar TableStore format ( table_content_N.tbl )
 ##
 """
 
@@ -158,7 +159,7 @@ class Level1Util(DepictBase):
         table_keys = sorted(self._conFigObj['table_definition'][self.__tab_def_id].keys())
         for key in table_keys:
             tableDef = self._conFigObj['table_definition'][self.__tab_def_id][key]
-            tableContentFile = 'table_content_' + str(len(self.__tableContentMap) + 1) + '.pkl'
+            tableContentFile = 'table_content_' + str(len(self.__tableContentMap) + 1) + '.tbl'
             tableLoad.append([tableDef['load'], tableDef['table_id'], tableContentFile])
             dataD = {}
             dataD['tab_id'] = self.__tab_count_id
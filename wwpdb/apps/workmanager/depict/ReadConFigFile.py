@@ -2,6 +2,7 @@
 # File:  ReadConFigFile.py
 # Date:  16-Mar-2016
 # Updates:
+#  18-Oct-2026  zf   keep the sql_selection_definition id of each table as 'sql_selection_id'
 ##
 """
 
@@ -309,6 +310,7 @@ class ReadConFigFile(object):
             select_id = inDict['tab_table_sql_binding'][key]['select_definition_id']
             if ('sql_selection_definition' in inDict) and (select_id in inDict['sql_selection_definition']) and inDict['sql_selection_definition'][select_id]:
                 myD['sql_selection'] = inDict['sql_selection_definition'][select_id]
+                myD['sql_selection_id'] = select_id
             #
         #
         if not myD:
@@ -0,0 +1,149 @@
+##
+# File:  TablePage.py
+# Date:  18-Oct-2026
+# Updates:
+#  18-Oct-2026  zf   getTableFilePage() reads only the needed columns and rows of a TableStore file
+#  18-Oct-2026  zf   keep unicode cells and filters as text, only plain decimal cells sort as numbers
+##
+"""
+Server-side paging, sorting and filtering of the rendered table rows ( the per-table files written by DepictContent ).
+
+Each row is a { column : html text } dictionary. Filters and sorting work on the displayed text of a cell,
+i.e. with the HTML tags removed. A filter keeps the rows whose cell text contains the filter text, ignoring
+case. Cells which are plain decimal numbers ( e.g. '12', '-3.5' ) sort numerically and before the text cells. The row order of a ( table file,
+sort, filters ) combination is kept in a process-wide LRU cache, so that paging through a table sorts it once.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2026 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import re
+
+from wwpdb.apps.workmanager.db_access.LRUCache import LRUCache
+
+try:
+    _textType = unicode  # noqa: F821 pylint: disable=undefined-variable
+except NameError:
+    _textType = str
+#
+
+_tagPattern = re.compile(r"<[^>]*>")
+_numberPattern = re.compile(r"^[+-]?\d+(\.\d+)?$")
+# ( table version, row count, sort key, descending, filters ) -> list of row indices
+_rowOrderCache = LRUCache(maxSize=64)
+
+
+def _getText(value):
+    """ Returns text values unchanged ( no str() of py2 unicode ), the text of other values
+    """
+    if isinstance(value, (_textType, str)):
+        return value
+    #
+    return _textType(value)
+
+
+def getCellText(value):
+    """ Displayed text of a cell: HTML tags removed, surrounding white space stripped
+    """
+    if value is None:
+        return ''
+    #
+    return _tagPattern.sub('', _getText(value)).strip()
+
+
+def _getSortKey(value):
+    text = getCellText(value)
+    if _numberPattern.match(text):
+        return (0, float(text), '')
+    #
+    return (1, 0.0, text.lower())
+
+
+def _getRowOrder(rowCount, getColumn, sortKey, descending, filterMap):
+    """ Returns the indices of the rows passing filterMap, sorted by column sortKey. getColumn( name ) returns
+        the values of a column for all rows.
+    """
+    indexList = list(range(rowCount))
+    for column, text in sorted(filterMap.items()):
+        text = text.lower()
+        valueList = getColumn(column)
+        indexList = [i for i in indexList if text in getCellText(valueList[i]).lower()]
+    #
+    if sortKey:
+        valueList = getColumn(sortKey)
+        indexList.sort(key=lambda i: _getSortKey(valueList[i]), reverse=descending)
+    #
+    return indexList
+
+
+def _getPageOrder(rowCount, getColumn, offset, limit, sortKey, descending, filterMap, version):
+    """ Returns ( indices of the rows of the page, number of rows passing the filters )
+    """
+    filterMap = dict([(_getText(column), _getText(text)) for column, text in (filterMap or {}).items() if (text is not None) and (_getText(text) != '')])
+    offset = max(0, offset or 0)
+    if (not sortKey) and (not filterMap):
+        end = rowCount if limit is None else min(rowCount, offset + max(0, limit))
+        return list(range(offset, end)), rowCount
+    #
+    indexList = None
+    cacheKey = None
+    if version is not None:
+        cacheKey = (version, rowCount, sortKey, bool(descending), tuple(sorted(filterMap.items())))
+        indexList = _rowOrderCache.get(cacheKey)
+    #
+    if indexList is None:
+        indexList = _getRowOrder(rowCount, getColumn, sortKey, descending, filterMap)
+        if cacheKey is not None:
+            _rowOrderCache.put(cacheKey, indexList)
+        #
+    #
+    end = len(indexList) if limit is None else offset + max(0, limit)
+    return indexList[offset:end], len(indexList)
+
+
+def getRowOrder(rows, sortKey=None, descending=False, filterMap=None):
+    """ Returns the indices of the rows passing filterMap { column : text }, sorted by column sortKey
+    """
+    filterMap = dict([(column, text) for column, text in (filterMap or {}).items() if text])
+    return _getRowOrder(len(rows), lambda column: [row.get(column) for row in rows], sortKey, descending, filterMap)
+
+
+def getTablePage(rows, offset=0, limit=None, sortKey=None, descending=False, filterMap=None, version=None):
+    """ Returns ( rows of the requested page, number of rows passing the filters ). version identifies the table
+        content ( e.g. file path and modification time ), the row order is only cached if it is given.
+    """
+    if not rows:
+        return [], 0
+    #
+    indexList, total = _getPageOrder(len(rows), lambda column: [row.get(column) for row in rows], offset, limit, sortKey, descending,
+                                     filterMap, version)
+    return [rows[i] for i in indexList], total
+
+
+def getTableFilePage(tableFile, offset=0, limit=None, sortKey=None, descending=False, filterMap=None, version=None):
+    """ Same as getTablePage() for a TableStore.TableFile: only the sort and filter columns and the rows of the page are read
+    """
+    rowCount = tableFile.getRowCount()
+    indexList, total = _getPageOrder(rowCount, tableFile.getColumn, offset, limit, sortKey, descending, filterMap, version)
+    if indexList and (indexList == list(range(indexList[0], indexList[-1] + 1))):
+        # consecutive rows, e.g. an unsorted page: read them as one slice
+        return tableFile.getRows(indexList[0], indexList[-1] + 1), total
+    #
+    return tableFile.getRowsByIndex(indexList), total
+
+
+def getRowOrderCacheStats():
+    """ Return the counters of the row order cache
+    """
+    return _rowOrderCache.getStats()
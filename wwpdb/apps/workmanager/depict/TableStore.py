@@ -0,0 +1,293 @@
+##
+# File:  TableStore.py
+# Date:  18-Oct-2026
+# Updates:
+#  18-Oct-2026  zf   size the header from its encoded length with the final column positions
+##
+"""
+Columnar on-disk store of the rendered table contents ( list of { column : value } rows ) written by DepictContent
+and read by the gettabledata request.
+
+File layout ( all integers little-endian ):
+
+    magic            8 bytes  'WFMTBL1\\n'
+    header length    uint32
+    header           JSON { "rows": row count, "columns": [ { "name", "type", "width", "index", "data" }, ... ] }
+    per column       index: row count + 1 offsets ( uint32 or uint64 ) into the column data
+                     data:  the encoded values of the column, one after the other
+
+A column of "type" 's' holds UTF-8 text, a column of type 'j' holds JSON encoded numbers/None/text. A text column
+with few distinct values ( status codes, methods, ... ) has type 'd': the distinct values are listed in the header
+and the index holds a one byte code per row, without data part. The file is read
+through mmap, so a slice of rows or a single column is decoded without reading the rest of the table. Tables which
+do not fit the layout ( rows with different columns, values other than text/numbers/None ) are pickled as before;
+loadTableFile() reads both.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2026 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle as pickle
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+from collections import OrderedDict
+
+try:
+    _textType = unicode  # noqa: F821 pylint: disable=undefined-variable
+except NameError:
+    _textType = str
+#
+_jsonTypes = (_textType, str, int, float, bool, type(None))
+
+_magic = b'WFMTBL1\n'
+# text columns with at most that many distinct values are stored as one byte codes
+_maxDistinctCount = 256
+_headerLength = struct.Struct('<I')
+
+
+def _getColumnNames(rows):
+    """ Returns the column names shared by all rows, None if rows is not a list of dictionaries with the same keys
+    """
+    if (not isinstance(rows, list)) or (not rows) or (not isinstance(rows[0], dict)):
+        return None
+    #
+    columnNames = list(rows[0].keys())
+    columnSet = set(columnNames)
+    for row in rows:
+        if (not isinstance(row, dict)) or (len(row) != len(columnNames)) or (set(row.keys()) != columnSet):
+            return None
+        #
+    #
+    return columnNames
+
+
+def _encodeColumn(values):
+    """ Returns the column definition and the content of its index and data parts, None if a value can not be stored
+    """
+    if all(isinstance(value, _textType) for value in values):
+        distinctList = list(OrderedDict.fromkeys(values))
+        if (len(distinctList) <= _maxDistinctCount) and (len(distinctList) * 2 <= len(values)):
+            # few distinct values: one byte per row
+            codeMap = dict([(value, code) for code, value in enumerate(distinctList)])
+            return {'type': 'd', 'width': 'B', 'values': distinctList}, struct.pack('<%dB' % len(values), *[codeMap[value] for value in values]), b''
+        #
+        encodedList = [value.encode('utf-8') for value in values]
+        columnDef = {'type': 's', 'ascii': (sum([len(value) for value in encodedList]) == sum([len(value) for value in values]))}
+    elif all(isinstance(value, _jsonTypes) for value in values):
+        columnDef = {'type': 'j'}
+        encodedList = [json.dumps(value).encode('utf-8') for value in values]
+    else:
+        return None
+    #
+    offsetList = [0]
+    for value in encodedList:
+        offsetList.append(offsetList[-1] + len(value))
+    #
+    columnDef['width'] = 'I' if offsetList[-1] < 0xffffffff else 'Q'
+    return columnDef, struct.pack('<%d%s' % (len(offsetList), columnDef['width']), *offsetList), b''.join(encodedList)
+
+
+def _encodeTable(rows):
+    """ Returns the content of the columnar file of rows, None if rows do not fit the layout
+    """
+    columnNames = _getColumnNames(rows)
+    if columnNames is None:
+        return None
+    #
+    header = {'rows': len(rows), 'columns': []}
+    partList = []
+    for name in columnNames:
+        encoded = _encodeColumn([row[name] for row in rows])
+        if encoded is None:
+            return None
+        #
+        columnDef, index, data = encoded
+        columnDef['name'] = name
+        columnDef['index'] = len(index)
+        columnDef['data'] = len(data)
+        header['columns'].append(columnDef)
+        partList.append(index)
+        partList.append(data)
+    #
+    # header positions are absolute and the header length depends on them: grow the header size until the
+    # header with the positions computed for that size fits into it
+    sizeList = [(columnDef['index'], columnDef['data']) for columnDef in header['columns']]
+    headerSize = len(json.dumps(header).encode('utf-8'))
+    while True:
+        position = len(_magic) + _headerLength.size + headerSize
+        for columnDef, (indexSize, dataSize) in zip(header['columns'], sizeList):
+            columnDef['index'] = position
+            position += indexSize
+            columnDef['data'] = position
+            position += dataSize
+        #
+        encodedHeader = json.dumps(header).encode('utf-8')
+        if len(encodedHeader) <= headerSize:
+            break
+        #
+        headerSize = len(encodedHeader)
+    #
+    return b''.join([_magic, _headerLength.pack(headerSize), encodedHeader.ljust(headerSize)] + partList)
+
+
+def dumpTableFile(sessionPath, filename, rows):
+    """ Write rows to sessionPath/filename, in the columnar layout if they fit it, pickled otherwise. The file is
+        replaced atomically, readers which have the previous version mapped keep reading it.
+    """
+    content = _encodeTable(rows)
+    if content is None:
+        content = pickle.dumps(rows, pickle.HIGHEST_PROTOCOL)
+    #
+    fd, tmpPath = tempfile.mkstemp(dir=sessionPath, prefix='.' + filename + '.')
+    try:
+        with os.fdopen(fd, 'wb') as ofh:
+            ofh.write(content)
+        #
+        os.chmod(tmpPath, 0o664)
+        os.rename(tmpPath, os.path.join(sessionPath, filename))
+    except:  # noqa: E722 pylint: disable=bare-except
+        os.remove(tmpPath)
+        raise
+    #
+
+
+class TableFile(object):
+    """ Read access to a columnar table file
+    """
+    def __init__(self, filePath):
+        """ Raises ValueError if filePath is not a columnar table file
+        """
+        with open(filePath, 'rb') as ifh:
+            if ifh.read(len(_magic)) != _magic:
+                raise ValueError("%s is not a table file" % filePath)
+            #
+            st = os.fstat(ifh.fileno())
+            self.__version = (st.st_ino, st.st_mtime, st.st_size)
+            self.__map = mmap.mmap(ifh.fileno(), 0, access=mmap.ACCESS_READ)
+        #
+        start = len(_magic) + _headerLength.size
+        header = json.loads(self.__map[start:start + _headerLength.unpack_from(self.__map, len(_magic))[0]].decode('utf-8'))
+        self.__rowCount = header['rows']
+        self.__columnNames = [columnDef['name'] for columnDef in header['columns']]
+        self.__columnMap = dict([(columnDef['name'], columnDef) for columnDef in header['columns']])
+
+    def getRowCount(self):
+        return self.__rowCount
+
+    def getVersion(self):
+        """ Returns ( inode, modification time, size ) of the file when it was opened
+        """
+        return self.__version
+
+    def getColumnNames(self):
+        return list(self.__columnNames)
+
+    def __getRange(self, start, stop):
+        start = min(max(0, start or 0), self.__rowCount)
+        stop = self.__rowCount if stop is None else min(max(start, stop), self.__rowCount)
+        return start, stop
+
+    def __decode(self, columnDef, start, stop):
+        """ Returns the values of rows start to stop - 1 of a column
+        """
+        if start >= stop:
+            return []
+        #
+        width = columnDef['width']
+        if columnDef['type'] == 'd':
+            distinctList = columnDef['values']
+            return [distinctList[code] for code in struct.unpack_from('<%dB' % (stop - start), self.__map, columnDef['index'] + start)]
+        #
+        offsetList = struct.unpack_from('<%d%s' % (stop - start + 1, width), self.__map, columnDef['index'] + start * struct.calcsize('<' + width))
+        base = offsetList[0]
+        data = self.__map[columnDef['data'] + base:columnDef['data'] + offsetList[-1]]
+        if columnDef.get('ascii'):
+            # byte offsets are character offsets, decode once
+            data = data.decode('ascii')
+            return [data[begin - base:end - base] for begin, end in zip(offsetList[:-1], offsetList[1:])]
+        #
+        valueList = [data[begin - base:end - base].decode('utf-8') for begin, end in zip(offsetList[:-1], offsetList[1:])]
+        if columnDef['type'] == 'j':
+            return [json.loads(value) for value in valueList]
+        #
+        return valueList
+
+    def getColumn(self, name, start=0, stop=None):
+        """ Returns the values of column name for rows start to stop - 1, None for each row if there is no such column
+        """
+        start, stop = self.__getRange(start, stop)
+        if name not in self.__columnMap:
+            return [None] * (stop - start)
+        #
+        return self.__decode(self.__columnMap[name], start, stop)
+
+    def getRows(self, start=0, stop=None):
+        """ Returns rows start to stop - 1 as { column : value } dictionaries
+        """
+        start, stop = self.__getRange(start, stop)
+        columnList = [self.__decode(self.__columnMap[name], start, stop) for name in self.__columnNames]
+        return [dict(zip(self.__columnNames, values)) for values in zip(*columnList)] if columnList else [{} for _i in range(start, stop)]
+
+    def getRowsByIndex(self, indexList):
+        """ Returns the rows of indexList, in that order
+        """
+        return [self.getRows(index, index + 1)[0] for index in indexList if 0 <= index < self.__rowCount]
+
+    def close(self):
+        self.__map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def openTableFile(sessionPath, filename):
+    """ Returns the TableFile of sessionPath/filename, None if the file does not exist or was pickled
+    """
+    filePath = os.path.join(sessionPath, filename)
+    if not os.access(filePath, os.F_OK):
+        return None
+    #
+    try:
+        return TableFile(filePath)
+    except ValueError:
+        return None
+    #
+
+
+def loadTableFile(sessionPath, filename):
+    """ Returns all rows of sessionPath/filename ( columnar or pickled ), None if the file does not exist
+    """
+    filePath = os.path.join(sessionPath, filename)
+    if not os.access(filePath, os.F_OK):
+        return None
+    #
+    tableFile = openTableFile(sessionPath, filename)
+    if tableFile is None:
+        with open(filePath, 'rb') as ifh:
+            return pickle.load(ifh)
+        #
+    #
+    with tableFile:
+        return tableFile.getRows()
+    #
@@ -0,0 +1,105 @@
+##
+# File:  TemplateCache.py
+# Date:  18-Oct-2026
+# Updates:
+##
+"""
+Process-wide cache of the HTML/text template files used by DepictBase, BaseClass and WorkManagerWebApp.
+
+Each file is read once and kept as a CompiledTemplate together with its modification time and size.
+A cached template is revalidated with os.stat() at most once every checkInterval seconds, so an edited
+template is picked up without restarting the server.
+
+This software was developed as part of the World Wide Protein Data Bank
+Common Deposition and Annotation System Project
+
+Copyright (c) 2026 wwPDB
+
+This software is provided under a Creative Commons Attribution 3.0 Unported
+License described at http://creativecommons.org/licenses/by/3.0/.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import os
+import time
+
+from wwpdb.apps.workmanager.db_access.LRUCache import LRUCache
+
+
+class CompiledTemplate(object):
+    """ Template text prepared for substitution: a text without any '%' is returned as is instead of being formatted
+    """
+    def __init__(self, text):
+        """
+        """
+        self.__text = text
+        self.__isPlain = '%' not in text
+
+    def getText(self):
+        return self.__text
+
+    def substitute(self, parameterDict):
+        """ Same result as text % parameterDict
+        """
+        if self.__isPlain:
+            return self.__text
+        #
+        return self.__text % parameterDict
+
+
+class TemplateCache(object):
+    """
+    """
+    def __init__(self, maxSize=512, checkInterval=2.0):
+        """
+        """
+        self.__checkInterval = checkInterval
+        # file path -> ( mtime, size, time of last check, CompiledTemplate )
+        self.__cache = LRUCache(maxSize=maxSize)
+
+    def get(self, filePath):
+        """ Returns the CompiledTemplate of filePath, reading the file if it is not cached or has changed.
+            A missing file raises the same IOError/OSError as open().
+        """
+        now = time.time()
+        entry = self.__cache.get(filePath)
+        if entry and ((now - entry[2]) < self.__checkInterval):
+            return entry[3]
+        #
+        try:
+            st = os.stat(filePath)
+        except OSError:
+            self.__cache.pop(filePath)
+            raise
+        #
+        if entry and (entry[0] == st.st_mtime) and (entry[1] == st.st_size):
+            self.__cache.put(filePath, (entry[0], entry[1], now, entry[3]))
+            return entry[3]
+        #
+        with open(filePath, 'r') as ifh:
+            template = CompiledTemplate(ifh.read())
+        #
+        self.__cache.put(filePath, (st.st_mtime, st.st_size, now, template))
+        return template
+
+    def clear(self):
+        self.__cache.clear()
+
+    def getStats(self):
+        """ Returns the cache counters
+        """
+        return self.__cache.getStats()
+
+
+_templateCache = TemplateCache()
+
+
+def getTemplateCache():
+    """ Return the process-wide template cache
+    """
+    return _templateCache
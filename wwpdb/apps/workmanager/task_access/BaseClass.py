@@ -2,6 +2,7 @@
 # File:  BaseClass.py
 # Date:  24-Apr-2017
 # Updates:
+#  18-Oct-2026  zf   _processTemplate() reads the template through the process-wide TemplateCache
 ##
 """
 Base class for handle all workflow manager task activities
@@ -34,6 +35,7 @@ import sys
 from wwpdb.utils.config.ConfigInfo import ConfigInfo
 from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppCommon
 from wwpdb.io.locator.PathInfo import PathInfo
+from wwpdb.apps.workmanager.depict.TemplateCache import getTemplateCache
 
 
 class BaseClass(object):
@@ -162,10 +164,7 @@ class BaseClass(object):
             parameterDict = {}
         tPath = self._reqObj.getValue("TemplatePath")
         fPath = os.path.join(tPath, fn)
-        ifh = open(fPath, 'r')
-        sIn = ifh.read()
-        ifh.close()
-        return (sIn % parameterDict)
+        return getTemplateCache().get(fPath).substitute(parameterDict)
 
     def _getLogMessage(self, logfile):
         if not os.access(logfile, os.F_OK):
@@ -2,6 +2,8 @@
 # File:  StatusUpdater.py
 # Date:  25-Apr-2017
 # Updates:
+#  18-Oct-2026  zf   write deposition/rcsb_status updates with one bulk upsert per table
+#  18-Oct-2026  zf   refresh the updated entries in the statistics snapshot
 ##
 """
 
@@ -26,6 +28,7 @@ import sys
 import traceback
 
 from wwpdb.apps.workmanager.db_access.ContentDbApi import ContentDbApi
+from wwpdb.apps.workmanager.db_access.StatsSnapshot import StatsSnapshot
 from wwpdb.apps.workmanager.db_access.StatusDbApi import StatusDbApi
 from wwpdb.apps.workmanager.task_access.BaseClass import BaseClass
 from wwpdb.io.file.mmCIFUtil import mmCIFUtil
@@ -184,15 +187,26 @@ class StatusUpdater(BaseClass):
         if updatedList:
             if self.__depositionInfo:
                 statusDB = StatusDbApi(siteId=self._siteId, verbose=self._verbose, log=self._lfh)
+                rows = []
                 for entry_id in updatedList:
-                    statusDB.runUpdate(table='deposition', where={'dep_set_id' : entry_id}, data=self.__depositionInfo)
+                    row = {'dep_set_id' : entry_id}
+                    row.update(self.__depositionInfo)
+                    rows.append(row)
                 #
+                statusDB.runBulkUpsert(table='deposition', key_columns=['dep_set_id'], rows=rows)
             #
             if self.__rcsb_statusInfo:
                 contentDB = ContentDbApi(siteId=self._siteId, verbose=self._verbose, log=self._lfh)
+                rows = []
                 for entry_id in updatedList:
-                    contentDB.runUpdate(table='rcsb_status', where={'Structure_ID' : entry_id}, data=self.__rcsb_statusInfo)
+                    row = {'Structure_ID' : entry_id}
+                    row.update(self.__rcsb_statusInfo)
+                    rows.append(row)
                 #
+                contentDB.runBulkUpsert(table='rcsb_status', key_columns=['Structure_ID'], rows=rows)
+                #
+                snapshot = StatsSnapshot(siteId=self._siteId, contentDB=contentDB, verbose=self._verbose, log=self._lfh)
+                snapshot.refreshEntries(updatedList)
             #
         #
         return message
@@ -2,6 +2,8 @@
 # File:  LoadRemindMessageTrack.py
 # Date:  27-April-2016
 # Updates: 31-October-2025 - Refactored to use msgmodule DataAccessLayer instead of CIF file parsing
+#          18-October-2026 - DbApiUtil delegates to the pooled db_access.DbApiUtil, runUpdate binds its values
+#          18-October-2026 - entries are written with one bulk upsert per ID list
 ##
 """
 API for loading message receiving/sending information into status database.
@@ -21,16 +23,13 @@ __email__ = "zfeng@rcsb.rutgers.edu"
 __license__ = "Creative Commons Attribution 3.0 Unported"
 __version__ = "V0.07"  # TODO: Update version after refactor  # pylint: disable=fixme
 
-import datetime
 import getopt
 import os
 import sys
-import time
 import traceback
 
-import MySQLdb
 from wwpdb.utils.config.ConfigInfo import ConfigInfo
-from wwpdb.utils.wf.dbapi.DbConnection import DbConnection
+from wwpdb.apps.workmanager.db_access.DbApiUtil import DbApiUtil as PooledDbApiUtil
 
 # Import msgmodule utilities - ExtractMessage does the heavy lifting
 from wwpdb.apps.msgmodule.util.ExtractMessage import ExtractMessage
@@ -47,16 +46,14 @@ class DbApiUtil(object):
         # self.__verbose = verbose
         self.__lfh = log
         self.__cI = ConfigInfo(self.__siteId)
-        self.__myDb = DbConnection(dbServer=self.__cI.get("SITE_DB_SERVER"),
-                                   dbHost=self.__cI.get("SITE_DB_HOST_NAME"),
-                                   dbName=self.__cI.get("SITE_DB_DATABASE_NAME"),
-                                   dbUser=self.__cI.get("SITE_DB_USER_NAME"),
-                                   dbPw=self.__cI.get("SITE_DB_PASSWORD"),
-                                   dbPort=int(self.__cI.get("SITE_DB_PORT_NUMBER")),
-                                   dbSocket=self.__cI.get("SITE_DB_SOCKET"))
-        self.__dbcon = self.__myDb.connect()
-        self.__Nretry = 5
-        self.__dbState = 0
+        self.__dbApi = PooledDbApiUtil(dbServer=self.__cI.get("SITE_DB_SERVER"),
+                                       dbHost=self.__cI.get("SITE_DB_HOST_NAME"),
+                                       dbName=self.__cI.get("SITE_DB_DATABASE_NAME"),
+                                       dbUser=self.__cI.get("SITE_DB_USER_NAME"),
+                                       dbPw=self.__cI.get("SITE_DB_PASSWORD"),
+                                       dbPort=int(self.__cI.get("SITE_DB_PORT_NUMBER")),
+                                       dbSocket=self.__cI.get("SITE_DB_SOCKET"),
+                                       log=self.__lfh)
 
     def runUpdate(self, table=None, where=None, data=None):
         """ Insertion/Update table based on table name, where condition(s) and data content(s)
@@ -67,132 +64,50 @@ class DbApiUtil(object):
         if (not where) and (not data):
             return None
         #
+        whereItems = list(where.items()) if where else []
+        dataItems = list(data.items()) if data else []
         rowExists = False
-        if where:
-            sql = "select * from " + str(table) + " where " + ' and '.join(
-                ["%s = '%s'" % (k, v.replace("'", "\\'")) for k, v in where.items()])
-            rows = self.runSelectSQL(sql)
+        if whereItems:
+            sql = "select * from " + str(table) + " where " + ' and '.join(["%s = %%s" % k for k, _v in whereItems])
+            rows = self.runSelectSQL(sql, tuple([v for _k, v in whereItems]))
             if rows and len(rows) > 0:
                 rowExists = True
             #
         #
-        if rowExists and (not data):
+        if rowExists and (not dataItems):
             return 'OK'
         #
         if rowExists:
-            sql = "update " + str(table) + " set " + ','.join(
-                ["%s = '%s'" % (k, v.replace("'", "\\'")) for k, v in data.items()])
+            sql = "update " + str(table) + " set " + ','.join(["%s = %%s" % k for k, _v in dataItems])
+            args = [v for _k, v in dataItems]
             if "major_issue" not in data:
                 sql += ',major_issue = NULL'
             #
-            if where:
-                sql += ' where ' + ' and '.join(["%s = '%s'" % (k, v.replace("'", "\\'")) for k, v in where.items()])
+            if whereItems:
+                sql += ' where ' + ' and '.join(["%s = %%s" % k for k, _v in whereItems])
+                args.extend([v for _k, v in whereItems])
             #
         else:
-            sql = "insert into " + str(table) + " (" + ','.join(['%s' % (k) for k, v in where.items()])
-            if data:
-                sql += "," + ','.join(['%s' % (k) for k, v in data.items()])
-            #
-            sql += ") values (" + ','.join(["'%s'" % (v.replace("'", "\\'")) for k, v in where.items()])
-            if data:
-                sql += "," + ','.join(["'%s'" % (v.replace("'", "\\'")) for k, v in data.items()])
-            #
-            sql += ")"
-        #
-        return self.runUpdateSQL(sql)
-
-    def runSelectSQL(self, sql):
-        """ Select table row(s) based on sql command
-        """
-        for retry in range(1, self.__Nretry):
-            ret = self.__runSelectSQL(sql)
-            if ret is None:
-                if self.__dbState > 0:
-                    time.sleep(retry * 2)
-                    if not self.__reConnect():
-                        return None
-                else:
-                    return None
-                #
-            else:
-                return ret
-            #
+            itemList = whereItems + dataItems
+            sql = "insert into " + str(table) + " (" + ','.join([k for k, _v in itemList]) + ") values (" + ','.join(['%s'] * len(itemList)) + ")"
+            args = [v for _k, v in itemList]
         #
-        return None
+        return self.runUpdateSQL(sql, tuple(args))
 
-    def runUpdateSQL(self, sql):
-        """ Insertion/Update table based on sql command
+    def runBulkUpsert(self, table=None, key_columns=None, rows=None):
+        """ Insertion/Update of multiple rows in one transaction
         """
-        for retry in range(1, self.__Nretry):
-            ret = self.__runUpdateSQL(sql)
-            if ret is None:
-                if self.__dbState > 0:
-                    time.sleep(retry * 2)
-                    if not self.__reConnect():
-                        return None
-                else:
-                    return None
-                #
-            else:
-                return ret
-            #
-        #
-        return None
+        return self.__dbApi.runBulkUpsert(table=table, key_columns=key_columns, rows=rows)
 
-    def __runSelectSQL(self, query):
-        """ Execute selection query command
-        """
-        rows = ()
-        try:
-            self.__dbcon.commit()
-            curs = self.__dbcon.cursor(MySQLdb.cursors.DictCursor)
-            curs.execute(query)
-            rows = curs.fetchall()
-        except MySQLdb.Error as e:
-            self.__dbState = e.args[0]
-            self.__lfh.write("Database error %d: %s\n" % (e.args[0], e.args[1]))
-
-        return rows
-
-    def __runUpdateSQL(self, query):
-        """ Execute insertion/update query command
+    def runSelectSQL(self, sql, args=None):
+        """ Select table row(s) based on sql command
         """
-        try:
-            curs = self.__dbcon.cursor()
-            curs.execute("set autocommit=0")
-            _nrows = curs.execute(query)  # noqa: F841
-            self.__dbcon.commit()
-            curs.execute("set autocommit=1")
-            curs.close()
-            return 'OK'
-        except MySQLdb.Error as e:
-            self.__dbcon.rollback()
-            self.__dbState = e.args[0]
-            self.__lfh.write("Database error %d: %s\n" % (e.args[0], e.args[1]))
-        #
-        return None
+        return self.__dbApi.runSelectSQL(sql, args)
 
-    def __reConnect(self):
-        """ Make database re-connection
+    def runUpdateSQL(self, sql, args=None):
+        """ Insertion/Update table based on sql command
         """
-        try:
-            self.__myDb.close(self.__dbcon)
-        except MySQLdb.Error:
-            self.__lfh.write("+DbApiUtil.reConnect() DB connection lost - cannot close\n")
-            self.__lfh.write("+DbApiUtil.reConnect() Re-connecting to the database ..\n")
-            self.__lfh.write("+DbApiUtil.reConnect() UTC time = %s\n" % datetime.datetime.utcnow())
-        #
-        for i in range(1, self.__Nretry):
-            try:
-                self.__dbcon = self.__myDb.connect()
-                self.__dbState = 0
-                return True
-            except MySQLdb.Error:
-                self.__lfh.write("+DbApiUtil.reConnect() Cannot get re-connection : trying again\n")
-                time.sleep(2 * i)
-            #
-        #
-        return False
+        return self.__dbApi.runUpdateSQL(sql, args)
 
 
 class LoadRemindMessageTrack(object):
@@ -213,10 +128,7 @@ class LoadRemindMessageTrack(object):
     def UpdateBasedIDList(self, depIDList):
         """ Update remind_message_track table based depID list ( comma separate )
         """
-        for depID in depIDList.split(','):
-            depID = depID.strip()
-            self.__updateEntry(depID)
-        #
+        self.__updateEntries(depIDList.split(','))
 
     def UpdateBasedInputIDfromFile(self, filename):
         """ Update remind_message_track table based depID list from file (assume each ID per line)
@@ -228,22 +140,39 @@ class LoadRemindMessageTrack(object):
         data = f.read()
         f.close()
         #
-        for depID in data.split('\n'):
-            depID = depID.strip()
-            self.__updateEntry(depID)
+        self.__updateEntries(data.split('\n'))
+
+    def __updateEntries(self, depIDList):
+        """ Get remind_message_track information for all entries and update table in one transaction
+        """
+        rows = []
+        for depID in depIDList:
+            row = self.__updateEntry(depID.strip())
+            if row:
+                rows.append(row)
+            #
+        #
+        if rows:
+            self.__statusDB.runBulkUpsert(table='remind_message_track', key_columns=['dep_set_id'], rows=rows)
         #
 
     def __updateEntry(self, depID):
-        """ Get remind_message_track information and update table
+        """ Get remind_message_track information and return the table row
         """
         if not depID:
-            return
+            return None
         #
         trackMap = self.__getRemindMessageTrack(depID)
         if not trackMap:
-            return
+            return None
+        #
+        row = {'dep_set_id': depID}
+        row.update(trackMap)
+        if 'major_issue' not in row:
+            # an existing major issue flag is cleared, as DbApiUtil.runUpdate() does
+            row['major_issue'] = None
         #
-        self.__statusDB.runUpdate(table='remind_message_track', where={'dep_set_id': depID}, data=trackMap)
+        return row
 
     def __getRemindMessageTrack(self, depID):
         """ Get remind_message_track table information for given depID
@@ -0,0 +1,94 @@
+##
+# File:  ReplaceCountCli.py
+# Date:  18-Oct-2026
+# Updates:
+##
+"""
+Tool for maintaining the replacement count summary of the workflow manager replacement history page.
+
+rebuild recomputes the summary from scratch, refresh adds the new replacement revisions, check compares
+the summary with the original GET_REPLACE_COUNTS query and info reports the summary state.
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import argparse
+import os
+import sys
+import time
+
+from wwpdb.apps.workmanager.db_access.ReplaceCountSummary import ReplaceCountSummary
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--site-id", help='site id (default: WWPDB_SITE_ID environment variable)', default=os.getenv('WWPDB_SITE_ID'))
+    parser.add_argument("--snapshot-path", help='summary directory (default: <SITE_WEB_APPS_TOP_SESSIONS_PATH>/wfm_stats)')
+    parser.add_argument("-v", "--verbose", action='store_true', help='verbose logging')
+
+    subparsers = parser.add_subparsers(help='sub-command help')
+    sub_a = subparsers.add_parser('rebuild', help='recompute the summary from scratch')
+    sub_a.set_defaults(func="rebuild")
+
+    sub_b = subparsers.add_parser('refresh', help='add the replacement revisions since the last watermark')
+    sub_b.set_defaults(func="refresh")
+
+    sub_c = subparsers.add_parser('check', help='compare the summary with the GET_REPLACE_COUNTS query')
+    sub_c.set_defaults(func="check")
+
+    sub_d = subparsers.add_parser('info', help='show watermark and size of the summary')
+    sub_d.set_defaults(func="info")
+
+    sub_e = subparsers.add_parser('list', help='list the replacement counts of a date range')
+    sub_e.add_argument("--start-date", help='first revision date, YYYY-MM-DD (default: 365 days ago)')
+    sub_e.add_argument("--end-date", help='last revision date, YYYY-MM-DD (default: no limit)')
+    sub_e.set_defaults(func="list")
+
+    args = parser.parse_args()
+
+    if 'func' not in args:
+        parser.print_usage()
+        sys.exit(1)
+
+    summary = ReplaceCountSummary(siteId=args.site_id, snapshotPath=args.snapshot_path, verbose=args.verbose, log=sys.stderr)
+
+    startTime = time.time()
+    if args.func == 'rebuild':
+        status = summary.rebuild()
+    elif args.func == 'refresh':
+        status = summary.refresh()
+    elif args.func == 'check':
+        diffList = summary.check()
+        if diffList is None:
+            status = None
+        else:
+            for diff in diffList:
+                print(diff)
+            #
+            print("%d difference(s)" % len(diffList))
+            status = 'OK' if not diffList else 'Different'
+        #
+    else:
+        status = summary.load()
+        if (status == 'OK') and (args.func == 'list'):
+            for row in summary.getReplaceCounts(startdate=args.start_date, enddate=args.end_date):
+                print("%s\t%s\t%d" % (row['name'], row['identifier_ORCID'], row['numreplace']))
+            #
+        #
+    #
+    for k, v in sorted(summary.getInfo().items()):
+        if k == 'refresh_time':
+            v = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(v))
+        #
+        print("%s: %s" % (k, v))
+    #
+    print("%s %s in %.2f seconds" % (args.func, status or 'Failed', time.time() - startTime))
+    if status != 'OK':
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
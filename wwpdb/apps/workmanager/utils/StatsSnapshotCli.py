@@ -0,0 +1,84 @@
+##
+# File:  StatsSnapshotCli.py
+# Date:  18-Oct-2026
+# Updates:
+##
+"""
+Tool for maintaining the statistics snapshot of the workflow manager statistics page.
+
+rebuild recomputes the snapshot from scratch, refresh applies the changes since the last watermark,
+verify compares the stored counts with a fresh computation and info reports the snapshot state.
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Zukang Feng"
+__email__ = "zfeng@rcsb.rutgers.edu"
+__license__ = "Creative Commons Attribution 3.0 Unported"
+__version__ = "V0.07"
+
+import argparse
+import os
+import sys
+import time
+
+from wwpdb.apps.workmanager.db_access.StatsSnapshot import StatsSnapshot
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--site-id", help='site id (default: WWPDB_SITE_ID environment variable)', default=os.getenv('WWPDB_SITE_ID'))
+    parser.add_argument("--snapshot-path", help='snapshot directory (default: <SITE_WEB_APPS_TOP_SESSIONS_PATH>/wfm_stats)')
+    parser.add_argument("-v", "--verbose", action='store_true', help='verbose logging')
+
+    subparsers = parser.add_subparsers(help='sub-command help')
+    sub_a = subparsers.add_parser('rebuild', help='recompute the snapshot from scratch')
+    sub_a.set_defaults(func="rebuild")
+
+    sub_b = subparsers.add_parser('refresh', help='apply the changes since the last watermark')
+    sub_b.set_defaults(func="refresh")
+
+    sub_c = subparsers.add_parser('verify', help='compare the snapshot with a fresh computation')
+    sub_c.set_defaults(func="verify")
+
+    sub_d = subparsers.add_parser('info', help='show watermark and size of the snapshot')
+    sub_d.set_defaults(func="info")
+
+    args = parser.parse_args()
+
+    if 'func' not in args:
+        parser.print_usage()
+        sys.exit(1)
+
+    snapshot = StatsSnapshot(siteId=args.site_id, snapshotPath=args.snapshot_path, verbose=args.verbose, log=sys.stderr)
+
+    startTime = time.time()
+    if args.func == 'rebuild':
+        status = snapshot.rebuild()
+    elif args.func == 'refresh':
+        status = snapshot.refresh()
+    elif args.func == 'verify':
+        diffList = snapshot.verify()
+        if diffList is None:
+            status = None
+        else:
+            for diff in diffList:
+                print(diff)
+            #
+            print("%d difference(s)" % len(diffList))
+            status = 'OK' if not diffList else 'Different'
+        #
+    else:
+        status = snapshot.load()
+    #
+    for k, v in sorted(snapshot.getInfo().items()):
+        if k in ('watermark', 'refresh_time'):
+            v = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(v))
+        #
+        print("%s: %s" % (k, v))
+    #
+    print("%s %s in %.2f seconds" % (args.func, status or 'Failed', time.time() - startTime))
+    if status != 'OK':
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
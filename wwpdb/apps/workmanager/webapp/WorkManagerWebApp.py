@@ -4,6 +4,14 @@
 #
 # Updates:
 #  10-Dec-2024 zf  added refreshing "latency of servers" report
+#  18-Oct-2026 zf  warm up the reference data cache on login
+#  18-Oct-2026 zf  log the per-entry outcome of annotator reassignment
+#  18-Oct-2026 zf  tag database statements with the name of the running operation for the slow-query log
+#  18-Oct-2026 zf  bound the database retries of a request by a request deadline
+#  18-Oct-2026 zf  __processTemplate() reads the template through the process-wide TemplateCache
+#  18-Oct-2026 zf  _GetTableDataOp() supports server-side paging, sorting and column filters
+#  18-Oct-2026 zf  _GetTableDataOp() reads the table contents through TableStore, a page only decodes the rows it returns
+#  18-Oct-2026 zf  _RefreshOp() only re-reads the depositions changed since the last refresh ( delta refresh )
 ##
 """
 Chemeditor web request and response processing modules.
@@ -29,6 +37,7 @@ except ImportError:
     import pickle as pickle
 
 import datetime
+import json
 import os
 import subprocess
 import sys
@@ -38,6 +47,8 @@ import traceback
 from wwpdb.utils.config.ConfigInfo import ConfigInfo
 from wwpdb.apps.wf_engine.engine.WFEapplications import reRunWorkflow, getPicklePath
 from wwpdb.apps.workmanager.db_access.DBLoader import DBLoader
+from wwpdb.apps.workmanager.db_access.QueryStats import setCurrentOp
+from wwpdb.apps.workmanager.db_access.RetryPolicy import setRequestDeadline
 from wwpdb.apps.workmanager.db_access.StatusDbApi import StatusDbApi
 from wwpdb.apps.workmanager.depict.DepictBase import DepictBase
 from wwpdb.apps.workmanager.depict.DepictContent import DepictContent
@@ -45,9 +56,12 @@ from wwpdb.apps.workmanager.depict.DepictGroup import DepictGroup
 from wwpdb.apps.workmanager.depict.DepictLevel1 import DepictLevel1
 from wwpdb.apps.workmanager.depict.DepictOther import DepictOther
 from wwpdb.apps.workmanager.depict.DepictSnapShot import DepictSnapShot
-from wwpdb.apps.workmanager.depict.ReadConFigFile import ReadConFigFile, loadPickleFile
+from wwpdb.apps.workmanager.depict.ReadConFigFile import ReadConFigFile
 from wwpdb.apps.workmanager.depict.SearchUtil import SearchUtil
 from wwpdb.apps.workmanager.depict.ServerInfoUtil import ServerInfoUtil
+from wwpdb.apps.workmanager.depict.TablePage import getTableFilePage, getTablePage
+from wwpdb.apps.workmanager.depict.TableStore import loadTableFile, openTableFile
+from wwpdb.apps.workmanager.depict.TemplateCache import getTemplateCache
 from wwpdb.apps.workmanager.file_access.AnnotAssignUtil import AnnotAssignUtil
 from wwpdb.apps.workmanager.file_access.CopyFileToAutoGroup import CopyFileToAutoGroup
 from wwpdb.apps.workmanager.file_access.LogFileUtil import LogFileUtil
@@ -186,6 +200,8 @@ class WorkManagerWebAppWorker(object):
         self.__reqObj = reqObj
         self.__siteId = str(self.__reqObj.getValue("WWPDB_SITE_ID"))
         self.__cI = ConfigInfo(self.__siteId)
+        # seconds after the start of a request beyond which failed database statements are no longer retried
+        self.__dbRetryDeadline = 30
         #
         self.__appPathD = {'/service/environment/dump': '_dumpOp',
                            '/service/workmanager/login': '_LoginOp',
@@ -270,6 +286,8 @@ class WorkManagerWebAppWorker(object):
                 rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
                 rC.setError(errMsg='Unknown operation')
             else:
+                setCurrentOp(self.__appPathD[reqPath])
+                setRequestDeadline(self.__dbRetryDeadline)
                 mth = getattr(self, self.__appPathD[reqPath], None)
                 rC = mth()
             return rC
@@ -278,6 +296,9 @@ class WorkManagerWebAppWorker(object):
             rC = ResponseContent(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
             rC.setError(errMsg='Operation failure')
             return rC
+        finally:
+            setCurrentOp(None)
+            setRequestDeadline(None)
 
     ################################################################################################################
     # ------------------------------------------------------------------------------------------------------------
@@ -305,6 +326,7 @@ class WorkManagerWebAppWorker(object):
         db = StatusDbApi(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
         userInfo = db.Autenticate(username, password)
         if userInfo:
+            db.warmUpReferenceCache()
             readUtil = ReadConFigFile(reqObj=self.__reqObj, configFile='level1_config.cif', verbose=self.__verbose, log=self.__lfh)
             configDict = readUtil.read()
             depictUtil = DepictLevel1(reqObj=self.__reqObj, statusDB=db, conFigObj=configDict, verbose=self.__verbose, log=self.__lfh)
@@ -636,19 +658,61 @@ class WorkManagerWebAppWorker(object):
         return rC
 
     def _GetTableDataOp(self):
-        """ return table data content
+        """ return table data content, only the requested page of it if any of offset, limit, sort_key
+            ( with sort_order 'asc' or 'desc' ) and filters ( JSON object of column : text ) is given
         """
         if (self.__verbose):
             self.__lfh.write("+WorkManagerWebAppWorker._GetTableDataOp() Starting now\n")
         #
         self.__getSession()
         #
-        data = loadPickleFile(self.__sessionPath, self.__reqObj.getValue("picklefile"))
-        if not data:
-            data = []
-        #
+        tableFileName = self.__reqObj.getValue("picklefile")
         rtrnDict = {}
-        rtrnDict['table_rows'] = data
+        offset = self.__reqObj.getValue("offset")
+        limit = self.__reqObj.getValue("limit")
+        sortKey = self.__reqObj.getValue("sort_key")
+        filters = self.__reqObj.getValue("filters")
+        if (not offset) and (not limit) and (not sortKey) and (not filters):
+            # full dump for the clients which page, sort and filter the table themselves
+            data = loadTableFile(self.__sessionPath, tableFileName)
+            if not data:
+                data = []
+            #
+            rtrnDict['table_rows'] = data
+            return self.__returnJsonDict(rtrnDict)
+        #
+        try:
+            offset = int(offset or 0)
+            limit = int(limit) if limit else None
+            filterMap = json.loads(filters) if filters else {}
+            if not isinstance(filterMap, dict):
+                raise ValueError("filters is not a JSON object")
+            #
+        except ValueError as e:
+            self.__lfh.write("+WorkManagerWebAppWorker._GetTableDataOp() invalid paging parameters: %s\n" % str(e))
+            return self.__returnJsonObject('', 'Invalid table paging parameters.')
+        #
+        descending = (self.__reqObj.getValue("sort_order").lower() == 'desc')
+        tableFile = openTableFile(self.__sessionPath, tableFileName)
+        if tableFile is not None:
+            with tableFile:
+                rtrnDict['table_rows'], rtrnDict['total'] = getTableFilePage(tableFile, offset=offset, limit=limit, sortKey=sortKey,
+                                                                             descending=descending, filterMap=filterMap,
+                                                                             version=(os.path.join(self.__sessionPath, tableFileName),)
+                                                                             + tableFile.getVersion())
+                rtrnDict['total_unfiltered'] = tableFile.getRowCount()
+            #
+        else:
+            # pickled table contents
+            data = loadTableFile(self.__sessionPath, tableFileName)
+            if not data:
+                data = []
+            #
+            rtrnDict['table_rows'], rtrnDict['total'] = getTablePage(data, offset=offset, limit=limit, sortKey=sortKey, descending=descending,
+                                                                     filterMap=filterMap)
+            rtrnDict['total_unfiltered'] = len(data)
+        #
+        rtrnDict['offset'] = offset
         return self.__returnJsonDict(rtrnDict)
 
     def _SearchPageOp(self):
@@ -684,7 +748,7 @@ class WorkManagerWebAppWorker(object):
         if (self.__verbose):
             self.__lfh.write("+WorkManagerWebAppWorker._RefreshOp() Starting now\n")
         #
-        return self.__refreshTableContent(None, self.__reqObj.getValue('index'), True)
+        return self.__refreshTableContent(None, self.__reqObj.getValue('index'), True, delta=True)
 
     def _RunEngineOp(self):
         """ Run work flow engine interface
@@ -764,7 +828,11 @@ class WorkManagerWebAppWorker(object):
         assignUtil.updateAnnotatorAssignment(assignList=assign_pair_list)
         #
         sdb = StatusDbApi(siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-        sdb.updateAnnotatorAssignment(assignList=assign_pair_list)
+        outcomeMap = sdb.updateAnnotatorAssignment(assignList=assign_pair_list)
+        for depId, outcome in sorted(outcomeMap.items()):
+            if outcome != 'OK':
+                self.__lfh.write("+WorkManagerWebAppWorker._AssignOp() assignment of %s: %s\n" % (depId, outcome))
+            #
         #
         return self.__refreshTableContent(sdb, str(self.__reqObj.getValue("tab_id")) + "_table_1", False)
 
@@ -1187,13 +1255,13 @@ class WorkManagerWebAppWorker(object):
         rC.addDictionaryItems(rtrnDict)
         return rC
 
-    def __refreshTableContent(self, sdb, index, flag):
-        """
+    def __refreshTableContent(self, sdb, index, flag, delta=False):
+        """ delta: patch the tables with the depositions changed since the last refresh instead of re-running their queries
         """
         readUtil = ReadConFigFile(reqObj=self.__reqObj, configFile='level1_config.cif', verbose=self.__verbose, log=self.__lfh)
         configDict = readUtil.read()
         depContUtil = DepictContent(reqObj=self.__reqObj, statusDB=sdb, conFigObj=configDict, verbose=self.__verbose, log=self.__lfh)
-        returnMap = depContUtil.depictTableContent(index)
+        returnMap = depContUtil.depictTableContent(index, delta=delta)
         rtrnDict = {}
         if returnMap:
             rtrnDict['status'] = 'OK'
@@ -1316,7 +1384,4 @@ class WorkManagerWebAppWorker(object):
             parameterDict = {}
         tPath = self.__reqObj.getValue("TemplatePath")
         fPath = os.path.join(tPath, fn)
-        ifh = open(fPath, 'r')
-        sIn = ifh.read()
-        ifh.close()
-        return (sIn % parameterDict)
+        return getTemplateCache().get(fPath).substitute(parameterDict)